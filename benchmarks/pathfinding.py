@@ -0,0 +1,282 @@
+"""
+Compare the pathfinders on the terrain of every shipped level.
+
+Usage (from the repository root):
+    python -m benchmarks.pathfinding [number_of_queries] [time_limit]
+
+The same seeded queries, between random free tiles connected to each other, are solved by every pathfinder.
+
+The first table compares astar with the previous A* implementation. The previous one expands the same tiles again and
+again, so it gives up after time_limit seconds (1 by default), the queries it gave up on are only counted. Both cut
+corners, so the costs of their paths can be compared.
+The second table compares the tiles expanded by astar and by jump_point_search, without corner cutting. Their path
+costs must be identical.
+The third table compares astar with HierarchicalPathfinder, with the time to build its abstract graph and the extra
+cost of its paths. The last line is a larger map: the terrain of level_4 repeated 6 times vertically and twice
+horizontally, with the seams opened.
+
+The dummy SDL drivers are used, so no window is opened.
+"""
+
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy  # NOQA: E402
+
+from isec.app import App, Resource  # NOQA: E402
+from isec.objects import HierarchicalPathfinder, astar, jump_point_search  # NOQA: E402
+
+from game.objects.game.level_world import LevelWorld  # NOQA: E402
+
+
+CLUSTER_SIZE = 16
+
+
+class LegacyNode:
+    """The node of the previous implementation."""
+
+    def __init__(self, parent=None, position=None):
+        self.parent = parent
+        self.position = position
+
+        self.g = 0
+        self.h = 0
+        self.f = 0
+
+    def __eq__(self, other):
+        return self.position == other.position
+
+
+def legacy_astar(maze, start, end, time_limit):
+    """The previous implementation, unchanged except for the time limit."""
+
+    start_time = time.perf_counter()
+
+    start_node = LegacyNode(None, start)
+    start_node.g = start_node.h = start_node.f = 0
+    end_node = LegacyNode(None, end)
+    end_node.g = end_node.h = end_node.f = 0
+
+    open_list = []
+    closed_list = []
+
+    open_list.append(start_node)
+
+    while len(open_list) > 0:
+        if time.perf_counter() - start_time > time_limit:
+            return None
+
+        current_node = open_list[0]
+        current_index = 0
+        for index, item in enumerate(open_list):
+            if item.f < current_node.f:
+                current_node = item
+                current_index = index
+
+        open_list.pop(current_index)
+        closed_list.append(current_node)
+
+        if current_node == end_node:
+            path = []
+            current = current_node
+            while current is not None:
+                path.append(current.position)
+                current = current.parent
+            return path[::-1]
+
+        children = []
+        for new_position in [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1)]:
+
+            node_position = (current_node.position[0] + new_position[0], current_node.position[1] + new_position[1])
+
+            if node_position[0] > (len(maze) - 1) or node_position[0] < 0 or node_position[1] > (len(maze[len(maze)-1]) - 1) or node_position[1] < 0:  # NOQA: E501
+                continue
+
+            if maze[node_position[0]][node_position[1]] != 0:
+                continue
+
+            new_node = LegacyNode(current_node, node_position)
+
+            children.append(new_node)
+
+        for child in children:
+
+            for closed_child in closed_list:
+                if child == closed_child:
+                    continue
+
+            child.g = current_node.g + 1
+            child.h = ((child.position[0] - end_node.position[0]) ** 2) + ((child.position[1] - end_node.position[1]) ** 2)  # NOQA: E501
+            child.f = child.g + child.h
+
+            for open_node in open_list:
+                if child == open_node and child.g > open_node.g:
+                    continue
+
+            open_list.append(child)
+
+
+def get_path_cost(path: list[tuple[int, int]]) -> float:
+    return sum(math.dist(a, b) for a, b in zip(path, path[1:]))
+
+
+def create_queries(collision_map: numpy.ndarray,
+                   number_of_queries: int) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    """Return seeded pairs of free tiles connected to each other."""
+
+    rng = numpy.random.default_rng(0)
+    free_tiles = [tuple(tile) for tile in numpy.argwhere(~collision_map).tolist()]
+
+    queries = []
+    while len(queries) < number_of_queries:
+        start, end = (free_tiles[i] for i in rng.integers(len(free_tiles), size=2))
+        if astar(collision_map, start, end, corner_cutting="always") is not None:
+            queries.append((start, end))
+
+    return queries
+
+
+def compare_legacy(collision_map: numpy.ndarray,
+                   queries: list[tuple[tuple[int, int], tuple[int, int]]],
+                   time_limit: float) -> str:
+
+    maze = collision_map.astype(int).tolist()
+
+    astar_time = legacy_time = 0
+    gave_up = 0
+    astar_cost = legacy_cost = 0
+
+    for start, end in queries:
+        query_start = time.perf_counter()
+        path = astar(collision_map, start, end, corner_cutting="always")
+        query_astar_time = time.perf_counter() - query_start
+
+        query_start = time.perf_counter()
+        legacy_path = legacy_astar(maze, start, end, time_limit)
+        query_legacy_time = time.perf_counter() - query_start
+
+        if legacy_path is None:
+            gave_up += 1
+            continue
+
+        astar_time += query_astar_time
+        legacy_time += query_legacy_time
+        astar_cost += get_path_cost(path)
+        legacy_cost += get_path_cost(legacy_path)
+
+    if gave_up == len(queries):
+        return f"{'':>10} {'':>11} {'':>8} {gave_up:>7}"
+
+    return (f"{astar_time * 1000:>7.1f} ms {legacy_time * 1000:>8.1f} ms {legacy_time / astar_time:>7.1f}x "
+            f"{gave_up:>7} {legacy_cost / astar_cost - 1:>10.1%}")
+
+
+def compare_jump_point_search(collision_map: numpy.ndarray,
+                              queries: list[tuple[tuple[int, int], tuple[int, int]]]) -> str:
+
+    times = {astar: 0, jump_point_search: 0}
+    expanded = {astar: 0, jump_point_search: 0}
+    costs = {astar: [], jump_point_search: []}
+    stats = {}
+
+    for start, end in queries:
+        for pathfinder in (astar, jump_point_search):
+            options = {"corner_cutting": "never"} if pathfinder is astar else {}
+
+            query_start = time.perf_counter()
+            path = pathfinder(collision_map, start, end, stats=stats, **options)
+            times[pathfinder] += time.perf_counter() - query_start
+
+            expanded[pathfinder] += stats["expanded"]
+            costs[pathfinder].append(None if path is None else get_path_cost(path))
+
+    identical = all(astar_cost == jps_cost or abs(astar_cost - jps_cost) < 1e-9
+                    for astar_cost, jps_cost in zip(costs[astar], costs[jump_point_search]))
+
+    return (f"{expanded[astar]:>9} {expanded[jump_point_search]:>9} "
+            f"{times[astar] * 1000:>7.1f} ms {times[jump_point_search] * 1000:>7.1f} ms "
+            f"{times[astar] / times[jump_point_search]:>7.1f}x {str(identical):>9}")
+
+
+def compare_hierarchical(collision_map: numpy.ndarray,
+                         queries: list[tuple[tuple[int, int], tuple[int, int]]]) -> str:
+
+    build_start = time.perf_counter()
+    pathfinder = HierarchicalPathfinder(collision_map, CLUSTER_SIZE)
+    build_time = time.perf_counter() - build_start
+
+    astar_time = hierarchical_time = 0
+    astar_cost = hierarchical_cost = 0
+
+    for start, end in queries:
+        query_start = time.perf_counter()
+        path = astar(collision_map, start, end, corner_cutting="never")
+        astar_time += time.perf_counter() - query_start
+
+        query_start = time.perf_counter()
+        hierarchical_path = pathfinder.find_path(start, end)
+        hierarchical_time += time.perf_counter() - query_start
+
+        astar_cost += get_path_cost(path)
+        hierarchical_cost += get_path_cost(hierarchical_path)
+
+    return (f"{pathfinder.node_count:>6} {build_time * 1000:>7.1f} ms {astar_time * 1000:>8.1f} ms "
+            f"{hierarchical_time * 1000:>7.1f} ms {astar_time / hierarchical_time:>7.1f}x "
+            f"{hierarchical_cost / astar_cost - 1:>10.1%}")
+
+
+def create_large_map(collision_map: numpy.ndarray) -> numpy.ndarray:
+    height, width = collision_map.shape
+    large_map = numpy.tile(collision_map, (6, 2))
+
+    for row in range(height, large_map.shape[0], height):
+        large_map[row - 1:row + 1, :] = False
+
+    large_map[:, width - 1:width + 1] = False
+
+    return large_map
+
+
+def main() -> None:
+    number_of_queries = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    time_limit = float(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    App.init("game/assets/")
+
+    level_queries = {}
+    for level_name in sorted(Resource.data["levels"]):
+        if level_name == "debug":
+            continue
+
+        collision_map = LevelWorld.get(level_name).collision_maps["terrain"]
+        level_queries[level_name] = collision_map, create_queries(collision_map, number_of_queries)
+
+    print(f"{number_of_queries} queries per level, the previous implementation gives up after {time_limit} s")
+    print(f"{'level':<10} {'astar':>10} {'previous':>11} {'speedup':>8} {'gave up':>7} {'extra cost':>10}")
+
+    for level_name, (collision_map, queries) in level_queries.items():
+        print(f"{level_name:<10} {compare_legacy(collision_map, queries, time_limit)}")
+
+    print(f"\n{'level':<10} {'expanded':>9} {'jps':>9} {'astar':>10} {'jps':>10} {'speedup':>8} {'identical':>9}")
+
+    for level_name, (collision_map, queries) in level_queries.items():
+        print(f"{level_name:<10} {compare_jump_point_search(collision_map, queries)}")
+
+    print(f"\n{CLUSTER_SIZE}x{CLUSTER_SIZE} clusters")
+    print(f"{'level':<10} {'nodes':>6} {'build':>10} {'astar':>11} {'hpa':>10} {'speedup':>8} {'extra cost':>10}")
+
+    for level_name, (collision_map, queries) in level_queries.items():
+        print(f"{level_name:<10} {compare_hierarchical(collision_map, queries)}")
+
+    large_map = create_large_map(level_queries["level_4"][0])
+    large_queries = create_queries(large_map, number_of_queries)
+    print(f"{'level_4 x12':<10} {compare_hierarchical(large_map, large_queries)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare the two pellet simulations, pymunk bodies and projectiles, on every shipped level.
+
+Usage (from the repository root):
+    python -m benchmarks.pellets [number_of_frames] [shot_interval]
+
+The player of each level shoots every shot_interval frames (6 by default, 10 shots per second at 60 fps), in the same
+seeded random directions for both simulations. The time of the scene update and render is measured on every frame,
+the player and the rest of the scene are included, so the difference comes from the pellets.
+The dummy SDL drivers are used, so no window is opened.
+"""
+
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # NOQA: E402
+
+from isec.app import App, Resource  # NOQA: E402
+from isec.instance import BaseInstance  # NOQA: E402
+
+from game.objects.game.level import Level  # NOQA: E402
+
+
+SIMULATIONS = ("bodies", "projectiles")
+
+
+def run_level(level_name: str,
+              simulation: str,
+              number_of_frames: int,
+              shot_interval: int) -> tuple[float, int]:
+    """Return the mean time of a frame and the peak number of pellets in flight."""
+
+    Resource.data["objects"]["pellet"]["SIMULATION"] = simulation
+
+    instance = BaseInstance(Resource.data["instances"]["game"]["fps"])
+    level = Level(level_name, instance)
+    scene = level.scene
+    rng = random.Random(0)
+    random.seed(0)
+
+    peak = 0
+    total_time = 0
+    for frame in range(number_of_frames):
+        if frame % shot_interval == 0:
+            level.pellets.shoot(tuple(level.player.position.position), rng.uniform(0, 360))
+
+        start = time.perf_counter()
+        scene.update(1 / instance.fps)
+        scene.camera.position.position = level.player.position.position - pygame.Vector2(200, 150)
+        scene.render()
+        total_time += time.perf_counter() - start
+
+        if simulation == "bodies":
+            peak = max(peak, level.pellets.active_count)
+        else:
+            peak = max(peak, level.pellets.count)
+
+    return total_time / number_of_frames, peak
+
+
+def main() -> None:
+    number_of_frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    shot_interval = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+    App.init("game/assets/")
+    Resource.preload("game")
+    initial_simulation = Resource.data["objects"]["pellet"]["SIMULATION"]
+
+    print(f"{number_of_frames} frames, a shot every {shot_interval} frames")
+    print(f"{'level':<10} {'bodies':>10} {'projectiles':>12} {'speedup':>8} {'in flight':>10}")
+
+    for level_name in sorted(Resource.data["levels"]):
+        if level_name == "debug":
+            continue
+
+        results = {simulation: run_level(level_name, simulation, number_of_frames, shot_interval)
+                   for simulation in SIMULATIONS}
+
+        bodies_time, bodies_peak = results["bodies"]
+        projectiles_time, projectiles_peak = results["projectiles"]
+
+        print(f"{level_name:<10} {bodies_time * 1000:>7.2f} ms {projectiles_time * 1000:>9.2f} ms "
+              f"{bodies_time / projectiles_time:>7.1f}x {bodies_peak:>4} / {projectiles_peak:<4}")
+
+    Resource.data["objects"]["pellet"]["SIMULATION"] = initial_simulation
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Compare cast_rays with cast_ray on the terrain of every shipped level.
+
+Usage (from the repository root):
+    python -m benchmarks.raycasting [number_of_rays]
+
+The same seeded rays, from random free tiles in random directions, are cast with cast_ray one by one and with a
+single cast_rays call. The results must be identical. The dummy SDL drivers are used, so no window is opened.
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy  # NOQA: E402
+import pygame  # NOQA: E402
+
+from isec.app import App, Resource  # NOQA: E402
+from isec.objects import cast_ray, cast_rays  # NOQA: E402
+
+from game.objects.game.level_world import LevelWorld  # NOQA: E402
+
+
+MAX_DISTANCE = 20
+
+
+def create_rays(collision_map: numpy.ndarray,
+                tile_size: int,
+                number_of_rays: int) -> tuple[numpy.ndarray, numpy.ndarray]:
+
+    rng = numpy.random.default_rng(0)
+
+    free_tiles = numpy.argwhere(~collision_map)[:, ::-1]
+    origins = (free_tiles[rng.integers(len(free_tiles), size=number_of_rays)]
+               + rng.random((number_of_rays, 2))) * tile_size
+
+    angles = rng.random(number_of_rays) * 2 * numpy.pi
+    directions = numpy.stack((numpy.cos(angles), numpy.sin(angles)), axis=1)
+
+    # Some axis aligned rays, the special cases of the traversal
+    directions[:8] = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)]
+
+    return origins, directions
+
+
+def main() -> None:
+    number_of_rays = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    App.init("game/assets/")
+
+    print(f"{number_of_rays} rays of at most {MAX_DISTANCE} tiles")
+    print(f"{'level':<10} {'cast_ray':>11} {'cast_rays':>11} {'speedup':>8} {'identical':>9}")
+
+    for level_name in sorted(Resource.data["levels"]):
+        if level_name == "debug":
+            continue
+
+        world = LevelWorld.get(level_name)
+        collision_map = world.collision_maps["terrain"]
+        origins, directions = create_rays(collision_map, world.tile_size, number_of_rays)
+
+        start = time.perf_counter()
+        single_results = [cast_ray(collision_map,
+                                   world.tile_size,
+                                   pygame.Vector2(*origin),
+                                   pygame.Vector2(*direction),
+                                   MAX_DISTANCE) for origin, direction in zip(origins.tolist(), directions.tolist())]
+        single_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        positions, hits = cast_rays(collision_map, world.tile_size, origins, directions, MAX_DISTANCE)
+        batch_time = time.perf_counter() - start
+
+        identical = (numpy.array_equal(positions, [tuple(position) for position, _ in single_results])
+                     and numpy.array_equal(hits, [hit for _, hit in single_results]))
+
+        print(f"{level_name:<10} {single_time * 1000:>8.1f} ms {batch_time * 1000:>8.1f} ms "
+              f"{single_time / batch_time:>7.1f}x {str(identical):>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Measure the startup time of the game, with a cold and a warm data cache.
+
+Usage (from the repository root):
+    python -m benchmarks.startup [number_of_runs]
+
+Every run is done in a new process, with the dummy SDL drivers so no window is opened.
+"""
+
+import os
+import sys
+import json
+import shutil
+import statistics
+import subprocess
+
+
+_RUN_SCRIPT = """
+import json
+import time
+
+t_0 = time.perf_counter()
+from isec.app import App, Resource
+
+t_1 = time.perf_counter()
+Resource.set_directory("game/assets/")
+Resource.pre_init()
+
+t_2 = time.perf_counter()
+App._init_pygame()
+App._create_window()
+Resource.init()
+
+t_3 = time.perf_counter()
+print(json.dumps({"import": t_1 - t_0, "pre_init": t_2 - t_1, "init": t_3 - t_2, "total": t_3 - t_0}))
+"""
+
+
+def run_once() -> dict[str, float]:
+    environment = os.environ | {"SDL_VIDEODRIVER": "dummy",
+                                "SDL_AUDIODRIVER": "dummy",
+                                "PYGAME_HIDE_SUPPORT_PROMPT": "1"}
+
+    output = subprocess.run([sys.executable, "-c", _RUN_SCRIPT],
+                            env=environment,
+                            capture_output=True,
+                            text=True,
+                            check=True).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def clear_data_cache() -> None:
+    with open("isec/assets/data/engine/resource.json") as file:
+        cache_directory = json.load(file)["data"]["caching"]["directory"]
+
+    shutil.rmtree(cache_directory, ignore_errors=True)
+
+
+def report(label: str,
+           runs: list[dict[str, float]]) -> None:
+
+    columns = " | ".join(f"{key} {statistics.median(run[key] for run in runs) * 1000:7.1f} ms" for key in runs[0])
+    print(f"{label:<5} | {columns}")
+
+
+def main() -> None:
+    number_of_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    cold_runs = []
+    warm_runs = []
+
+    for _ in range(number_of_runs):
+        clear_data_cache()
+        cold_runs.append(run_once())
+        warm_runs.append(run_once())
+
+    print(f"Median of {number_of_runs} runs")
+    report("cold", cold_runs)
+    report("warm", warm_runs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Compare the terrain decompositions of TerrainCollision on every shipped level.
+
+Usage (from the repository root):
+    python -m benchmarks.terrain_decomposition [number_of_runs]
+
+For each level and decomposition mode, the number of shapes, the time to decompose the collision map and the time
+of a physics step with bodies falling on the terrain are reported. The dummy SDL drivers are used, so no window is
+opened.
+"""
+
+import os
+import sys
+import time
+import random
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy  # NOQA: E402
+import pymunk  # NOQA: E402
+
+from isec.app import App, Resource  # NOQA: E402
+from isec.objects import PolygonCache  # NOQA: E402
+from isec.environment.terrain.terrain_collision import TerrainCollision  # NOQA: E402
+
+from game.objects.game.level_world import LevelWorld  # NOQA: E402
+
+
+NUMBER_OF_BODIES = 200
+NUMBER_OF_STEPS = 120
+
+
+def time_decomposition(collision_map: numpy.ndarray,
+                       tile_size: int,
+                       decomposition: str,
+                       number_of_runs: int) -> tuple[list[list[tuple]], float]:
+
+    timings = []
+    for _ in range(number_of_runs):
+        start = time.perf_counter()
+        polygons = TerrainCollision.decompose_collision_map(collision_map, tile_size, decomposition)
+        timings.append(time.perf_counter() - start)
+
+    return polygons, statistics.median(timings)
+
+
+def time_step(polygons: list[list[tuple]],
+              collision_map: numpy.ndarray,
+              tile_size: int) -> float:
+    """Drop the same seeded bodies on the terrain, and return the median duration of a step."""
+
+    space = pymunk.Space()
+    space.gravity = (0, 750)
+
+    for polygon in polygons:
+        space.add(pymunk.Poly(space.static_body, polygon, radius=TerrainCollision.SHAPES_RADIUS))
+
+    free_tiles = numpy.argwhere(~collision_map)
+    rng = random.Random(0)
+    for y, x in rng.sample(free_tiles.tolist(), min(NUMBER_OF_BODIES, len(free_tiles))):
+        body = pymunk.Body(1, pymunk.moment_for_circle(1, 0, tile_size / 4))
+        body.position = ((x + 0.5) * tile_size, (y + 0.5) * tile_size)
+        space.add(body, pymunk.Circle(body, tile_size / 4))
+
+    timings = []
+    for _ in range(NUMBER_OF_STEPS):
+        start = time.perf_counter()
+        space.step(1 / 60)
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def main() -> None:
+    number_of_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    App.init("game/assets/")
+
+    # Every run must decompose the map, not read the polygon cache
+    PolygonCache.configure(False, None)
+
+    print(f"Median of {number_of_runs} decompositions, {NUMBER_OF_STEPS} steps with {NUMBER_OF_BODIES} bodies")
+    print(f"{'level':<10} {'mode':<10} {'shapes':>6} {'decompose':>12} {'step':>10}")
+
+    totals = {decomposition: [0, 0.0, 0.0] for decomposition in TerrainCollision.DECOMPOSITION_MODES}
+
+    for level_name in sorted(Resource.data["levels"]):
+        if level_name == "debug":
+            continue
+
+        world = LevelWorld.get(level_name)
+        collision_map = numpy.array(world.collision_maps["terrain"], dtype=bool)
+
+        for decomposition in TerrainCollision.DECOMPOSITION_MODES:
+            polygons, decompose_time = time_decomposition(collision_map,
+                                                          world.tile_size,
+                                                          decomposition,
+                                                          number_of_runs)
+            step_time = time_step(polygons, collision_map, world.tile_size)
+
+            totals[decomposition][0] += len(polygons)
+            totals[decomposition][1] += decompose_time
+            totals[decomposition][2] += step_time
+
+            print(f"{level_name:<10} {decomposition:<10} {len(polygons):>6} "
+                  f"{decompose_time * 1000:>9.2f} ms {step_time * 1000:>7.3f} ms")
+
+    print()
+    for decomposition, (nb_shapes, decompose_time, step_time) in totals.items():
+        print(f"{'total':<10} {decomposition:<10} {nb_shapes:>6} "
+              f"{decompose_time * 1000:>9.2f} ms {step_time * 1000:>7.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
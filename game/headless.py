@@ -0,0 +1,154 @@
+"""
+Run a level without a window, as fast as possible, e.g. for bots, regression checks and throughput tests.
+
+Usage (from the repository root):
+    python -m game.headless [level_name] [--frames N] [--seed N] [--delta SECONDS] [--render-every N] [--check]
+
+Every frame simulates a fixed delta, 1 / physics_fps by default, with random seeded, so the same arguments always give
+the same player trajectory. The display is never flipped and the loop is not throttled. With --render-every N, one
+frame out of N is drawn on the offscreen window, 0 never renders. With --check, the level is run twice and the two
+trajectories must be identical.
+
+The dummy SDL drivers are used unless others are set.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import time
+
+from collections.abc import Callable
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from isec.app import App, Resource  # NOQA: E402
+from isec.instance import LoopHandler  # NOQA: E402
+
+from game.instances.instance_level import InstanceLevel  # NOQA: E402
+
+
+class HeadlessRunner:
+    def __init__(self,
+                 level_name: str,
+                 seed: int = 0,
+                 delta: float | None = None,
+                 render_every: int = 0) -> None:
+        """
+        Run InstanceLevel frame by frame, without window, events or frame limit. The tutorials are disabled.
+
+        :param level_name: The level to start with, the level triggers can change it.
+        :param seed: The seed of random, set before the level is created.
+        :param delta: The duration of every frame, in seconds, 1 / physics_fps of the game instance if None.
+        :param render_every: Render one frame out of render_every, 0 to never render.
+        """
+
+        if render_every < 0:
+            raise ValueError("render_every can't be negative.")
+
+        if delta is None:
+            game_dict = Resource.data["instances"]["game"]
+            delta = 1 / (game_dict["physics_fps"] if "physics_fps" in game_dict else game_dict["fps"])
+
+        self.level_name = level_name
+        self.seed = seed
+        self.delta = delta
+        self.render_every = render_every
+
+        self.instance: InstanceLevel | None = None
+
+        # The player position at the end of every frame, with the name of its level
+        self.trajectory: list[tuple[str, float, float]] = []
+        self.frames = 0
+        self.rendered_frames = 0
+        self.wall_time = 0
+
+    def run(self,
+            frames: int,
+            on_frame: Callable[[InstanceLevel, int], None] = None) -> list[tuple[str, float, float]]:
+        """
+        Create the level and simulate frames, then return the trajectory of the player.
+
+        :param frames: The number of frames to simulate.
+        :param on_frame: Called with the instance and the frame number before every frame, e.g. for a bot to act.
+        """
+
+        return asyncio.run(self._run(frames, on_frame))
+
+    async def _run(self,
+                   frames: int,
+                   on_frame: Callable[[InstanceLevel, int], None] = None) -> list[tuple[str, float, float]]:
+
+        random.seed(self.seed)
+        LoopHandler.delta = self.delta
+
+        self.instance = InstanceLevel(self.level_name, tutorials=False)
+        self.trajectory = []
+        self.frames = self.rendered_frames = 0
+
+        start = time.perf_counter()
+        for frame in range(frames):
+            if on_frame is not None:
+                on_frame(self.instance, frame)
+
+            await self.instance.update()
+
+            if self.render_every and frame % self.render_every == 0:
+                self.instance.render()
+                self.rendered_frames += 1
+
+            player_position = self.instance.level.player.position.body.position
+            self.trajectory.append((self.instance.level.level_name, player_position.x, player_position.y))
+
+        self.wall_time = time.perf_counter() - start
+        self.frames = frames
+
+        return self.trajectory
+
+    @property
+    def frames_per_second(self) -> float:
+        """The simulated frames per second of the last run."""
+
+        return self.frames / self.wall_time if self.wall_time else 0
+
+    @property
+    def trajectory_digest(self) -> str:
+        return hashlib.sha1(repr(self.trajectory).encode()).hexdigest()[:12]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a level without a window, as fast as possible.")
+    parser.add_argument("level_name", nargs="?", default="level_0")
+    parser.add_argument("--frames", type=int, default=3600, help="number of frames to simulate")
+    parser.add_argument("--seed", type=int, default=0, help="seed of random")
+    parser.add_argument("--delta", type=float, default=None, help="duration of a frame, 1 / physics_fps by default")
+    parser.add_argument("--render-every", type=int, default=0, help="render one frame out of N, 0 never renders")
+    parser.add_argument("--check", action="store_true", help="run twice and compare the player trajectories")
+    arguments = parser.parse_args()
+
+    App.init("game/assets/")
+
+    runner = HeadlessRunner(arguments.level_name, arguments.seed, arguments.delta, arguments.render_every)
+    trajectory = runner.run(arguments.frames)
+
+    _, x, y = trajectory[-1]
+    print(f"{runner.level_name}: {runner.frames} frames of {runner.delta * 1000:.2f} ms, "
+          f"{runner.rendered_frames} rendered, seed {runner.seed}")
+    print(f"{runner.wall_time:.2f} s, {runner.frames_per_second:.0f} simulated fps, "
+          f"{runner.frames * runner.delta / runner.wall_time:.1f}x real time")
+    print(f"player at ({x:.2f}, {y:.2f}) in {runner.instance.level.level_name}, trajectory {runner.trajectory_digest}")
+
+    if arguments.check:
+        first_trajectory = trajectory
+        second_trajectory = runner.run(arguments.frames)
+        identical = first_trajectory == second_trajectory
+
+        print(f"second run: trajectory {runner.trajectory_digest}, {'identical' if identical else 'DIFFERENT'}")
+        if not identical:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,14 @@
 import pygame
 
 from isec.app import Resource
-from isec.instance import BaseInstance
+from isec.instance import BaseInstance, InputHandler
 from isec.environment.scene import ComposedScene
 
 from game.instances.instance_pause import InstancePause
 from game.instances.instance_tutorial import InstanceTutorial
 from game.objects.game.player import Player, PlayerDebug  # NOQA
 from game.objects.game.level import Level
+from game.objects.game.level_world import LevelWorld
 from game.objects.game.rope_range_indicator import RopeRangeIndicator
 from game.objects.game.ammo_indicator import AmmoIndicator
 from game.objects.game.transition import Transition
@@ -15,10 +16,21 @@ from game.objects.game.trigger import Trigger
 
 
 class InstanceLevel(BaseInstance):
-    def __init__(self) -> None:
+    def __init__(self,
+                 level_name: str = "level_0",
+                 tutorials: bool = True) -> None:
+        """
+        :param level_name: The level to start with.
+        :param tutorials: Open the tutorials when the player enters their trigger zones. A tutorial waits for the
+            user, so they are disabled to run the level without one, see game.headless.
+        """
+
         super().__init__(Resource.data["instances"]["game"]["fps"])
+        Resource.preload("game")
 
-        self.level = Level("level_0", self)
+        self.tutorials = tutorials
+        self.level = Level(level_name, self)
+        self.next_level_name: str | None = None
         self.triggers: list[Trigger] = []
         self.create_triggers()
         self.scene: ComposedScene = self.level.scene
@@ -35,19 +47,35 @@ class InstanceLevel(BaseInstance):
         self.list_pos = []
 
     async def loop(self) -> None:
+        await self.update()
+        self.render()
+
+    async def update(self) -> None:
+        """
+        Simulate a frame of delta seconds.
+
+        Everything the next frames depend on, the camera included, is done here, so skipping render does not change
+        the simulation.
+        """
+
+        self.level.update()
         self.scene.update(self.delta)
         self.block_player()
 
         await self.check_triggers()
         self.check_level_change()
 
-        self.window.fill(self.level.background_color)
         self.put_player_on_top()
         self.center_camera()
+
+    def render(self) -> None:
+        self.window.fill(self.level.background_color)
         self.scene.render()
 
     def center_camera(self) -> None:
-        self.scene.camera.position.position = self.level.player.position.position - pygame.Vector2(200, 150)
+        # The player is drawn between its physics steps, the camera follows the same position
+        player_position = self.level.player.position.interpolate(self.scene.interpolation_alpha)
+        self.scene.camera.position.position = player_position - pygame.Vector2(200, 150)
 
         if self.scene.camera.position.x < self.level.visible_rect.left:
             self.scene.camera.position.x = self.level.visible_rect.left
@@ -71,7 +99,8 @@ class InstanceLevel(BaseInstance):
 
     def change_level(self,
                      level_name: str) -> None:
-        self.level.level_name = level_name
+        self.next_level_name = level_name
+        LevelWorld.prefetch(level_name)
         self.transition = Transition(self.level.player.position,
                                      self.scene,
                                      self)
@@ -86,7 +115,13 @@ class InstanceLevel(BaseInstance):
                 return
 
             elif self.transition.can_switch:
-                self.level = Level(self.level.level_name, self)
+                if self.next_level_name is None:
+                    self.level.reset()
+                else:
+                    self.level.player.remove_control_callbacks()
+                    self.level = Level(self.next_level_name, self)
+                    self.next_level_name = None
+
                 self.scene = self.level.scene
                 self.rope_range_indicator = RopeRangeIndicator(self.level.player)
                 self.ammo_indicator = AmmoIndicator(self.level.player)
@@ -121,6 +156,9 @@ class InstanceLevel(BaseInstance):
                                              trigger_args))
 
             elif trigger_dict["type"] == "tutorial":
+                if not self.tutorials:
+                    continue
+
                 trigger_args = trigger_dict["tutorial_name"]
                 self.triggers.append(Trigger(trigger_zone,
                                              self.tutorial_trigger,
@@ -153,7 +191,7 @@ class InstanceLevel(BaseInstance):
         print(self.list_pos)
 
     async def print_loc(self) -> None:
-        cursor_pos = pygame.mouse.get_pos()
+        cursor_pos = InputHandler.get_mouse_pos()
         relative_pos = self.scene.camera.position.position+cursor_pos
         relative_pos = [int(relative_pos[0]), int(relative_pos[1])]
         self.list_pos.append(relative_pos)
@@ -8,6 +8,7 @@ from isec.environment import Entity, Sprite
 from isec.environment.sprite import PymunkSprite
 from isec.environment.position import PymunkPos
 from isec.environment.scene import ComposedScene
+from isec.environment.terrain import FlowField
 
 from game.objects.game.shape_info import GhostSI, PlayerSkeletonSI
 
@@ -22,11 +23,11 @@ class Ghost(Entity):
                  position: pygame.Vector2,
                  player: Entity,
                  linked_scene: ComposedScene,
-                 instance: BaseInstance) -> None:
+                 instance: BaseInstance,
+                 flow_field: FlowField | None = None) -> None:
 
         self.player = player
-
-        self.float_pos = [position[0], position[1]]
+        self.flow_field = flow_field
 
         ghost_position = PymunkPos("KINEMATIC", linked_scene.space, GhostSI, position)
 
@@ -41,13 +42,19 @@ class Ghost(Entity):
         super().__init__(ghost_position, ghost_sprite, linked_scene, instance)
 
     def update(self, delta: float) -> None:
-        player_vec = self.player.position.position - self.float_pos
+        ghost_pos = pygame.Vector2(self.position.body.position)
+        player_vec = self.player.position.position - ghost_pos
+
+        # Outside of the flow field (or on the player's tile), the ghost flies straight at the player
+        flow_vec = self.flow_field.sample(ghost_pos) if self.flow_field is not None else None
+        if flow_vec is not None:
+            player_vec = flow_vec
 
+        # The space moves the kinematic body, so the ghost is interpolated like the other bodies
         if player_vec.length() > 0:
-            speed_vec = player_vec.normalize() * self.SPEED * delta
-            self.float_pos[0] += speed_vec.x
-            self.float_pos[1] += speed_vec.y
-            self.position.position = pygame.Vector2(self.float_pos)
+            self.position.speed = player_vec.normalize() * self.SPEED
+        else:
+            self.position.speed = (0, 0)
 
     @classmethod
     def create_collision_handler(cls,
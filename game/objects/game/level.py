@@ -1,21 +1,28 @@
+import numpy
 import pygame
+import pymunk
 import random
 
 from isec.app import Resource
 from isec.instance import BaseInstance
 from isec.environment.scene import ComposedScene
+from isec.objects import CollisionGrid, HierarchicalPathfinder
 from isec.environment.base import Tilemap, Entity
-from isec.environment.terrain.terrain_collision import TerrainCollision
+from isec.environment.position import PymunkPos
+from isec.environment.terrain import TerrainCollision, EditableTerrainCollision, FlowField
 
 from game.objects.game.player import Player
 from game.objects.game.arrow import Arrow
 from game.objects.game.spike import Spike
-from game.objects.game.pellet import Pellet
+from game.objects.game.pellet import Pellet, PelletPool, PelletProjectiles
 from game.objects.game.ghost import Ghost
 from game.objects.game.shape_info import TerrainSI
+from game.objects.game.level_world import LevelWorld
 
 
 class Level:
+    STATIC_ENTITY_TYPES = ("arrow", "spike", "spike_range")
+
     def __init__(self,
                  level_name: str,
                  instance: BaseInstance) -> None:
@@ -26,18 +33,39 @@ class Level:
 
         self.player: Player | None = None
 
-        self.data = Resource.data["levels"][self.level_name]
+        self.world = LevelWorld.get(self.level_name)
+        self.data = self.world.data
 
         self.terrain_tilemap: Tilemap | None = None
-        self.collision_maps: dict[str, list[list[bool]]] = {}
+        self.collision_maps: dict[str, numpy.ndarray] = self.world.collision_maps
+        self.collision_grid: CollisionGrid = self.world.collision_grid
+        self.pathfinder: HierarchicalPathfinder | None = self.world.pathfinder
+        if self.world.destructible_tiles:
+            # The tiles of this level can change, the world's collision maps are shared by every Level
+            self.collision_maps = {name: collision_map.copy() for name, collision_map in self.collision_maps.items()}
+            self.collision_grid = self.collision_grid.copy()
+            if self.pathfinder is not None:
+                self.pathfinder = self.pathfinder.copy(self.collision_maps["terrain"])
 
         self.background_color: tuple[int, int, int] = (0, 0, 0)
         self.visible_rect: pygame.Rect = pygame.Rect(0, 0, 0, 0)
 
+        self.terrain_collision: TerrainCollision | None = None
+        self.flow_field: FlowField | None = None
+        self.pellets: PelletPool | PelletProjectiles | None = None
+
+        # Entities kept by reset: the world overlays, and the static entities by index in the level's entity list
+        self._world_entities: list[Entity] = []
+        self._static_entities: dict[int, list[Entity]] = {}
+
         self.load_level()
 
     def load_level(self) -> None:
-        self._scene = ComposedScene(self.instance.fps)
+        game_dict = Resource.data["instances"]["game"]
+        physics_fps = game_dict["physics_fps"] if "physics_fps" in game_dict else self.instance.fps
+        max_substeps = game_dict["max_substeps"] if "max_substeps" in game_dict else 8
+
+        self._scene = ComposedScene(self.instance.fps, step_size=1 / physics_fps, max_substeps=max_substeps)
 
         self._create_world()
         self._create_entities()
@@ -54,119 +82,240 @@ class Level:
                              self.instance)
         """
 
-    def _create_world(self):
-        self.background_color = Resource.data["colors"][self.data["info"]["world"]["color"]]
+    def reset(self) -> None:
+        """
+        Put the level back in its initial state, without rebuilding the world.
 
-        # customizing pymunk space
-        if "physics" in self.data["info"]:
-            physics_dict = self.data["info"]["physics"]
-            self.scene.space.gravity = physics_dict["gravity"] if "gravity" in physics_dict else (0, 750)  # px/s²
-            self.scene.space.damping = physics_dict["damping"] if "damping" in physics_dict else 0.3
+        The scene, the tilemaps, the terrain and the static entities (arrows, spikes) are kept. Every other entity
+        (player, ghosts, pellets, rope, ...) is removed with its bodies and the constraints, then the player and the
+        ghosts are created again.
+        """
 
-        else:
-            self.scene.space.gravity = (0, 750)
-            self.scene.space.damping = 0.3
+        if self.player is not None:
+            self.player.remove_control_callbacks()
+            self.player = None
 
-        for layer_name in self.data["info"]["world"]:
-            if layer_name == "color":
-                continue
+        kept_entities = self._world_entities + [entity
+                                                for entities in self._static_entities.values()
+                                                for entity in entities]
+        kept_bodies = {entity.position.body for entity in kept_entities if isinstance(entity.position, PymunkPos)}
+        kept_bodies.add(self.terrain_collision.body)
+
+        self.pellets.release_all()
+
+        space = self._scene.space
+        space.remove(*space.constraints)
+        for body in space.bodies:
+            if body not in kept_bodies:
+                space.remove(body, *[shape for shape in body.shapes if shape.space is not None])
+
+        if self.world.destructible_tiles:
+            self._restore_terrain()
 
-            layer_dict = self.data["info"]["world"][layer_name]
-            layer_depth = layer_dict["depth"] if "depth" in layer_dict else 1
+        self._scene.entities[:] = self._world_entities
+        self._create_entities()
+        self._create_collision_handlers()
 
-            tileset_surface = Resource.image["game"]["tileset"][layer_dict["tileset"]["name"]]
-            tileset = Tilemap.create_tileset_from_surface(tileset_surface,
-                                                          layer_dict["tileset"]["tile_size"],
-                                                          0,
-                                                          0)
+    def _create_world(self):
+        self.background_color = self.world.background_color
 
-            layer_tilemap = Tilemap(tilemap_array=self.data[layer_name],
-                                    tileset=tileset,
-                                    parallax_depth=layer_depth)
-            layer_tilemap.name = layer_name
+        # customizing pymunk space
+        self.scene.space.gravity = self.world.gravity
+        self.scene.space.damping = self.world.damping
 
-            if "solid_tiles" in layer_dict:
+        for layer in self.world.layers:
+            layer_tilemap = layer.create_tilemap()
+
+            if layer.is_terrain:
                 self.terrain_tilemap = layer_tilemap
                 self.collidable_tilemaps = layer_tilemap
-                for collision_layer in layer_dict["solid_tiles"]:
-                    collidable_tiles = layer_dict["solid_tiles"][collision_layer]
-                    self.collision_maps[collision_layer] = layer_tilemap.create_collision_map(collidable_tiles)
 
-            self._scene.add_tilemap_scene(layer_tilemap)
+            self._scene.add_tilemap_scene(layer_tilemap, layer.chunk_size)
+
+        self._create_terrain_collision()
+
+        if self.world.flow_field:
+            self.flow_field = FlowField(self.collision_maps["terrain"],
+                                        self.world.tile_size,
+                                        self._scene,
+                                        self.instance,
+                                        budget=self.world.flow_field_budget,
+                                        show_overlay=False)
+
+        self._create_pellets()
+
+        self._world_entities = list(self._scene.entities)
+
+    def _create_pellets(self) -> None:
+        """Create the shotgun pellets with the world, they are reused by every shot."""
+
+        on_terrain_hit = self._destroy_tile if self.world.destructible_tiles else None
+        simulation = Resource.data["objects"]["pellet"]["SIMULATION"]
+
+        if simulation == "projectiles":
+            self.pellets = PelletProjectiles(self.collision_maps["terrain"],
+                                             self.world.tile_size,
+                                             self._scene,
+                                             self.instance,
+                                             on_terrain_hit=on_terrain_hit)
 
-        self._add_terrain_collision_entities()
+        elif simulation == "bodies":
+            self.pellets = PelletPool(self._scene, self.instance)
+
+        else:
+            raise ValueError(f"Unknown pellet simulation {simulation}.")
+
+    def update(self) -> None:
+        """Update the level services shared by the entities, before the scene update."""
+
+        if self.flow_field is not None:
+            self.flow_field.set_target(self.player.position.position)
+            self.flow_field.update()
 
     def _create_entities(self) -> None:
-        for entity_dict in self.data["info"]["entities"]:
+        for entity_index, entity_dict in enumerate(self.data["info"]["entities"]):
             entity_type = entity_dict["type"]
-            entity_position = entity_dict["position"] if "position" in entity_dict else pygame.Vector2(0, 0)
-            entity_angle = entity_dict["angle"] if "angle" in entity_dict else 0
-
-            if entity_type == "player":
-                if self.player is not None:
-                    raise ValueError(f"Level {self.level_name} already have one player entity.")
-
-                self.player = Player(entity_position,
-                                     self._scene,
-                                     self.instance,
-                                     self)
-                self.scene.add_entities(self.player)
-
-            elif entity_type == "arrow":
-                self.scene.add_entities(Arrow(entity_position,
-                                        entity_angle,
-                                        self._scene,
-                                        self.instance))
 
-            elif entity_type == "spike":
-                self.scene.add_entities(Spike(entity_position,
-                                        entity_angle,
-                                        self._scene,
-                                        self.instance))
+            if entity_index in self._static_entities:
+                self.scene.add_entities(*self._static_entities[entity_index])
+                continue
+
+            if entity_type in self.STATIC_ENTITY_TYPES:
+                entity_count = len(self.scene.entities)
+                self._create_entity(entity_dict)
+                self._static_entities[entity_index] = self.scene.entities[entity_count:]
+                continue
 
-            elif entity_type == "spike_range":
-                spacing = entity_dict["spacing"] if "spacing" in entity_dict else 7
-                start_position = entity_dict["start_position"]
-                end_position = entity_dict["end_position"]
-                spike_vector = pygame.Vector2(end_position) - pygame.Vector2(start_position)
-                angle = entity_dict["angle"] if "angle" in entity_dict else spike_vector.as_polar()[1]
-                unit_vector = pygame.Vector2(spacing, 0).rotate(angle)
-                number_of_spikes = int(spike_vector.length() / spacing)
-                for i in range(number_of_spikes):
-                    self.scene.add_entities(Spike(start_position + unit_vector * i,
-                                            angle+random.randint(-200, 200)/10,
-                                            self._scene,
-                                            self.instance))
-
-            elif entity_type == "ghost":
-                entity_position = entity_dict["position"]
-                self.scene.add_entities(Ghost(entity_position,
-                                        self.player,
+            self._create_entity(entity_dict)
+
+    def _create_entity(self,
+                       entity_dict: dict) -> None:
+
+        entity_type = entity_dict["type"]
+        entity_position = entity_dict["position"] if "position" in entity_dict else pygame.Vector2(0, 0)
+        entity_angle = entity_dict["angle"] if "angle" in entity_dict else 0
+
+        if entity_type == "player":
+            if self.player is not None:
+                raise ValueError(f"Level {self.level_name} already have one player entity.")
+
+            self.player = Player(entity_position,
+                                 self._scene,
+                                 self.instance,
+                                 self)
+            self.scene.add_entities(self.player)
+
+        elif entity_type == "arrow":
+            self.scene.add_entities(Arrow(entity_position,
+                                    entity_angle,
+                                    self._scene,
+                                    self.instance))
+
+        elif entity_type == "spike":
+            self.scene.add_entities(Spike(entity_position,
+                                    entity_angle,
+                                    self._scene,
+                                    self.instance))
+
+        elif entity_type == "spike_range":
+            spacing = entity_dict["spacing"] if "spacing" in entity_dict else 7
+            start_position = entity_dict["start_position"]
+            end_position = entity_dict["end_position"]
+            spike_vector = pygame.Vector2(end_position) - pygame.Vector2(start_position)
+            angle = entity_dict["angle"] if "angle" in entity_dict else spike_vector.as_polar()[1]
+            unit_vector = pygame.Vector2(spacing, 0).rotate(angle)
+            number_of_spikes = int(spike_vector.length() / spacing)
+            for i in range(number_of_spikes):
+                self.scene.add_entities(Spike(start_position + unit_vector * i,
+                                        angle+random.randint(-200, 200)/10,
                                         self._scene,
                                         self.instance))
 
-            else:
-                raise ValueError(f"Unknown entity {entity_type} in level {self.level_name}.")
+        elif entity_type == "ghost":
+            entity_position = entity_dict["position"]
+            self.scene.add_entities(Ghost(entity_position,
+                                    self.player,
+                                    self._scene,
+                                    self.instance,
+                                    self.flow_field))
+
+        else:
+            raise ValueError(f"Unknown entity {entity_type} in level {self.level_name}.")
 
     def _create_collision_handlers(self) -> None:
         self.player.create_collision_handler(self._scene.space)
         Spike.create_collision_handler(self._scene.space)
         Ghost.create_collision_handler(self._scene.space)
-        Pellet.create_body_arbiters(self._scene)
+        if isinstance(self.pellets, PelletPool):
+            Pellet.create_body_arbiters(self._scene, self._on_pellet_hit if self.world.destructible_tiles else None)
+
+    def _create_terrain_collision(self) -> None:
+        if self.world.destructible_tiles:
+            self.terrain_collision = EditableTerrainCollision(self.collision_maps["terrain"],
+                                                              self.world.tile_size,
+                                                              TerrainSI,
+                                                              self._scene,
+                                                              self.instance,
+                                                              show_collisions=False,
+                                                              decomposition=self.world.terrain_decomposition,
+                                                              chunk_size=self.world.terrain_chunk_size,
+                                                              chunk_polygons=self.world.terrain_chunk_polygons)
+
+            self.terrain_collision.link_tilemap(self.terrain_tilemap, self.world.solid_tiles["terrain"])
+            self.terrain_tilemap.register_tile_change_callback(self._update_collision_maps)
+
+        else:
+            self.terrain_collision = TerrainCollision.from_polygons(self.world.terrain_polygons,
+                                                                    self._scene,
+                                                                    self.instance,
+                                                                    shape_info=TerrainSI,
+                                                                    show_collisions=False)
+
+    def _update_collision_maps(self,
+                               x: int,
+                               y: int) -> None:
+
+        tile = int(self.terrain_tilemap[y, x])
+        for collision_layer, collision_map in self.collision_maps.items():
+            collision_map[y, x] = tile in self.world.solid_tiles[collision_layer]
+
+        self.collision_grid.set_cell(x, y, [collision_layer
+                                            for collision_layer, solid_tiles in self.world.solid_tiles.items()
+                                            if tile in solid_tiles])
+
+        if self.pathfinder is not None:
+            self.pathfinder.invalidate(x, y)
+
+    def _on_pellet_hit(self,
+                       point: pymunk.Vec2d,
+                       normal: pymunk.Vec2d) -> None:
+        """Destroy the terrain tile hit by a pellet, if it is destructible."""
+
+        # The contact point is on the rounded terrain shape, just outside the tile
+        point = point + normal * (TerrainCollision.SHAPES_RADIUS + 1)
+        self._destroy_tile(int(point.x // self.world.tile_size), int(point.y // self.world.tile_size))
+
+    def _destroy_tile(self,
+                      x: int,
+                      y: int) -> None:
+        """Destroy a terrain tile, if it is destructible."""
+
+        if not (0 <= x < self.terrain_tilemap.width and 0 <= y < self.terrain_tilemap.height):
+            return
+
+        if int(self.terrain_tilemap[y, x]) in self.world.destructible_tiles:
+            self.terrain_tilemap.set_tile(x, y, Tilemap.EMPTY_TILE)
+
+    def _restore_terrain(self) -> None:
+        """Put back the destroyed tiles, and rebuild their collisions now."""
 
-    def _add_terrain_collision_entities(self) -> None:
-        if "terrain" not in self.collision_maps:
-            err_msg = f"Level {self.level_name} has no terrain collision map."
-            raise ValueError(err_msg)
+        initial_tiles = self.world.terrain_layer.tilemap_array
+        changed_ys, changed_xs = numpy.nonzero(self.terrain_tilemap.tilemap_array != initial_tiles)
 
-        terrain_entities = TerrainCollision.from_collision_map(self.collision_maps["terrain"],
-                                                               self.terrain_tilemap.tile_size,
-                                                               self._scene,
-                                                               self.instance,
-                                                               shape_info=TerrainSI,
-                                                               show_collisions=False)
+        for x, y in zip(changed_xs.tolist(), changed_ys.tolist()):
+            self.terrain_tilemap.set_tile(x, y, int(initial_tiles[y, x]))
 
-        self._scene.add_entities(*terrain_entities)
+        self.terrain_collision.rebuild()
 
     def _add_entities(self, *args: Entity):
         self._scene.add_entities(*args)
@@ -0,0 +1,210 @@
+import concurrent.futures
+import typing
+import numpy
+import pygame
+
+from isec.app import Resource
+from isec.objects import CollisionGrid, HierarchicalPathfinder
+from isec.environment.base import Tilemap
+from isec.environment.terrain.terrain_collision import TerrainCollision
+
+
+class LevelLayer:
+    __slots__ = ["name", "tileset", "tilemap_array", "depth", "chunk_size", "is_terrain"]
+
+    def __init__(self,
+                 name: str,
+                 tileset: dict[int, pygame.Surface | None],
+                 tilemap_array: numpy.ndarray,
+                 depth: float,
+                 chunk_size: int | None,
+                 is_terrain: bool) -> None:
+
+        self.name = name
+        self.tileset = tileset
+        self.tilemap_array = tilemap_array
+        self.depth = depth
+        self.chunk_size = chunk_size
+        self.is_terrain = is_terrain
+
+    def create_tilemap(self) -> Tilemap:
+        tilemap = Tilemap(tilemap_array=self.tilemap_array,
+                          tileset=self.tileset,
+                          parallax_depth=self.depth)
+        tilemap.name = self.name
+
+        return tilemap
+
+
+class LevelWorld:
+    """
+    The static data of a level: tilesets, tilemap layers, collision maps, terrain polygons and pathfinding graph.
+
+    It is built once per level name and shared by every Level created for it, so respawning or coming back to a
+    level does not slice the tilesets or decompose the terrain again.
+    A world can also be prefetched in a worker thread, e.g. while a transition hides the screen.
+    """
+
+    _worlds: dict[str, "LevelWorld"] = {}
+    _prefetched: dict[str, concurrent.futures.Future] = {}
+    _executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    def __init__(self,
+                 level_name: str) -> None:
+
+        self.level_name = level_name
+        self.data = Resource.data["levels"][level_name]
+
+        self.background_color: tuple[int, int, int] = Resource.data["colors"][self.data["info"]["world"]["color"]]
+        self.gravity, self.damping = self._get_physics()
+
+        self.layers: list[LevelLayer] = []
+        self.terrain_layer: LevelLayer | None = None
+        self.collision_maps: dict[str, numpy.ndarray] = {}
+        self.solid_tiles: dict[str, frozenset[int]] = {}
+        self.tile_size: int | None = None
+
+        self._create_layers()
+
+        if "terrain" not in self.collision_maps:
+            err_msg = f"Level {self.level_name} has no terrain collision map."
+            raise ValueError(err_msg)
+
+        self.collision_grid = CollisionGrid(self.collision_maps)
+
+        # Destructible terrains are decomposed by chunks, so a destroyed tile only rebuilds its chunk
+        self.destructible_tiles: frozenset[int] = frozenset(self._get_terrain_option("destructible_tiles", []))
+        self.terrain_chunk_size: int = self._get_terrain_option("chunk_size", 16)
+        self.terrain_decomposition: str = self._get_terrain_option("decomposition",
+                                                                   "rectangles" if self.destructible_tiles else "march")
+
+        # Ghosts follow the shortest path to the player over the terrain, instead of flying straight through it
+        self.flow_field: bool = self._get_terrain_option("flow_field", False)
+        self.flow_field_budget: int | None = self._get_terrain_option("flow_field_budget", None)
+
+        # The abstract graph of the hierarchical pathfinder is built once here, for the levels using it
+        self.pathfinder: HierarchicalPathfinder | None = None
+        pathfinding_cluster_size = self._get_terrain_option("pathfinding_cluster_size", None)
+        if pathfinding_cluster_size is not None:
+            self.pathfinder = HierarchicalPathfinder(self.collision_maps["terrain"], pathfinding_cluster_size)
+
+        self.terrain_polygons: list[list[tuple]] | None = None
+        self.terrain_chunk_polygons: dict[tuple[int, int], list[list[tuple]]] | None = None
+
+        if self.destructible_tiles:
+            self.terrain_chunk_polygons = TerrainCollision.decompose_collision_map_by_chunks(
+                self.collision_maps["terrain"],
+                self.tile_size,
+                self.terrain_chunk_size,
+                self.terrain_decomposition)
+
+        else:
+            self.terrain_polygons = TerrainCollision.decompose_collision_map(self.collision_maps["terrain"],
+                                                                             self.tile_size,
+                                                                             self.terrain_decomposition)
+
+    @classmethod
+    def get(cls,
+            level_name: str) -> "LevelWorld":
+        """Return the world of a level, built the first time it is requested."""
+
+        if level_name in cls._prefetched:
+            cls._worlds[level_name] = cls._prefetched.pop(level_name).result()
+
+        if level_name not in cls._worlds:
+            cls._worlds[level_name] = cls(level_name)
+
+        return cls._worlds[level_name]
+
+    @classmethod
+    def prefetch(cls,
+                 level_name: str) -> None:
+        """
+        Start building the world of a level in a worker thread, get will wait for it if it is not done yet.
+
+        The tileset surfaces are decoded on the calling thread first, decoding may need the display.
+        """
+
+        if level_name in cls._worlds or level_name in cls._prefetched:
+            return
+
+        Resource.preload("game/tileset")
+
+        if cls._executor is None:
+            cls._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="LevelWorld")
+
+        cls._prefetched[level_name] = cls._executor.submit(cls, level_name)
+
+    @classmethod
+    def is_ready(cls,
+                 level_name: str) -> bool:
+
+        if level_name in cls._prefetched:
+            return cls._prefetched[level_name].done()
+
+        return level_name in cls._worlds
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        for future in cls._prefetched.values():
+            future.cancel()
+
+        cls._prefetched.clear()
+        cls._worlds.clear()
+
+    def _get_physics(self) -> tuple[tuple[float, float], float]:
+        if "physics" in self.data["info"]:
+            physics_dict = self.data["info"]["physics"]
+            gravity = physics_dict["gravity"] if "gravity" in physics_dict else (0, 750)  # px/s²
+            damping = physics_dict["damping"] if "damping" in physics_dict else 0.3
+            return gravity, damping
+
+        return (0, 750), 0.3
+
+    def _get_terrain_option(self,
+                            option_name: str,
+                            default: typing.Any) -> typing.Any:
+
+        if "terrain" in self.data["info"] and option_name in self.data["info"]["terrain"]:
+            return self.data["info"]["terrain"][option_name]
+
+        return default
+
+    def _create_layers(self) -> None:
+        for layer_name in self.data["info"]["world"]:
+            if layer_name == "color":
+                continue
+
+            layer_dict = self.data["info"]["world"][layer_name]
+            layer_depth = layer_dict["depth"] if "depth" in layer_dict else 1
+            layer_chunk_size = layer_dict["chunk_size"] if "chunk_size" in layer_dict else self._default_chunk_size()
+
+            tileset_surface = Resource.image["game"]["tileset"][layer_dict["tileset"]["name"]]
+            tileset = Tilemap.create_tileset_from_surface(tileset_surface,
+                                                          layer_dict["tileset"]["tile_size"],
+                                                          0,
+                                                          0)
+
+            layer = LevelLayer(layer_name,
+                               tileset,
+                               numpy.array(self.data[layer_name], dtype=Tilemap.DTYPE, ndmin=2),
+                               layer_depth,
+                               layer_chunk_size,
+                               "solid_tiles" in layer_dict)
+
+            if layer.is_terrain:
+                tilemap = layer.create_tilemap()
+                self.terrain_layer = layer
+                self.tile_size = tilemap.tile_size
+
+                for collision_layer in layer_dict["solid_tiles"]:
+                    collidable_tiles = layer_dict["solid_tiles"][collision_layer]
+                    self.solid_tiles[collision_layer] = frozenset(collidable_tiles)
+                    self.collision_maps[collision_layer] = tilemap.create_collision_map(collidable_tiles)
+
+            self.layers.append(layer)
+
+    @staticmethod
+    def _default_chunk_size() -> int | None:
+        game_dict = Resource.data["instances"]["game"]
+        return game_dict["tilemap_chunk_size"] if "tilemap_chunk_size" in game_dict else None
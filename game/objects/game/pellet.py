@@ -1,15 +1,16 @@
 import math
 import random
 
-from typing import Self
+from collections.abc import Callable
 
-import pygame
+import numpy
 import pymunk
 
 from isec.app import Resource
 from isec.environment.position import PymunkPos
 from isec.environment.base import Sprite, Entity
 from isec.environment.scene import EntityScene, ComposedScene
+from isec.environment.terrain import ProjectileSystem
 from isec.instance import BaseInstance
 
 from game.objects.game.shape_info import PelletSI, TerrainSI
@@ -23,29 +24,26 @@ class Pellet(Entity):
     DENSITY = 0.01  # kg per pixel ** 2
 
     def __init__(self,
-                 initial_position: pygame.Vector2,
-                 direction: float,
+                 pool: "PelletPool",
                  linked_scene: ComposedScene | EntityScene,
                  linked_instance: BaseInstance) -> None:
-        """Pellet object used by the shotgun. The shotgun shoots a spray of pellets and propel the player backwards."""
+        """
+        Pellet object used by the shotgun. The shotgun shoots a spray of pellets and propel the player backwards.
+
+        The pellets are owned by a PelletPool: a pellet is created once, out of the space and of the scene, then fired
+        and released again and again.
+        """
+
+        self.pool = pool
 
         # Position related
         pellet_position = PymunkPos(body_type="DYNAMIC",
                                     space=linked_scene.space,
-                                    default_shape_info=PelletSI,
-                                    position=pygame.Vector2(*initial_position))
+                                    default_shape_info=PelletSI)
 
         pellet_position.add_shape(pymunk.Circle(body=pellet_position.body,
                                                 radius=1))
 
-        direction = direction + random.uniform(-self.ANGULAR_SPRAY, self.ANGULAR_SPRAY)
-        speed_norm = random.gauss(self.VELOCITY_MEAN, self.VELOCITY_STD)
-
-        pellet_position.speed = pygame.Vector2(speed_norm * math.cos(math.radians(direction)),
-                                               speed_norm * math.sin(math.radians(direction)))
-
-        pellet_position.add_to_space()
-
         # Sprite related
         pellet_sprite = Sprite(Resource.image["game"]["objects"]["pellet"], rendering_technique="cached")
 
@@ -54,12 +52,34 @@ class Pellet(Entity):
                          linked_scene=linked_scene,
                          linked_instance=linked_instance)
 
+        self.linked_scene.remove_entities(self)
+
+    def fire(self,
+             initial_position: tuple[float, float],
+             direction: float) -> None:
+        """Put the pellet in the space and the scene, with a random spray and speed around the direction."""
+
+        direction = direction + random.uniform(-self.ANGULAR_SPRAY, self.ANGULAR_SPRAY)
+        speed_norm = random.gauss(self.VELOCITY_MEAN, self.VELOCITY_STD)
+
+        self.position.position = initial_position
+        self.position.speed = (speed_norm * math.cos(math.radians(direction)),
+                               speed_norm * math.sin(math.radians(direction)))
+        self.position.angle = direction
+        self.position.angular_speed = 0
+
+        # Adding the shapes back to the space gives the body its mass back
+        self.position.add_to_space()
+
+        self.to_delete = False
+        self.linked_scene.add_entities(self)
+
     def update(self,
                delta: float) -> None:
         """Update the pellet."""
 
         if not self.position.body.mass:
-            self.destroy()
+            self.pool.release(self)
             Resource.sound["game"]["shotgun"]["pellet_hit"].play()
             return
 
@@ -69,27 +89,17 @@ class Pellet(Entity):
         pellet_angle = math.degrees(math.atan2(self.position.body.velocity.y, self.position.body.velocity.x))
         self.position.angle = pellet_angle
 
-    @classmethod
-    def shot_pellets(cls,
-                     initial_position: tuple[float, float],
-                     direction: float,
-                     linked_scene: ComposedScene | EntityScene,
-                     linked_instance: BaseInstance) -> list[Self]:
-
-        pellets = []
-
-        for _ in range(cls.QUANTITY_PER_SHOT):
-            pellets.append(cls(initial_position,
-                               direction,
-                               linked_scene,
-                               linked_instance))
-
-        return pellets
-
     @classmethod
     def create_body_arbiters(cls,
-                             scene: ComposedScene | EntityScene) -> None:
-        """Create the arbiters for the player's body."""
+                             scene: ComposedScene | EntityScene,
+                             on_terrain_hit: Callable[[pymunk.Vec2d, pymunk.Vec2d], None] = None) -> None:
+        """
+        Create the arbiters for the player's body.
+
+        :param scene: The scene of the pellets.
+        :param on_terrain_hit: Called with the contact point and the normal, pointing into the terrain, every time a
+            pellet hits the terrain.
+        """
 
         scene_space: pymunk.Space = scene.space
 
@@ -100,6 +110,9 @@ class Pellet(Entity):
                   _space: pymunk.Space,
                   _data: dict):
 
+            if on_terrain_hit is not None and arbiter.contact_point_set.points:
+                on_terrain_hit(arbiter.contact_point_set.points[0].point_b, arbiter.contact_point_set.normal)
+
             for shape in arbiter.shapes:
                 if shape.collision_type == PelletSI.collision_type:
                     _space.remove(shape.body, *shape.body.shapes)
@@ -107,3 +120,173 @@ class Pellet(Entity):
             return False
 
         t.begin = begin
+
+
+class PelletPool:
+    """
+    The pellets of a scene, created in advance and reused, so shooting does not allocate any body, shape or sprite.
+
+    A fired pellet is active until it hits the terrain, it is then released: out of the space and the scene, ready to
+    be fired again. The pool grows when no pellet is free, up to its high-water mark; past it, the oldest active
+    pellets, usually lost out of the level, are fired again.
+    """
+
+    def __init__(self,
+                 linked_scene: ComposedScene | EntityScene,
+                 linked_instance: BaseInstance,
+                 preallocated: int | None = None,
+                 high_water_mark: int | None = None) -> None:
+        """
+        :param preallocated: The number of pellets created now, POOL.PREALLOCATED in pellet.yml if None.
+        :param high_water_mark: The maximum number of pellets, POOL.HIGH_WATER_MARK in pellet.yml if None.
+        """
+
+        pool_dict = Resource.data["objects"]["pellet"]["POOL"]
+
+        self.linked_scene = linked_scene
+        self.linked_instance = linked_instance
+
+        self.preallocated: int = preallocated if preallocated is not None else pool_dict["PREALLOCATED"]
+        self.high_water_mark: int = high_water_mark if high_water_mark is not None else pool_dict["HIGH_WATER_MARK"]
+
+        if self.high_water_mark < max(self.preallocated, Pellet.QUANTITY_PER_SHOT):
+            err_msg = (f"The pellet pool high-water mark ({self.high_water_mark}) must be at least the number of "
+                       f"preallocated pellets and of pellets per shot.")
+            raise ValueError(err_msg)
+
+        self._free: list[Pellet] = []
+        # Ordered by firing time, the oldest first
+        self._active: dict[Pellet, None] = {}
+
+        self.stats: dict[str, int] = {"allocated": 0,
+                                      "fired": 0,
+                                      "recycled": 0,
+                                      "peak_active": 0}
+
+        for _ in range(self.preallocated):
+            self._free.append(self._allocate())
+
+    def shoot(self,
+              initial_position: tuple[float, float],
+              direction: float) -> None:
+        """Fire the pellets of a shotgun shot."""
+
+        for _ in range(Pellet.QUANTITY_PER_SHOT):
+            self._acquire().fire(initial_position, direction)
+
+        self.stats["fired"] += Pellet.QUANTITY_PER_SHOT
+        self.stats["peak_active"] = max(self.stats["peak_active"], len(self._active))
+
+    def release(self,
+                pellet: Pellet) -> None:
+        """Take a pellet out of the space and the scene, and make it free to be fired again."""
+
+        if pellet not in self._active:
+            return
+
+        del self._active[pellet]
+        self._remove_from_space(pellet)
+        pellet.destroy()
+
+        self._free.append(pellet)
+
+    def release_all(self) -> None:
+        """Release every active pellet, e.g. when the level is reset."""
+
+        for pellet in list(self._active):
+            self.release(pellet)
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    @property
+    def free_count(self) -> int:
+        return len(self._free)
+
+    def _acquire(self) -> Pellet:
+        if self._free:
+            pellet = self._free.pop()
+
+        elif self.stats["allocated"] < self.high_water_mark:
+            pellet = self._allocate()
+
+        else:
+            pellet = next(iter(self._active))
+            del self._active[pellet]
+            self._remove_from_space(pellet)
+            self.stats["recycled"] += 1
+
+        self._active[pellet] = None
+        return pellet
+
+    def _allocate(self) -> Pellet:
+        self.stats["allocated"] += 1
+        return Pellet(self, self.linked_scene, self.linked_instance)
+
+    @staticmethod
+    def _remove_from_space(pellet: Pellet) -> None:
+        # The terrain arbiter may already have removed the pellet
+        if pellet.position.body.space is not None:
+            pellet.position.remove_from_space()
+
+
+class PelletProjectiles(ProjectileSystem):
+    """
+    The pellets of a scene as projectiles, without any pymunk body: a drop-in replacement of PelletPool.
+
+    The pellets are sprayed like the Pellet bodies, but only collide with the tiles of the collision map.
+    """
+
+    def __init__(self,
+                 collision_map: numpy.ndarray,
+                 tile_size: int,
+                 linked_scene: ComposedScene | EntityScene,
+                 linked_instance: BaseInstance,
+                 capacity: int | None = None,
+                 on_terrain_hit: Callable[[int, int], None] = None) -> None:
+        """
+        :param capacity: The maximum number of pellets in flight, PROJECTILES.CAPACITY in pellet.yml if None.
+        :param on_terrain_hit: Called with the x and y of the tile, every time a pellet hits the terrain.
+        """
+
+        if capacity is None:
+            capacity = Resource.data["objects"]["pellet"]["PROJECTILES"]["CAPACITY"]
+
+        self.on_terrain_hit = on_terrain_hit
+
+        super().__init__(collision_map,
+                         tile_size,
+                         Resource.image["game"]["objects"]["pellet"],
+                         linked_scene,
+                         linked_instance,
+                         capacity=capacity,
+                         on_hit=self._on_hit)
+
+    def shoot(self,
+              initial_position: tuple[float, float],
+              direction: float) -> None:
+        """Fire the pellets of a shotgun shot."""
+
+        velocities = []
+        for _ in range(Pellet.QUANTITY_PER_SHOT):
+            pellet_direction = math.radians(direction + random.uniform(-Pellet.ANGULAR_SPRAY, Pellet.ANGULAR_SPRAY))
+            speed_norm = random.gauss(Pellet.VELOCITY_MEAN, Pellet.VELOCITY_STD)
+            velocities.append((speed_norm * math.cos(pellet_direction), speed_norm * math.sin(pellet_direction)))
+
+        self.emit([initial_position] * Pellet.QUANTITY_PER_SHOT, velocities)
+
+    def release_all(self) -> None:
+        """Remove every pellet in flight, e.g. when the level is reset."""
+
+        self.clear()
+
+    def _on_hit(self,
+                _positions: numpy.ndarray,
+                tiles: numpy.ndarray) -> None:
+
+        Resource.sound["game"]["shotgun"]["pellet_hit"].play()
+
+        if self.on_terrain_hit is not None:
+            for x, y in tiles.tolist():
+                self.on_terrain_hit(x, y)
@@ -5,16 +5,14 @@ import random
 import typing
 
 from isec.app import Resource
-from isec.instance.base_instance import BaseInstance
+from isec.instance import BaseInstance, InputHandler
 from isec.environment.base import Entity
 from isec.environment.scene import ComposedScene
 from isec.environment.sprite import StateSprite, PymunkSprite
 from isec.environment.position import PymunkPos
-from isec.objects.raycaster import cast_ray
 
 from game.objects.game.shape_info import PlayerSkeletonSI, PlayerFeetSI, PlayerLeftSI, PlayerRightSI, TerrainSI
 from game.objects.controls import Controls
-from game.objects.game.pellet import Pellet
 from game.objects.game.rope import Rope
 
 
@@ -86,6 +84,7 @@ class Player(Entity):
         self.collision_status = None
         self._reset_collision_status()
 
+        self._control_callbacks: list[typing.Callable] = []
         self._add_control_callbacks()
 
         # Position related
@@ -115,11 +114,11 @@ class Player(Entity):
         if math.floor(self.shells) > old_count:
             Resource.sound["game"]["shotgun"][f"reload_{math.floor(self.shells)}"].play()
 
-        self._handle_user_inputs()
+        self._handle_user_inputs(delta)
         self.sprite.update(delta)
 
-        self._reset_user_inputs()
-        self._reset_collision_status()
+        self._reset_user_inputs(delta)
+        self._reset_collision_status(delta)
 
     def is_dead(self) -> bool:
         if self.skeleton.dead and not self._dead:
@@ -150,7 +149,7 @@ class Player(Entity):
             Resource.sound["game"]["shotgun"][f"shot_{random.randint(1,3)}"].play()
             self.shells -= 1
 
-        cursor_vec = pygame.Vector2([pygame.mouse.get_pos()[i] - (200, 150)[i] for i in range(2)]).normalize()
+        cursor_vec = pygame.Vector2([InputHandler.get_mouse_pos()[i] - (200, 150)[i] for i in range(2)]).normalize()
 
         angle = math.degrees(math.atan2(*cursor_vec))
         new_dir = int(math.copysign(1, angle))
@@ -160,36 +159,32 @@ class Player(Entity):
         # Shoot
         pellet_direction = 90 - math.degrees(math.atan2(*cursor_vec))
         pellet_position = (self.position.position[0], self.position.position[1])
-        Pellet.shot_pellets(initial_position=pellet_position,
-                            direction=pellet_direction,
-                            linked_scene=self.linked_scene,
-                            linked_instance=self.linked_instance)
+        self.level.pellets.shoot(initial_position=pellet_position,
+                                 direction=pellet_direction)
 
         # Propel player
         impulse_vec = -(cursor_vec * self.SHOTGUN_KNOCKBACK)
         self.position.body.apply_impulse_at_local_point(tuple(impulse_vec))
 
     def _create_rope(self) -> None:
-        cursor_pos = pygame.Vector2(pygame.mouse.get_pos()) + self.linked_scene.camera.position.position
+        cursor_pos = pygame.Vector2(InputHandler.get_mouse_pos()) + self.linked_scene.camera.position.position
         tile_size = self.level.terrain_tilemap.tile_size
         max_ray_length = Resource.data["objects"]["player"]["UTILS"]["ROPE_MAX_LENGTH"]/tile_size
-        grab_ray_pos, hit = cast_ray(self.level.collision_maps["grappling"],
-                                     tile_size,
-                                     self.position.position,
-                                     cursor_pos-self.position.position,
-                                     max_ray_length)
-
-        if not hit:
+        ray_results = self.level.collision_grid.cast_ray(tile_size,
+                                                         self.position.position,
+                                                         cursor_pos-self.position.position,
+                                                         ("grappling", "terrain"),
+                                                         max_ray_length)
+        grab_ray_pos, grab_hit = ray_results["grappling"]
+        terrain_ray_pos, terrain_hit = ray_results["terrain"]
+
+        if not grab_hit:
             Resource.sound["game"]["shotgun"]["no_shell"].play()
             return
 
-        terrain_ray_pos, hit = cast_ray(self.level.collision_maps["terrain"],
-                                        tile_size,
-                                        self.position.position,
-                                        cursor_pos-self.position.position,
-                                        max_ray_length)
-
-        if hit and grab_ray_pos.length() < terrain_ray_pos.length():
+        # The rope is blocked when the terrain is hit closer to the player than the grappling tile
+        ray_start = self.position.position
+        if terrain_hit and terrain_ray_pos.distance_to(ray_start) < grab_ray_pos.distance_to(ray_start):
             Resource.sound["game"]["shotgun"]["no_shell"].play()
             return
 
@@ -265,16 +260,18 @@ class Player(Entity):
     def _idle(self) -> None:
         self.sprite.switch_state("idle")
 
-    def _speed_damping(self) -> None:
+    def _speed_damping(self,
+                       delta: float) -> None:
         if self.collision_status["FLOORED"] == 0:
-            self.position.body.velocity *= self.FLOORED_SPEED_DAMPING ** self.linked_instance.delta
+            self.position.body.velocity *= self.FLOORED_SPEED_DAMPING ** delta
 
         else:
-            self.position.body.velocity *= self.AIRTIME_SPEED_DAMPING ** self.linked_instance.delta
+            self.position.body.velocity *= self.AIRTIME_SPEED_DAMPING ** delta
 
-    def _handle_user_inputs(self):
+    def _handle_user_inputs(self,
+                            delta: float) -> None:
         if self.jump_force:
-            self.jump_force *= self.JUMP_FORCE_DAMPING ** self.linked_instance.delta
+            self.jump_force *= self.JUMP_FORCE_DAMPING ** delta
             if self.jump_force < 1:
                 self.jump_force = 0
 
@@ -315,11 +312,12 @@ class Player(Entity):
             return
 
         else:
-            self._speed_damping()
+            self._speed_damping(delta)
 
         self._idle()
 
-    def _reset_user_inputs(self) -> None:
+    def _reset_user_inputs(self,
+                           delta: float = 0) -> None:
         """Reset user inputs to False."""
 
         if self.user_events is None:
@@ -336,9 +334,10 @@ class Player(Entity):
             return
 
         for event in self.user_events:
-            self.user_events[event] += self.linked_instance.delta
+            self.user_events[event] += delta
 
-    def _reset_collision_status(self):
+    def _reset_collision_status(self,
+                                delta: float = 0) -> None:
         """Reset collision events to False."""
         if self.collision_status is None:
             self.collision_status = {"CONTACT_LEFT": 999,
@@ -348,7 +347,7 @@ class Player(Entity):
             return
 
         for collision in self.collision_status:
-            self.collision_status[collision] += self.linked_instance.delta
+            self.collision_status[collision] += delta
 
     def _add_control_callbacks(self) -> None:
         """Add all control callbacks to the instance's event_handler."""
@@ -356,6 +355,14 @@ class Player(Entity):
         for cb_str in self.user_events:
             self._create_input_cb(self.linked_instance, cb_str)
 
+    def remove_control_callbacks(self) -> None:
+        """Remove the control callbacks of this player from the instance's event_handler."""
+
+        for cb in self._control_callbacks:
+            self.linked_instance.event_handler.remove_callback(cb)
+
+        self._control_callbacks = []
+
     def _create_body(self,
                      position: pygame.Vector2) -> None:
         """Create the player's body."""
@@ -442,6 +449,7 @@ class Player(Entity):
             self.user_events["".join(cb_str)] = 0
 
         cb_dict[cb_type](vars(Controls)[control_name], cb)
+        self._control_callbacks.append(cb)
 
     @classmethod
     def _init_class_variables(cls) -> None:
@@ -2,6 +2,7 @@ import math
 import pygame
 
 from isec.app import Resource
+from isec.instance import InputHandler
 from isec.environment import Entity, Sprite
 
 from game.objects.game.player import Player
@@ -31,7 +32,7 @@ class RopeRangeIndicator(Entity):
         self.update_surface()
 
     def update_surface(self):
-        cursor_pos = pygame.Vector2(pygame.mouse.get_pos())
+        cursor_pos = pygame.Vector2(InputHandler.get_mouse_pos())
         center_pos = pygame.Vector2(Resource.data["engine"]["window"]["size"]) / 2
         cursor_vec = (cursor_pos-center_pos)
 
@@ -12,6 +12,8 @@ from game.objects.game.shape_info import SpikeSI, PlayerSkeletonSI
 
 
 class Spike(Entity):
+    _outline: list[list[tuple[float, float]]] | None = None
+
     def __init__(self,
                  position: pygame.Vector2,
                  angle: float,
@@ -21,7 +23,7 @@ class Spike(Entity):
         spike_pos = PymunkPos("STATIC", scene.space, SpikeSI)
         spike_pos.position = pygame.Vector2(position)
         spike_pos.angle = angle
-        spike_pos.create_surface_shape(Resource.image["game"]["objects"]["spike"])
+        spike_pos.create_polygon_shapes(self.get_outline())
         spike_pos.add_to_space()
 
         # spike_sprite = PymunkSprite(spike_pos, "rotated")
@@ -29,6 +31,15 @@ class Spike(Entity):
 
         super().__init__(spike_pos, spike_sprite, scene, instance)
 
+    @classmethod
+    def get_outline(cls) -> list[list[tuple[float, float]]]:
+        """The outline of the spike surface, marched once and shared by every spike."""
+
+        if cls._outline is None:
+            cls._outline = PymunkPos.march_surface(Resource.image["game"]["objects"]["spike"])
+
+        return cls._outline
+
     @classmethod
     def create_collision_handler(cls,
                                  space: pymunk.Space) -> None:
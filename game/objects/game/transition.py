@@ -1,5 +1,7 @@
 import pygame
 
+from collections.abc import Iterable
+
 from isec.app import Resource
 from isec.instance import BaseInstance
 from isec.environment import Entity, Sprite, Pos
@@ -28,8 +30,6 @@ class Transition(Entity):
         super().__init__(player_pos, sprite, scene, instance)
 
     def update(self, delta: float) -> None:
-        max_circle_radius = 500
-
         self.current_time += delta
 
         if self.can_switch and not self.switched:
@@ -42,7 +42,14 @@ class Transition(Entity):
         if self.current_time > self.CLOSING_TIME + self.OPENING_TIME and not self.can_kill:
             self.can_kill = True
 
-        # Change surface
+    def render(self,
+               camera_offset: Iterable,
+               surface: pygame.Surface,
+               rect: pygame.Rect) -> None:
+
+        # The surface is only drawn for the rendered frames, not for every physics step
+        max_circle_radius = 500
+
         if self.current_time < self.CLOSING_TIME:
             factor = 1 - (self.current_time / self.CLOSING_TIME)
             radius = max_circle_radius * factor ** self.CLOSING_POWER
@@ -59,3 +66,5 @@ class Transition(Entity):
 
         else:
             self.sprite.surface.fill((0, 0, 0, 0))
+
+        super().render(camera_offset, surface, rect)
@@ -1,9 +1,7 @@
-import pygame
-
 from isec.app import Resource
 from isec.environment import Entity, Sprite, EntityScene
 from isec.environment.position import SimplePos
-from isec.instance import BaseInstance
+from isec.instance import BaseInstance, InputHandler
 
 
 class EntityBackground(Entity):
@@ -29,7 +27,7 @@ class EntityPillars(Entity):
 
     def update(self,
                _delta: float) -> None:
-        cursor_x = pygame.mouse.get_pos()[0]
+        cursor_x = InputHandler.get_mouse_pos()[0]
         self.position.position.x = 200+cursor_x/20
 
 
@@ -47,5 +45,5 @@ class EntityArtifact(Entity):
 
     def update(self,
                _delta: float) -> None:
-        cursor_x = pygame.mouse.get_pos()[0]
+        cursor_x = InputHandler.get_mouse_pos()[0]
         self.position.position.x = self.center_x-cursor_x/20
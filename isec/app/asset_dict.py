@@ -0,0 +1,137 @@
+import typing
+import concurrent.futures
+
+from isec._ise_typing import PathLike
+
+
+class PendingAsset:
+    __slots__ = ["path", "decoder", "finalizer"]
+
+    def __init__(self,
+                 path: PathLike,
+                 decoder: typing.Callable[[PathLike], typing.Any],
+                 finalizer: typing.Callable[[typing.Any], typing.Any] = None) -> None:
+        """
+        An asset that was found during the directory scan but not decoded yet.
+
+        :param path: The path of the asset file.
+        :param decoder: The function used to decode the asset, called with the path.
+            It must not depend on the display, so it can run in a worker thread.
+        :param finalizer: If specified, called on the main thread with the decoded asset, and its return value is
+            the final asset (e.g. for convert_alpha).
+        """
+
+        self.path = path
+        self.decoder = decoder
+        self.finalizer = finalizer
+
+    def decode(self) -> typing.Any:
+        return self.decoder(self.path)
+
+    def finalize(self,
+                 decoded: typing.Any) -> typing.Any:
+
+        if self.finalizer is None:
+            return decoded
+
+        return self.finalizer(decoded)
+
+    def load(self) -> typing.Any:
+        return self.finalize(self.decode())
+
+    def __repr__(self) -> str:
+        return f"PendingAsset({self.path})"
+
+
+class AssetDict(dict):
+    """
+    A dictionary whose values can be PendingAsset, decoded the first time they are accessed.
+
+    Nested directories are stored as nested AssetDict, so Resource.image["game"]["objects"]["pellet"]
+    only decodes the pellet image.
+    """
+
+    def __getitem__(self,
+                    key: typing.Hashable) -> typing.Any:
+
+        value = super().__getitem__(key)
+
+        if isinstance(value, PendingAsset):
+            value = value.load()
+            super().__setitem__(key, value)
+
+        return value
+
+    def get(self,
+            key: typing.Hashable,
+            default: typing.Any = None) -> typing.Any:
+
+        if key not in self:
+            return default
+
+        return self[key]
+
+    def values(self) -> list:
+        return [self[key] for key in self]
+
+    def items(self) -> list[tuple]:
+        return [(key, self[key]) for key in self]
+
+    def is_loaded(self,
+                  key: typing.Hashable) -> bool:
+        """Return True if the value was already decoded."""
+
+        return not isinstance(super().__getitem__(key), PendingAsset)
+
+    def loaded_items(self) -> list[tuple]:
+        """Return the items whose values were already decoded, without decoding the others."""
+
+        return [(key, value) for key, value in super().items() if not isinstance(value, PendingAsset)]
+
+    def pending_items(self) -> list[tuple[typing.Hashable, PendingAsset]]:
+        """Return the items whose values are not decoded yet."""
+
+        return [(key, value) for key, value in super().items() if isinstance(value, PendingAsset)]
+
+    def load_all(self,
+                 workers: int = 0) -> None:
+        """
+        Decode every pending value of this dictionary and of the nested dictionaries.
+
+        :param workers: If greater than 1, the values are decoded by a pool of this many threads,
+            and finalized on the calling thread in the same order as a sequential load.
+        """
+
+        if workers > 1:
+            self._load_all_parallel(workers)
+            return
+
+        for key, value in super().items():
+            if isinstance(value, AssetDict):
+                value.load_all()
+
+            elif isinstance(value, PendingAsset):
+                self.__getitem__(key)
+
+    def walk_pending(self) -> typing.Iterator[tuple["AssetDict", typing.Hashable, PendingAsset]]:
+        """Yield (dictionary, key, pending asset) for every pending value of the tree, in insertion order."""
+
+        for key, value in super().items():
+            if isinstance(value, AssetDict):
+                yield from value.walk_pending()
+
+            elif isinstance(value, PendingAsset):
+                yield self, key, value
+
+    def _load_all_parallel(self,
+                           workers: int) -> None:
+
+        pending = list(self.walk_pending())
+        if not pending:
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(pending_asset.decode) for _, _, pending_asset in pending]
+
+            for (asset_dict, key, pending_asset), future in zip(pending, futures):
+                asset_dict[key] = pending_asset.finalize(future.result())
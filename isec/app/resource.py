@@ -1,12 +1,18 @@
+import functools
+import typing
+import warnings
+import hashlib
 import pygame
+import numpy
 import yaml
 import json
-import csv
 import os
 
 from isec._ise_typing import PathLike
 from isec._ise_error import InvalidFileFormatError
-from isec.objects import CachedSurface
+from isec.objects import CachedSurface, RotationCache, RotationAtlas, PolygonCache
+from isec.app.asset_dict import AssetDict, PendingAsset
+from isec.app.texture_atlas import TextureAtlas
 
 
 class Resource:
@@ -14,8 +20,12 @@ class Resource:
     project_assets_directory: PathLike = None
 
     data: dict[str: dict[str: any]] = {}
-    image: dict[str: dict[str: any]] = {}
-    sound: dict[str: dict[str: any]] = {}
+    image: AssetDict = AssetDict()
+    sound: AssetDict = AssetDict()
+
+    atlas_report: list[dict[str, typing.Any]] = []
+
+    _master_volume: float | None = None
 
     @classmethod
     def set_directory(cls,
@@ -49,9 +59,140 @@ class Resource:
             cls._load_image(cls.project_assets_directory)
             cls._load_sound(cls.project_assets_directory)
 
-        cls._cache()
+        cls._configure_rotation_cache()
+        cls._configure_polygon_cache()
+
+        if not cls.is_lazy():
+            cls._load_all_assets(cls.image, cls.sound)
+            cls._build_atlases(cls.image)
+
         cls.set_volume()
 
+    @classmethod
+    def _configure_rotation_cache(cls) -> None:
+        caching_dict = cls.data["engine"]["resource"]["surface"]["caching"]
+
+        if "atlas" in caching_dict and caching_dict["atlas"]["enabled"]:
+            RotationAtlas.set_directory(caching_dict["atlas"]["directory"])
+        else:
+            RotationAtlas.set_directory(None)
+
+        if "memory_limit_mb" not in caching_dict or caching_dict["memory_limit_mb"] is None:
+            RotationCache.set_memory_limit(None)
+            return
+
+        RotationCache.set_memory_limit(int(caching_dict["memory_limit_mb"] * 1024 * 1024))
+
+    @classmethod
+    def _configure_polygon_cache(cls) -> None:
+        resource_dict = cls.data["engine"]["resource"]
+
+        if "terrain" not in resource_dict:
+            PolygonCache.configure(True, None)
+            return
+
+        caching_dict = resource_dict["terrain"]["caching"]
+        PolygonCache.configure(caching_dict["memory"], caching_dict["directory"])
+
+    @classmethod
+    def is_lazy(cls) -> bool:
+        """Return True if images and sounds are only decoded the first time they are accessed."""
+
+        resource_dict = cls.data["engine"]["resource"]
+        return "loading" in resource_dict and resource_dict["loading"]["lazy"]
+
+    @classmethod
+    def preload(cls,
+                prefix: str = "") -> None:
+        """
+        Decode every image and sound under a prefix, so they are ready before they are needed.
+
+        :param prefix: A path inside the image and sound directories, e.g. "game/objects".
+            Every asset is decoded if the prefix is empty.
+        """
+
+        keys = [key for key in prefix.replace("\\", "/").split("/") if key]
+        asset_dicts = {}
+
+        for asset_type, asset_dict in (("image", cls.image), ("sound", cls.sound)):
+            for key in keys:
+                if not isinstance(asset_dict, AssetDict) or key not in asset_dict:
+                    asset_dict = None
+                    break
+
+                asset_dict = asset_dict[key]
+
+            if isinstance(asset_dict, AssetDict):
+                asset_dicts[asset_type] = asset_dict
+
+        cls._load_all_assets(*asset_dicts.values())
+
+        if "image" in asset_dicts:
+            cls._build_atlases(asset_dicts["image"], "/".join(keys))
+
+    @classmethod
+    def get_loading_workers(cls) -> int:
+        """Return the number of threads used to decode images and sounds, 0 or 1 to decode on the main thread."""
+
+        resource_dict = cls.data["engine"]["resource"]
+        if "loading" not in resource_dict or "workers" not in resource_dict["loading"]:
+            return 0
+
+        return resource_dict["loading"]["workers"]
+
+    @classmethod
+    def _load_all_assets(cls,
+                         *asset_dicts: AssetDict) -> None:
+        """Decode every pending asset of the dictionaries, with a single thread pool for all of them."""
+
+        root = AssetDict(enumerate(asset_dicts))
+        root.load_all(cls.get_loading_workers())
+
+    @classmethod
+    def _build_atlases(cls,
+                       image_dict: AssetDict,
+                       directory: str = "") -> None:
+        """
+        Pack the small decoded images of every directory into texture atlases, and replace them with subsurfaces.
+
+        Each directory is packed separately, so images used together are stored together. An atlas taking more memory
+        than its images is dropped, and the images are kept as they are. A line is added to Resource.atlas_report for
+        every atlas, packed or dropped.
+        """
+
+        surface_dict = cls.data["engine"]["resource"]["surface"]
+        if "texture_atlas" not in surface_dict or not surface_dict["texture_atlas"]["enabled"]:
+            return
+
+        atlas_dict = surface_dict["texture_atlas"]
+
+        surfaces = {}
+        for key, value in image_dict.loaded_items():
+            if isinstance(value, AssetDict):
+                cls._build_atlases(value, f"{directory}/{key}" if directory else key)
+
+            elif TextureAtlas.is_packable(value, atlas_dict["max_image_size"]):
+                surfaces[key] = value
+
+        if len(surfaces) < 2:
+            return
+
+        for atlas in TextureAtlas.pack(surfaces, atlas_dict["max_atlas_size"]):
+            image_bytes = sum(surfaces[key].get_pitch() * surfaces[key].get_height() for key in atlas.rects)
+            packed = atlas.byte_size <= image_bytes
+
+            if packed:
+                for key, subsurface in atlas.get_subsurfaces().items():
+                    image_dict[key] = subsurface
+
+            cls.atlas_report.append({"directory": directory,
+                                     "packed": packed,
+                                     "images": len(atlas.rects),
+                                     "size": atlas.surface.get_size(),
+                                     "occupancy": atlas.occupancy,
+                                     "image_bytes": image_bytes,
+                                     "atlas_bytes": atlas.byte_size})
+
     @classmethod
     def _get_default_assets_directory(cls) -> None:
         if cls.default_assets_directory is not None:
@@ -70,6 +211,8 @@ class Resource:
             current_dict = cls.data
             assets_path += "data/"
 
+        file_entries = []
+
         for elem in os.scandir(assets_path):
             if elem.is_dir():
                 if elem.name not in current_dict:
@@ -78,25 +221,143 @@ class Resource:
                 cls._load_data(assets_path+elem.name+"/", current_dict[elem.name])
 
             if elem.is_file():
-                key_name = "".join(elem.name.split(".")[:-1])
+                file_entries.append(elem)
 
-                if elem.name.endswith(".json"):
-                    if key_name not in current_dict:
-                        current_dict[key_name] = {}
+        file_entries.sort(key=lambda entry: entry.name)
 
-                    current_dict[key_name] |= cls._load_json(assets_path+elem.name)
+        # Directories holding csv files (levels, maps) are compiled into a single binary cache file
+        cache_path = None
+        if any(elem.name.endswith(".csv") for elem in file_entries):
+            cache_path = cls._get_data_cache_path(assets_path)
 
-                elif elem.name.endswith(".yaml") or elem.name.endswith(".yml"):
-                    if key_name not in current_dict:
-                        current_dict[key_name] = {}
+        if cache_path is not None:
+            manifest = cls._get_data_manifest(file_entries)
+            loaded_files = cls._read_data_cache(cache_path, manifest)
 
-                    current_dict[key_name] |= cls._load_yaml(assets_path+elem.name)
+            if loaded_files is None:
+                loaded_files = cls._load_data_files(assets_path, file_entries)
+                cls._write_data_cache(cache_path, manifest, loaded_files)
 
-                elif elem.name.endswith(".csv"):
-                    current_dict[key_name] = cls._load_csv(assets_path+elem.name)
+        else:
+            loaded_files = cls._load_data_files(assets_path, file_entries)
 
-                else:
-                    raise InvalidFileFormatError(f"{elem.name.split('.')[-1]} is not a supported data file format")
+        for key_name, file_type, content in loaded_files:
+            if file_type == "csv":
+                current_dict[key_name] = content
+                continue
+
+            if key_name not in current_dict:
+                current_dict[key_name] = {}
+
+            current_dict[key_name] |= content
+
+    @classmethod
+    def _load_data_files(cls,
+                         assets_path: PathLike,
+                         file_entries: list[os.DirEntry]) -> list[tuple[str, str, ...]]:
+
+        loaded_files = []
+
+        for elem in file_entries:
+            key_name = "".join(elem.name.split(".")[:-1])
+
+            if elem.name.endswith(".json"):
+                loaded_files.append((key_name, "json", cls._load_json(assets_path+elem.name)))
+
+            elif elem.name.endswith(".yaml") or elem.name.endswith(".yml"):
+                loaded_files.append((key_name, "yaml", cls._load_yaml(assets_path+elem.name)))
+
+            elif elem.name.endswith(".csv"):
+                loaded_files.append((key_name, "csv", cls._load_csv(assets_path+elem.name)))
+
+            else:
+                raise InvalidFileFormatError(f"{elem.name.split('.')[-1]} is not a supported data file format")
+
+        return loaded_files
+
+    @classmethod
+    def _get_data_cache_path(cls,
+                             assets_path: PathLike) -> str | None:
+        """Return the path of the cache file of a data directory, or None if data caching is disabled."""
+
+        if "engine" not in cls.data or "resource" not in cls.data["engine"]:
+            return None
+
+        if "data" not in cls.data["engine"]["resource"]:
+            return None
+
+        caching_dict = cls.data["engine"]["resource"]["data"]["caching"]
+        if not caching_dict["enabled"]:
+            return None
+
+        absolute_path = os.path.abspath(assets_path)
+        path_digest = hashlib.sha1(absolute_path.encode()).hexdigest()[:12]
+        directory_name = os.path.basename(absolute_path)
+
+        return os.path.join(caching_dict["directory"], f"{directory_name}_{path_digest}.npz")
+
+    @staticmethod
+    def _get_data_manifest(file_entries: list[os.DirEntry]) -> str:
+        """Describe the source files of a directory. The cache is only valid if the manifest didn't change."""
+
+        return json.dumps([[elem.name, elem.stat().st_mtime_ns, elem.stat().st_size] for elem in file_entries])
+
+    @classmethod
+    def _read_data_cache(cls,
+                         cache_path: PathLike,
+                         manifest: str) -> list[tuple[str, str, ...]] | None:
+        """Return the files stored in a cache file, or None if the cache file is missing or stale."""
+
+        if not os.path.isfile(cache_path):
+            return None
+
+        try:
+            with numpy.load(cache_path, allow_pickle=False) as cache:
+                if str(cache["manifest"]) != manifest:
+                    return None
+
+                loaded_files = []
+                for i, (key_name, file_type) in enumerate(json.loads(str(cache["index"]))):
+                    content = cache[f"content_{i}"]
+                    if file_type != "csv":
+                        content = json.loads(str(content))
+
+                    loaded_files.append((key_name, file_type, content))
+
+                return loaded_files
+
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @classmethod
+    def _write_data_cache(cls,
+                          cache_path: PathLike,
+                          manifest: str,
+                          loaded_files: list[tuple[str, str, ...]]) -> None:
+        """Store the loaded files of a directory. Json and yaml contents are stored as json strings."""
+
+        contents = {}
+        for i, (_key_name, file_type, content) in enumerate(loaded_files):
+            if file_type == "csv":
+                contents[f"content_{i}"] = content
+                continue
+
+            json_content = json.dumps(content)
+            if json.loads(json_content) != content:  # e.g. yaml integer keys, that json would turn into strings
+                return
+
+            contents[f"content_{i}"] = numpy.array(json_content)
+
+        index = json.dumps([[key_name, file_type] for key_name, file_type, _content in loaded_files])
+
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path + ".tmp", "wb") as cache_file:
+                numpy.savez(cache_file, manifest=numpy.array(manifest), index=numpy.array(index), **contents)
+            os.replace(cache_path + ".tmp", cache_path)
+
+        except OSError as error:
+            warnings.warn(f"Could not write data cache file {cache_path}: {error}")
 
     @classmethod
     def _load_json(cls,
@@ -114,16 +375,16 @@ class Resource:
 
     @classmethod
     def _load_csv(cls,
-                  file_path: PathLike) -> list[list[int]]:
+                  file_path: PathLike) -> numpy.ndarray:
 
-        with open(file_path) as file:
-            return [list(map(int, rec)) for rec in csv.reader(file, delimiter=',')]
+        return numpy.loadtxt(file_path, delimiter=",", dtype=int, ndmin=2)
 
     @classmethod
     def _load_image(cls,
                     assets_path: PathLike,
                     current_image_dict: dict = None,
-                    current_data_dict: dict = None) -> None:
+                    current_data_dict: dict = None,
+                    key_path: tuple[str, ...] = ()) -> None:
 
         if current_image_dict is None:
             current_image_dict = cls.image
@@ -137,14 +398,15 @@ class Resource:
         for elem in os.scandir(assets_path):
             if elem.is_dir():
                 if elem.name not in current_image_dict:
-                    current_image_dict[elem.name] = {}
+                    current_image_dict[elem.name] = AssetDict()
 
                 if elem.name not in current_data_dict:
                     current_data_dict[elem.name] = {}
 
                 cls._load_image(assets_path + elem.name + "/",
                                 current_image_dict[elem.name],
-                                current_data_dict[elem.name])
+                                current_data_dict[elem.name],
+                                (*key_path, elem.name))
                 continue
 
             if elem.is_file():
@@ -163,7 +425,11 @@ class Resource:
                     current_data_dict |= image_dict
 
                 elif any(elem.name.endswith(ext) for ext in [".png", ".jpg"]):
-                    current_image_dict[key_name] = pygame.image.load(assets_path + elem.name).convert_alpha()
+                    current_image_dict[key_name] = PendingAsset(assets_path + elem.name,
+                                                                pygame.image.load,
+                                                                functools.partial(cls._finalize_image,
+                                                                                  key_path,
+                                                                                  key_name))
 
                 elif elem.name.endswith(".pdn"):
                     continue
@@ -178,7 +444,8 @@ class Resource:
     def _load_sound(cls,
                     assets_path: PathLike,
                     current_sound_dict: dict = None,
-                    current_data_dict: dict = None) -> None:
+                    current_data_dict: dict = None,
+                    key_path: tuple[str, ...] = ()) -> None:
 
         if current_sound_dict is None:
             current_sound_dict = cls.sound
@@ -192,21 +459,26 @@ class Resource:
         for elem in os.scandir(assets_path):
             if elem.is_dir():
                 if elem.name not in current_sound_dict:
-                    current_sound_dict[elem.name] = {}
+                    current_sound_dict[elem.name] = AssetDict()
 
                 if elem.name not in current_data_dict:
                     current_data_dict[elem.name] = {}
 
                 cls._load_sound(assets_path + elem.name + "/",
                                 current_sound_dict[elem.name],
-                                current_data_dict[elem.name])
+                                current_data_dict[elem.name],
+                                (*key_path, elem.name))
                 continue
 
             if elem.is_file():
                 key_name = "".join(elem.name.split(".")[:-1])
 
                 if any(elem.name.endswith(ext) for ext in [".wav", ".mp3", ".ogg"]):
-                    current_sound_dict[key_name] = pygame.mixer.Sound(assets_path + elem.name)
+                    current_sound_dict[key_name] = PendingAsset(assets_path + elem.name,
+                                                                pygame.mixer.Sound,
+                                                                functools.partial(cls._finalize_sound,
+                                                                                  key_path,
+                                                                                  key_name))
                     continue
 
                 if elem.name == "index.json":
@@ -226,32 +498,63 @@ class Resource:
                 raise InvalidFileFormatError(f"{elem.name.split('.')[-1]} is not a supported data file format")
 
     @classmethod
-    def _cache(cls,
-               surf_dict: dict = None,
-               data_dict: dict = None) -> None:
+    def _get_asset_data(cls,
+                        data_type: str,
+                        key_path: tuple[str, ...]) -> dict:
+        """
+        Return the data of an asset directory.
+
+        The data is looked up when the asset is decoded, an index file loaded after the directory was scanned
+        can replace the dictionary of the directory.
+        """
+
+        data_dict = cls.data[data_type]
+        for key in key_path:
+            if key not in data_dict:
+                return {}
+
+            data_dict = data_dict[key]
+
+        return data_dict
+
+    @classmethod
+    def _finalize_image(cls,
+                        key_path: tuple[str, ...],
+                        key_name: str,
+                        surface: pygame.Surface) -> pygame.Surface | CachedSurface:
+
+        data_dict = cls._get_asset_data("image", key_path)
+        surface = surface.convert_alpha()
 
         if not cls.data["engine"]["resource"]["surface"]["caching"]["enabled"]:
-            return
+            return surface
 
-        if "image" not in cls.data:
-            return
+        if key_name in data_dict and "cached" in data_dict[key_name] and data_dict[key_name]["cached"] is True:
+            return cls._cache_image(surface, data_dict[key_name])
 
-        if surf_dict is None:
-            surf_dict = cls.image
-            data_dict = cls.data["image"]
+        return surface
 
-        for image_key in data_dict:
-            if image_key in surf_dict:
-                if isinstance(surf_dict[image_key], dict):
-                    cls._cache(surf_dict[image_key], data_dict[image_key])
+    @classmethod
+    def _finalize_sound(cls,
+                        key_path: tuple[str, ...],
+                        key_name: str,
+                        sound: pygame.mixer.Sound) -> pygame.mixer.Sound:
 
-                if "cached" in data_dict[image_key] and data_dict[image_key]["cached"] is True:
-                    surf_dict[image_key] = cls._cache_image(surf_dict[image_key], data_dict[image_key])
+        data_dict = cls._get_asset_data("sound", key_path)
+
+        master_volume = cls._master_volume
+        if master_volume is None:
+            master_volume = cls.data["engine"]["resource"]["sound"]["master_volume"]
+
+        individual_sound_volume = data_dict[key_name] if key_name in data_dict else 1
+        sound.set_volume(master_volume*individual_sound_volume)
+
+        return sound
 
     @classmethod
     def set_volume(cls,
                    master_volume: float = None,
-                   sound_dict: dict = None,
+                   sound_dict: AssetDict = None,
                    data_dict: dict = None) -> None:
 
         if master_volume is None:
@@ -260,16 +563,18 @@ class Resource:
         if sound_dict is None:
             sound_dict = cls.sound
             data_dict = cls.data["sound"]
+            cls._master_volume = master_volume
 
-        for key in sound_dict:
-            if isinstance(sound_dict[key], dict):
+        # Sounds that are not decoded yet will get the master volume when they are decoded
+        for key, sound in sound_dict.loaded_items():
+            if isinstance(sound, dict):
                 cls.set_volume(master_volume,
-                               sound_dict[key],
+                               sound,
                                data_dict[key])
                 continue
 
             individual_sound_volume = data_dict[key] if key in data_dict else 1
-            sound_dict[key].set_volume(master_volume*individual_sound_volume)
+            sound.set_volume(master_volume*individual_sound_volume)
 
     @classmethod
     def _cache_image(cls,
@@ -281,4 +586,7 @@ class Resource:
         else:
             cache_size = cls.data["engine"]["resource"]["surface"]["caching"]["default_size"]
 
-        return CachedSurface(surf, cache_size)
+        caching_dict = cls.data["engine"]["resource"]["surface"]["caching"]
+        lazy = caching_dict["lazy"] if "lazy" in caching_dict else False
+
+        return CachedSurface(surf, cache_size, lazy)
@@ -0,0 +1,145 @@
+import typing
+import pygame
+
+
+class TextureAtlas:
+    def __init__(self,
+                 surfaces: dict[typing.Hashable, pygame.Surface],
+                 width: int) -> None:
+        """
+        A single surface holding several images, packed on shelves.
+
+        :param surfaces: The images to pack, they must all fit in the given width.
+        :param width: The width of the atlas.
+        """
+
+        self.rects: dict[typing.Hashable, pygame.Rect] = {}
+
+        x = y = shelf_height = 0
+        for key, surface in surfaces.items():
+            surface_width, surface_height = surface.get_size()
+
+            if x + surface_width > width:
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+
+            self.rects[key] = pygame.Rect(x, y, surface_width, surface_height)
+            x += surface_width
+            shelf_height = max(shelf_height, surface_height)
+
+        self.surface = pygame.Surface((width, y + shelf_height), pygame.SRCALPHA)
+
+        # BLEND_RGBA_MAX over a fully transparent surface copies the pixels untouched, alpha included
+        self.surface.fblits([(surfaces[key], rect.topleft) for key, rect in self.rects.items()], pygame.BLEND_RGBA_MAX)
+
+    def get_subsurfaces(self) -> dict[typing.Hashable, pygame.Surface]:
+        return {key: self.surface.subsurface(rect) for key, rect in self.rects.items()}
+
+    @property
+    def occupancy(self) -> float:
+        """The fraction of the atlas covered by images."""
+
+        used_area = sum(rect.width * rect.height for rect in self.rects.values())
+        return used_area / (self.surface.get_width() * self.surface.get_height())
+
+    @property
+    def byte_size(self) -> int:
+        return self.surface.get_pitch() * self.surface.get_height()
+
+    @staticmethod
+    def is_packable(surface: pygame.Surface,
+                    max_image_size: int) -> bool:
+        """
+        Return True if the surface can be moved to an atlas without changing how it is blitted.
+
+        Only plain per pixel alpha surfaces are packed: no colorkey, no surface alpha, not already a subsurface,
+        and not a Surface subclass (e.g. CachedSurface).
+        """
+
+        return (type(surface) is pygame.Surface
+                and surface.get_parent() is None
+                and surface.get_flags() & pygame.SRCALPHA
+                and surface.get_colorkey() is None
+                and surface.get_alpha() in (None, 255)
+                and max(surface.get_size()) <= max_image_size
+                and min(surface.get_size()) > 0)
+
+    @classmethod
+    def pack(cls,
+             surfaces: dict[typing.Hashable, pygame.Surface],
+             max_atlas_size: int) -> list["TextureAtlas"]:
+        """
+        Pack the surfaces into as few atlases as possible, none larger than max_atlas_size in either dimension.
+
+        The surfaces are sorted by decreasing height, then placed on shelves. The atlas width is the one giving the
+        smallest area among the widths where a shelf ends.
+        """
+
+        if not surfaces:
+            return []
+
+        keys = sorted(surfaces, key=lambda key: (-surfaces[key].get_height(), -surfaces[key].get_width()))
+        sizes = [surfaces[key].get_size() for key in keys]
+        width = cls._get_best_width(sizes, max_atlas_size)
+
+        atlases = []
+        current: dict[typing.Hashable, pygame.Surface] = {}
+        x = y = shelf_height = 0
+
+        for key, (surface_width, surface_height) in zip(keys, sizes):
+            if x + surface_width > width:
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+
+            if y + surface_height > max_atlas_size and current:
+                atlases.append(cls(current, width))
+                current = {}
+                x = y = shelf_height = 0
+
+            current[key] = surfaces[key]
+            x += surface_width
+            shelf_height = max(shelf_height, surface_height)
+
+        atlases.append(cls(current, width))
+        return atlases
+
+    @staticmethod
+    def _get_shelf_height(sizes: list[tuple[int, int]],
+                          width: int) -> int:
+
+        x = y = shelf_height = 0
+        for surface_width, surface_height in sizes:
+            if x + surface_width > width:
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+
+            x += surface_width
+            shelf_height = max(shelf_height, surface_height)
+
+        return y + shelf_height
+
+    @classmethod
+    def _get_best_width(cls,
+                        sizes: list[tuple[int, int]],
+                        max_atlas_size: int) -> int:
+
+        widest = max(surface_width for surface_width, _ in sizes)
+        candidates = {widest}
+
+        # The widths where the first shelf can hold one more image
+        first_shelf_width = 0
+        for surface_width, _ in sizes:
+            first_shelf_width += surface_width
+            if first_shelf_width > max_atlas_size:
+                break
+
+            candidates.add(max(first_shelf_width, widest))
+
+        def area(width: int) -> tuple[int, int]:
+            height = cls._get_shelf_height(sizes, width)
+            return width * height, abs(width - height)
+
+        return min(sorted(candidates), key=area)
@@ -11,9 +11,11 @@ class Camera:
         self.position.position = position if position is not None else pygame.math.Vector2(0, 0)
 
     def get_offset_pos(self,
-                       position: SimplePos) -> pygame.math.Vector2:
+                       position: SimplePos,
+                       alpha: float = 1) -> pygame.math.Vector2:
+        """Return a position relative to the camera, interpolated between its previous and its current step."""
 
-        return position.position - self.position.position
+        return position.interpolate(alpha) - self.position.position
 
     def get_coordinates_from_screen(self,
                                     screen_coordinates: pygame.math.Vector2) -> pygame.math.Vector2:
@@ -39,6 +39,17 @@ class Pos:
                delta: float) -> None:
         pass
 
+    def save_previous_position(self) -> None:
+        """Keep the current position, before a physics step moves it. Only PymunkPos are moved by the steps."""
+
+        pass
+
+    def interpolate(self,
+                    alpha: float) -> pygame.Vector2:
+        """Return the position between the previous step (alpha = 0) and the current one (alpha = 1)."""
+
+        return self.position
+
     def add_to_space(self) -> None:
         err_msg = "Only PymunkPos support add_to_space method"
         raise TypeError(err_msg)
@@ -1,13 +1,18 @@
+import math
+import numpy
 import pygame
+import typing
 
 from typing import Union
+from collections.abc import Iterable, Sequence
 
 
 class Tilemap:
     EMPTY_TILE = -1
+    DTYPE = numpy.int16
 
     def __init__(self,
-                 tilemap_array: list[list[int]],
+                 tilemap_array: numpy.ndarray | list[list[int]],
                  tileset: Union[dict[int, pygame.Surface | None], pygame.Surface],
                  tile_size: int = None,
                  parallax_depth: float = 1) -> None:
@@ -15,6 +20,7 @@ class Tilemap:
         A class that represent a tilemap.
 
         :param tilemap_array: A 2D array of integers that represent the tiles of the map.
+            It is copied into an int16 numpy array indexed by [y][x] (or [y, x]).
         :param tileset: A dictionary of integers that represent the tiles of the map with pygame surfaces.
             The tileset can also be a pygame surface, in which case the tile_size must be specified.
         :param tile_size: The size of the tiles in pixels.
@@ -29,21 +35,21 @@ class Tilemap:
         if isinstance(tileset, pygame.Surface):
             tileset = self.create_tileset_from_surface(tileset, tile_size)
 
-        self.tilemap_array = tilemap_array
+        self.tilemap_array: numpy.ndarray = numpy.array(tilemap_array, dtype=self.DTYPE, ndmin=2)
         self.tileset = tileset
         self.tile_size = tile_size
         self.parallax_depth = parallax_depth
 
+        self._tile_change_callbacks: list[typing.Callable[[int, int], None]] = []
+
         self._check_tileset_validity(self.tilemap_array, self.tileset)
 
     @staticmethod
-    def _check_tileset_validity(tilemap_array: list[list[int]],
+    def _check_tileset_validity(tilemap_array: numpy.ndarray,
                                 tileset: dict[int: pygame.Surface | None]) -> bool:
         """A function that check if the tileset is valid."""
 
-        return all(tile in tileset
-                   for row in tilemap_array
-                   for tile in row)
+        return all(tile in tileset for tile in numpy.unique(tilemap_array).tolist())
 
     @staticmethod
     def _tile_size_from_tileset(tileset) -> int:
@@ -88,38 +94,121 @@ class Tilemap:
         return tileset
 
     def create_collision_map(self,
-                             collision_tiles: list[int]) -> list[list[bool]]:
+                             collision_tiles: Iterable[int]) -> numpy.ndarray:
         """
-        Function that return a collision map where every tile adjacent to void tiles is True and False otherwise.
+        Function that return a collision map where every collidable tile is True and False otherwise.
 
         :param collision_tiles: A list of integers that represent the tiles that are collidable.
         """
 
+        collision_tiles = list(collision_tiles)
         if len(collision_tiles) == 0:
             raise ValueError("The list of collision tiles must not be empty.")
 
-        collision_map = []
+        return self.tile_mask(collision_tiles)
+
+    def tile_mask(self,
+                  tile_ids: Iterable[int]) -> numpy.ndarray:
+        """
+        Return a boolean array of the size of the map, True where the tile is one of tile_ids.
+
+        :param tile_ids: The tile ids to look for.
+        """
+
+        return numpy.isin(self.tilemap_array, numpy.fromiter(tile_ids, dtype=self.DTYPE))
+
+    def get_visible_bounds(self,
+                           view_rect: Sequence[float]) -> tuple[int, int, int, int]:
+        """
+        Return the range of tiles overlapped by a rect, clamped to the map.
+
+        :param view_rect: A (x, y, width, height) rect in pixels, usually the camera rect.
+        :return: start_x, end_x, start_y, end_y. The end bounds are exclusive.
+        """
+
+        x, y, width, height = view_rect
+
+        start_x = max(0, math.floor(x / self.tile_size))
+        end_x = min(math.ceil((x + width) / self.tile_size), self.width)
+        start_y = max(0, math.floor(y / self.tile_size))
+        end_y = min(math.ceil((y + height) / self.tile_size), self.height)
+
+        return start_x, max(start_x, end_x), start_y, max(start_y, end_y)
+
+    def get_visible_window(self,
+                           view_rect: Sequence[float]) -> numpy.ndarray:
+        """
+        Return a view of the tiles overlapped by a rect.
+
+        :param view_rect: A (x, y, width, height) rect in pixels, usually the camera rect.
+        """
+
+        start_x, end_x, start_y, end_y = self.get_visible_bounds(view_rect)
+        return self.tilemap_array[start_y:end_y, start_x:end_x]
+
+    def get_non_empty_tiles(self,
+                            start_x: int = 0,
+                            end_x: int = None,
+                            start_y: int = 0,
+                            end_y: int = None) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """
+        Return the coordinates and the ids of every non-empty tile inside the given bounds.
+
+        :return: x coordinates, y coordinates and tile ids, as three arrays of the same length.
+        """
+
+        window = self.tilemap_array[start_y:end_y, start_x:end_x]
+        ys, xs = numpy.nonzero(window != self.EMPTY_TILE)
+
+        return xs + start_x, ys + start_y, window[ys, xs]
+
+    def set_tile(self,
+                 x: int,
+                 y: int,
+                 tile: int) -> None:
+        """
+        Change a single tile of the map and notify every registered tile change callback.
+
+        :param x: The column of the tile.
+        :param y: The row of the tile.
+        :param tile: The new tile id. Must be part of the tileset.
+        """
+
+        if tile not in self.tileset:
+            raise ValueError(f"Tile {tile} is not part of the tileset.")
+
+        if self.tilemap_array[y, x] == tile:
+            return
+
+        self.tilemap_array[y, x] = tile
+
+        for callback in self._tile_change_callbacks:
+            callback(x, y)
+
+    def register_tile_change_callback(self,
+                                      callback: typing.Callable[[int, int], None]) -> None:
+        """Registers a callback to be called with the coordinates of every tile changed with set_tile."""
 
-        for y, row in enumerate(self.tilemap_array):
-            collision_map.append([False] * len(row))
+        self._tile_change_callbacks.append(callback)
 
-            for x, tile in enumerate(row):
-                if tile in collision_tiles:
-                    collision_map[y][x] = True
+    def remove_tile_change_callback(self,
+                                    callback: typing.Callable[[int, int], None]) -> None:
+        """Removes a callback registered with register_tile_change_callback."""
 
-        return collision_map
+        while callback in self._tile_change_callbacks:
+            self._tile_change_callbacks.remove(callback)
 
     @property
     def size(self):
-        return len(self.tilemap_array[0]), len(self.tilemap_array)
+        return self.tilemap_array.shape[1], self.tilemap_array.shape[0]
 
     @property
     def width(self):
-        return len(self.tilemap_array[0])
+        return self.tilemap_array.shape[1]
 
     @property
     def height(self):
-        return len(self.tilemap_array)
+        return self.tilemap_array.shape[0]
 
     def __getitem__(self, item):
         return self.tilemap_array[item]
@@ -65,6 +65,7 @@ class PymunkPos(Pos):
         self.shape_info = default_shape_info
 
         self.position = position if position is not None else pygame.Vector2(0, 0)
+        self._previous_position: pymunk.Vec2d | None = None
 
     def configure_shape(self,
                         shape: pymunk.Shape,
@@ -118,8 +119,20 @@ class PymunkPos(Pos):
                              radius: float = -1,
                              shape_info: Type[PymunkShapeInfo] = None) -> list[pymunk.Shape]:
 
-        if shape_info is None:
-            shape_info = self.shape_info
+        polygons = self.march_surface(surface, scale, offset, march_type)
+        return self.create_polygon_shapes(polygons, radius, shape_info)
+
+    @staticmethod
+    def march_surface(surface: pygame.Surface,
+                      scale: float = 1,
+                      offset: Sequence[float, float] = (0, 0),
+                      march_type: Literal["soft", "hard"] = "soft") -> list[list[tuple[float, float]]]:
+        """
+        Return the outline polygons of the opaque pixels of a surface, centered on the surface.
+
+        The result only depends on the surface pixels and the parameters, so it can be computed once and passed to
+        create_polygon_shapes for every body sharing the same surface.
+        """
 
         size = surface.get_size()
         offset = [offset[i]+size[i]/2 for i in range(2)]
@@ -147,9 +160,15 @@ class PymunkPos(Pos):
         else:
             raise Exception("Invalid march type")
 
-        for i in range(len(polygons)):
-            polygon = polygons[i]
-            polygons[i] = [(offset[0]+point[0], offset[1]+point[1]) for point in polygon]
+        return [[(offset[0]+point[0], offset[1]+point[1]) for point in polygon] for polygon in polygons]
+
+    def create_polygon_shapes(self,
+                              polygons: list[list[tuple[float, float]]],
+                              radius: float = -1,
+                              shape_info: Type[PymunkShapeInfo] = None) -> list[pymunk.Shape]:
+
+        if shape_info is None:
+            shape_info = self.shape_info
 
         shapes = []
         for polygon in polygons:
@@ -163,6 +182,22 @@ class PymunkPos(Pos):
 
         return shapes
 
+    def save_previous_position(self) -> None:
+        if not self._is_static:
+            self._previous_position = self._body.position
+
+    def interpolate(self,
+                    alpha: float) -> pygame.Vector2:
+
+        if self._previous_position is None or alpha >= 1:
+            return self.position
+
+        previous_x, previous_y = self._previous_position
+        x, y = self.body.position
+
+        return pygame.Vector2(math.floor(previous_x + (x - previous_x) * alpha),
+                              math.floor(previous_y + (y - previous_y) * alpha))
+
     @property
     def position(self) -> pygame.Vector2:
         return pygame.Vector2(math.floor(self.body.position[0]), math.floor(self.body.position[1]))
@@ -170,6 +205,8 @@ class PymunkPos(Pos):
     @position.setter
     def position(self, position: pygame.Vector2) -> None:
         self.body.position = tuple(position)
+        # A teleport is not interpolated
+        self._previous_position = None
 
     @property
     def x(self) -> float:
@@ -235,6 +272,8 @@ class PymunkPos(Pos):
             self.space.remove(self.body, *self.shapes)
 
         self._body = body
+        # Static bodies never move, they are not interpolated
+        self._is_static = body.body_type == pymunk.Body.STATIC
 
     @property
     def shape_info(self) -> PymunkShapeInfo | None:
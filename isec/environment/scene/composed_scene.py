@@ -8,17 +8,25 @@ from isec.environment.base import Entity, Tilemap
 
 class ComposedScene(Scene):
     def __init__(self,
-                 fps: int) -> None:
+                 fps: int,
+                 step_size: float = None,
+                 max_substeps: int = 8) -> None:
         """
         A scene that contains multiple tilemap scenes and an entity scene.
         The tilemap scenes are rendered first, then the entity scene is rendered on top.
         If a tilemap scene have a parallax depth > 1, it will be rendered on top of the entity scene.
 
         :param fps: The fps of the scene.
+        :param step_size: The duration of a physics step of the entity scene, 1 / fps if None.
+        :param max_substeps: The maximum number of physics steps by update.
         """
 
         super().__init__()
-        self.entity_scene: EntityScene = EntityScene(fps, surface=self.surface, camera=self.camera)
+        self.entity_scene: EntityScene = EntityScene(fps,
+                                                     surface=self.surface,
+                                                     camera=self.camera,
+                                                     step_size=step_size,
+                                                     max_substeps=max_substeps)
         self.tilemap_scenes: list[TilemapScene] = []
 
     def add_entities(self,
@@ -31,33 +39,48 @@ class ComposedScene(Scene):
 
         self.entity_scene.add_entities(*entities)
 
+    def remove_entities(self,
+                        *entities: Entity) -> None:
+        """
+        Remove entities from the level scene, without destroying them.
+
+        :param entities: The entities to remove.
+        """
+
+        self.entity_scene.remove_entities(*entities)
+
     def add_tilemap_scene(self,
-                          tilemap: Tilemap) -> None:
+                          tilemap: Tilemap,
+                          chunk_size: int = None) -> None:
         """
         Add a tilemap scene to the level scene.
 
         :param tilemap: The tilemap scene to add.
+        :param chunk_size: If specified, the tilemap is rendered as pre-baked chunks of chunk_size tiles.
         """
 
-        new_tilemap_scene = TilemapScene(tilemap, surface=self.surface, camera=self.camera)
+        new_tilemap_scene = TilemapScene(tilemap, surface=self.surface, camera=self.camera, chunk_size=chunk_size)
         self.tilemap_scenes.append(new_tilemap_scene)
 
         self.tilemap_scenes.sort(key=lambda tilemap_scene: tilemap_scene.tilemap.parallax_depth)
 
     def update(self,
-               delta: float) -> None:
+               delta: float) -> int:
         """
         Update all the entities and the tilemap scenes.
 
         :param delta: The time since the last update.
+        :return: The number of physics steps run by the entity scene.
         """
 
-        self.entity_scene.update(delta)
+        substeps = self.entity_scene.update(delta)
 
         # return
         for tilemap_scene in self.tilemap_scenes:
             tilemap_scene.update(delta)
 
+        return substeps
+
     def render(self,
                camera: Camera = None) -> None:
         """
@@ -90,3 +113,7 @@ class ComposedScene(Scene):
     @property
     def entities(self) -> list[Entity]:
         return self.entity_scene.entities
+
+    @property
+    def interpolation_alpha(self) -> float:
+        return self.entity_scene.interpolation_alpha
@@ -11,7 +11,21 @@ class EntityScene(Scene):
                  fps: int,
                  surface: pygame.Surface = None,
                  entities: list[Entity] = None,
-                 camera: Camera = None) -> None:
+                 camera: Camera = None,
+                 step_size: float = None,
+                 max_substeps: int = 8) -> None:
+        """
+        A scene of entities and of their pymunk space, simulated with a fixed timestep.
+
+        The time of every update is accumulated, and the entities and the space are updated by steps of step_size,
+        at most max_substeps times by update. The time left, less than a step, is given to the render as
+        interpolation_alpha, the pymunk positions are drawn between their previous and their current step.
+
+        :param fps: The fps of the scene, the step size is 1 / fps if step_size is None.
+        :param step_size: The duration of a physics step, in seconds.
+        :param max_substeps: The maximum number of steps by update. Past it, the late time is dropped, so a slow frame
+            can't make the next ones even slower.
+        """
 
         super().__init__(surface, camera)
 
@@ -19,7 +33,13 @@ class EntityScene(Scene):
             entities = []
         self.entities = entities
 
-        self.avg_delta = 1 / fps
+        self.step_size = step_size if step_size is not None else 1 / fps
+        self.max_substeps = max_substeps
+        if self.step_size <= 0 or self.max_substeps < 1:
+            raise ValueError("An entity scene needs a positive step size and at least one substep.")
+
+        self.interpolation_alpha: float = 1
+        self._accumulator: float = 0
         self._space = pymunk.Space()
 
     def add_entities(self,
@@ -45,16 +65,37 @@ class EntityScene(Scene):
                 self.remove_entities(entity)
 
     def update(self,
-               _delta: float) -> None:
+               delta: float) -> int:
+        """Run the physics steps due after delta seconds, and return how many were run."""
+
+        self._accumulator += delta
+
+        substeps = 0
+        while self._accumulator >= self.step_size and substeps < self.max_substeps:
+            self.step()
+            self._accumulator -= self.step_size
+            substeps += 1
+
+        if self._accumulator >= self.step_size:
+            self._accumulator %= self.step_size
+
+        self.interpolation_alpha = self._accumulator / self.step_size
+        return substeps
+
+    def step(self) -> None:
+        """Update the entities and the space by one step."""
 
         for entity in self.entities:
-            entity.update(self.avg_delta)
+            entity.update(self.step_size)
 
         for entity in reversed(self.entities):
             if entity.to_delete:
                 self.entities.remove(entity)
 
-        self.space.step(self.avg_delta)
+        for entity in self.entities:
+            entity.position.save_previous_position()
+
+        self.space.step(self.step_size)
 
     def render(self,
                camera: Camera = None) -> None:
@@ -63,7 +104,7 @@ class EntityScene(Scene):
             camera = self.camera
 
         for entity in self.entities:
-            entity.render(camera.get_offset_pos(entity.position), self.surface, self.rect)
+            entity.render(camera.get_offset_pos(entity.position, self.interpolation_alpha), self.surface, self.rect)
 
     @property
     def space(self) -> pymunk.Space:
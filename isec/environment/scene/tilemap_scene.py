@@ -11,11 +11,30 @@ class TilemapScene(Scene):
     def __init__(self,
                  tilemap: Tilemap,
                  surface: pygame.Surface = None,
-                 camera: Camera = None) -> None:
+                 camera: Camera = None,
+                 chunk_size: int = None) -> None:
+        """
+        A scene that render a tilemap.
+
+        :param tilemap: The tilemap to render.
+        :param surface: The surface to render the tilemap on.
+        :param camera: The camera used to render the tilemap.
+        :param chunk_size: If specified, the tilemap is pre-baked into square chunks of chunk_size tiles.
+            Chunks are baked the first time they are visible and re-baked when one of their tiles changes.
+        """
 
         super().__init__(surface, camera)
         self.tilemap = tilemap
 
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("Chunk size must be greater than 0.")
+
+        self.chunk_size = chunk_size
+        self._chunks: dict[tuple[int, int], pygame.Surface] = {}
+
+        if self.chunk_size is not None:
+            self.tilemap.register_tile_change_callback(self._invalidate_tile)
+
     def render(self,
                camera: Camera = None) -> None:
 
@@ -27,21 +46,91 @@ class TilemapScene(Scene):
         camera_pos = pygame.Vector2(math.floor(camera.position.x) * self.tilemap.parallax_depth,
                                     math.floor(camera.position.y) * self.tilemap.parallax_depth)
 
-        start_x = max(0, math.floor(camera_pos[0]/tile_size))
-        end_x = min(math.ceil((camera_pos[0]+self.rect.width)/tile_size), self.tilemap.width)
-        start_y = max(0, math.floor(camera_pos[1]/tile_size))
-        end_y = min(math.ceil((camera_pos[1]+self.rect.height)/tile_size), self.tilemap.height)
+        if self.chunk_size is not None:
+            self._render_chunks(camera_pos)
+            return
 
-        pos_x = numpy.floor(numpy.arange(end_x) * self.tilemap.tile_size - camera_pos[0])
-        pos_y = numpy.floor(numpy.arange(end_y) * self.tilemap.tile_size - camera_pos[1])
+        start_x, end_x, start_y, end_y = self.tilemap.get_visible_bounds((*camera_pos, *self.rect.size))
 
-        self.surface.fblits([(self.tilemap.tileset[self.tilemap[y][x]], (pos_x[x], pos_y[y]))
-                             for x in range(start_x, end_x)
-                             for y in range(start_y, end_y)
-                             if self.tilemap[y][x] != -1])
+        pos_x = numpy.floor(numpy.arange(end_x) * tile_size - camera_pos[0])
+        pos_y = numpy.floor(numpy.arange(end_y) * tile_size - camera_pos[1])
+
+        xs, ys, tiles = self.tilemap.get_non_empty_tiles(start_x, end_x, start_y, end_y)
+        tileset = self.tilemap.tileset
+
+        self.surface.fblits([(tileset[tile], position)
+                             for tile, position in zip(tiles.tolist(),
+                                                       zip(pos_x[xs].tolist(), pos_y[ys].tolist()))])
 
         return
 
+    def _render_chunks(self,
+                       camera_pos: pygame.Vector2) -> None:
+        """Render the visible chunks, baking the ones that were never rendered before."""
+
+        chunk_pixel_size = self.chunk_size * self.tilemap.tile_size
+        nb_chunks_x = math.ceil(self.tilemap.width / self.chunk_size)
+        nb_chunks_y = math.ceil(self.tilemap.height / self.chunk_size)
+
+        start_x = max(0, math.floor(camera_pos[0]/chunk_pixel_size))
+        end_x = min(math.ceil((camera_pos[0]+self.rect.width)/chunk_pixel_size), nb_chunks_x)
+        start_y = max(0, math.floor(camera_pos[1]/chunk_pixel_size))
+        end_y = min(math.ceil((camera_pos[1]+self.rect.height)/chunk_pixel_size), nb_chunks_y)
+
+        blit_sequence = []
+        for chunk_x in range(start_x, end_x):
+            pos_x = math.floor(chunk_x * chunk_pixel_size - camera_pos[0])
+
+            for chunk_y in range(start_y, end_y):
+                pos_y = math.floor(chunk_y * chunk_pixel_size - camera_pos[1])
+
+                chunk = self._chunks.get((chunk_x, chunk_y))
+                if chunk is None:
+                    chunk = self._bake_chunk(chunk_x, chunk_y)
+
+                blit_sequence.append((chunk, (pos_x, pos_y)))
+
+        self.surface.fblits(blit_sequence)
+
+    def _bake_chunk(self,
+                    chunk_x: int,
+                    chunk_y: int) -> pygame.Surface:
+        """Draw every tile of a chunk on a new surface and store it."""
+
+        tile_size = self.tilemap.tile_size
+        start_x = chunk_x * self.chunk_size
+        start_y = chunk_y * self.chunk_size
+        end_x = min(start_x + self.chunk_size, self.tilemap.width)
+        end_y = min(start_y + self.chunk_size, self.tilemap.height)
+
+        chunk = pygame.Surface(((end_x-start_x) * tile_size, (end_y-start_y) * tile_size), pygame.SRCALPHA)
+
+        xs, ys, tiles = self.tilemap.get_non_empty_tiles(start_x, end_x, start_y, end_y)
+        tileset = self.tilemap.tileset
+
+        # BLEND_RGBA_MAX over a fully transparent surface copies the tiles' pixels untouched (alpha included),
+        # so blitting the chunk afterward gives the exact same result as blitting every tile one by one.
+        chunk.fblits([(tileset[tile], position)
+                      for tile, position in zip(tiles.tolist(),
+                                                zip(((xs-start_x) * tile_size).tolist(),
+                                                    ((ys-start_y) * tile_size).tolist()))],
+                     pygame.BLEND_RGBA_MAX)
+
+        self._chunks[(chunk_x, chunk_y)] = chunk
+        return chunk
+
+    def _invalidate_tile(self,
+                         x: int,
+                         y: int) -> None:
+        """Drop the chunk containing the tile, it will be baked again the next time it is visible."""
+
+        self._chunks.pop((x // self.chunk_size, y // self.chunk_size), None)
+
+    def clear_chunks(self) -> None:
+        """Drop every baked chunk."""
+
+        self._chunks.clear()
+
     def update(self,
                delta: float) -> None:
         pass
@@ -1,4 +1,7 @@
 from isec.environment.terrain.terrain_collision import TerrainCollision
+from isec.environment.terrain.editable_terrain_collision import EditableTerrainCollision
+from isec.environment.terrain.flow_field import FlowField
+from isec.environment.terrain.projectile_system import ProjectileSystem
 
 
-__all__ = ["TerrainCollision"]
+__all__ = ["TerrainCollision", "EditableTerrainCollision", "FlowField", "ProjectileSystem"]
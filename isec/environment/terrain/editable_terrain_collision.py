@@ -0,0 +1,195 @@
+import numpy
+import pygame
+import pymunk
+
+from typing import Type
+from collections.abc import Iterable, Callable
+
+from isec.instance import BaseInstance
+from isec.environment.base import Tilemap
+from isec.environment.scene import EntityScene, ComposedScene
+from isec.environment.position.pymunk_pos import PymunkShapeInfo
+from isec.environment.terrain.terrain_collision import TerrainCollision
+
+
+class EditableTerrainCollision(TerrainCollision):
+    """
+    A terrain whose collidable tiles can change at runtime, e.g. destructible terrain.
+
+    The collision map is split into square chunks decomposed independently, and the shapes are indexed by chunk, so
+    changing a tile only rebuilds the shapes of its chunk. The rebuild is done after the current space step, once per
+    chunk however many of its tiles changed. The edited chunks are not cached by PolygonCache.
+    """
+
+    def __init__(self,
+                 collision_map: numpy.ndarray | list[list[bool]],
+                 tile_size: int,
+                 shape_info: Type[PymunkShapeInfo],
+                 linked_scene: EntityScene | ComposedScene,
+                 linked_instance: BaseInstance,
+                 show_collisions: bool = False,
+                 decomposition: str = "rectangles",
+                 chunk_size: int = 16,
+                 chunk_polygons: dict[tuple[int, int], list[list[tuple]]] = None) -> None:
+        """
+        :param collision_map: The collision map, True for collidable tiles. It is copied, the edges are ignored.
+        :param tile_size: The size of a tile in pixels.
+        :param decomposition: The decomposition mode of the chunks, see TerrainCollision.decompose_collision_map.
+            The default "rectangles" mode keeps the holes dug in the terrain, "march" fills them.
+        :param chunk_size: The width and height of a chunk, in tiles. It bounds the cost of an edit.
+        :param chunk_polygons: The polygons of the chunks, if they were computed beforehand by
+            TerrainCollision.decompose_collision_map_by_chunks with the same parameters.
+        """
+
+        super().__init__([], shape_info, linked_scene, linked_instance)
+
+        self.collision_map = numpy.array(collision_map, dtype=bool)
+        self.collision_map[[0, -1], :] = False
+        self.collision_map[:, [0, -1]] = False
+
+        self.tile_size = tile_size
+        self.decomposition = decomposition
+        self.chunk_size = chunk_size
+
+        self._chunk_shapes: dict[tuple[int, int], list[pymunk.Shape]] = {}
+        self._dirty_chunks: set[tuple[int, int]] = set()
+        self._linked_tilemaps: list[tuple[Tilemap, Callable[[int, int], None]]] = []
+
+        if show_collisions:
+            height, width = self.collision_map.shape
+            self.overlay = self._create_overlay(pygame.Rect(0, 0, width * tile_size, height * tile_size))
+
+        if chunk_polygons is None:
+            chunk_polygons = self.decompose_collision_map_by_chunks(self.collision_map,
+                                                                    tile_size,
+                                                                    chunk_size,
+                                                                    decomposition)
+
+        for chunk, polygons in chunk_polygons.items():
+            self._set_chunk_polygons(chunk, polygons)
+
+    @property
+    def shapes(self) -> list[pymunk.Shape]:
+        return [shape for shapes in self._chunk_shapes.values() for shape in shapes]
+
+    def get_chunk(self,
+                  x: int,
+                  y: int) -> tuple[int, int]:
+        """Return the index of the chunk holding a tile."""
+
+        return x // self.chunk_size, y // self.chunk_size
+
+    def get_shapes_at(self,
+                      x: int,
+                      y: int) -> list[pymunk.Shape]:
+        """Return the shapes covering a tile."""
+
+        if not self.collision_map[y, x]:
+            return []
+
+        tile_bb = pymunk.BB(x * self.tile_size,
+                            y * self.tile_size,
+                            (x + 1) * self.tile_size,
+                            (y + 1) * self.tile_size)
+
+        return [shape for shape in self._chunk_shapes.get(self.get_chunk(x, y), [])
+                if shape.cache_bb().intersects(tile_bb)]
+
+    def set_collidable(self,
+                       x: int,
+                       y: int,
+                       collidable: bool) -> None:
+        """
+        Change a tile of the collision map, its chunk is rebuilt after the current (or next) space step.
+
+        The edges of the map are never collidable, changing them does nothing.
+        """
+
+        height, width = self.collision_map.shape
+        if not (0 < x < width - 1 and 0 < y < height - 1):
+            return
+
+        if self.collision_map[y, x] == collidable:
+            return
+
+        self.collision_map[y, x] = collidable
+
+        if not self._dirty_chunks:
+            self.position.space.add_post_step_callback(self._rebuild_after_step, self)
+
+        self._dirty_chunks.add(self.get_chunk(x, y))
+
+    def rebuild(self) -> None:
+        """Rebuild the shapes of the changed chunks now. It must not be called during a space step."""
+
+        for chunk in self._dirty_chunks:
+            self._set_chunk_polygons(chunk, self.decompose_collision_map_chunk(self.collision_map,
+                                                                               self.tile_size,
+                                                                               chunk,
+                                                                               self.chunk_size,
+                                                                               self.decomposition,
+                                                                               use_cache=False))
+
+        self._dirty_chunks.clear()
+
+    def link_tilemap(self,
+                     tilemap: Tilemap,
+                     collidable_tiles: Iterable[int]) -> None:
+        """
+        Follow the changes of a tilemap made with Tilemap.set_tile.
+
+        :param tilemap: A tilemap of the same size as the collision map.
+        :param collidable_tiles: The ids of the collidable tiles.
+        """
+
+        collidable_tiles = frozenset(collidable_tiles)
+
+        def on_tile_change(x: int, y: int) -> None:
+            self.set_collidable(x, y, int(tilemap[y, x]) in collidable_tiles)
+
+        tilemap.register_tile_change_callback(on_tile_change)
+        self._linked_tilemaps.append((tilemap, on_tile_change))
+
+    def unlink_tilemaps(self) -> None:
+        for tilemap, callback in self._linked_tilemaps:
+            tilemap.remove_tile_change_callback(callback)
+
+        self._linked_tilemaps.clear()
+
+    def remove_from_space(self) -> None:
+        self.unlink_tilemaps()
+
+        space = self.position.space
+        space.remove(*self.shapes)
+        self._chunk_shapes.clear()
+        self._dirty_chunks.clear()
+
+        super().remove_from_space()
+
+    def _rebuild_after_step(self,
+                            _space: pymunk.Space,
+                            _key: "EditableTerrainCollision") -> None:
+        self.rebuild()
+
+    def _set_chunk_polygons(self,
+                            chunk: tuple[int, int],
+                            polygons: list[list[tuple]]) -> None:
+        """Replace the shapes of a chunk, and its part of the overlay."""
+
+        space = self.position.space
+
+        if chunk in self._chunk_shapes:
+            space.remove(*self._chunk_shapes.pop(chunk))
+
+        shapes = [self.position.configure_shape(self._create_shape(polygon)) for polygon in polygons]
+        if shapes:
+            space.add(*shapes)
+            self._chunk_shapes[chunk] = shapes
+
+        if self.overlay is not None:
+            chunk_pixel_size = self.chunk_size * self.tile_size
+            self.overlay.sprite.surface.fill((0, 0, 0, 0), pygame.Rect(chunk[0] * chunk_pixel_size,
+                                                                       chunk[1] * chunk_pixel_size,
+                                                                       chunk_pixel_size,
+                                                                       chunk_pixel_size))
+            self._draw_overlay(polygons)
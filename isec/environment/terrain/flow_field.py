@@ -0,0 +1,218 @@
+import heapq
+import math
+import numpy
+import pygame
+
+from isec.instance import BaseInstance
+from isec.environment.base import Entity, Sprite
+from isec.environment.scene import EntityScene, ComposedScene
+from isec.environment.position.static_pos import StaticPos
+
+
+class FlowField:
+    """
+    A shared distance map toward a target, e.g. the player, so any number of entities can follow the shortest path to
+    it over a terrain with an O(1) lookup of their tile.
+
+    The distances are computed with a Dijkstra search from the target tile, 8-connected without corner cutting, only
+    when the target changes tile. The search can be spread over several updates with a budget of tiles per update:
+    it fills its own buffers, and the previous field stays in use until the new one is complete.
+    """
+
+    def __init__(self,
+                 collision_map: numpy.ndarray,
+                 tile_size: int,
+                 linked_scene: EntityScene | ComposedScene,
+                 linked_instance: BaseInstance,
+                 budget: int | None = None,
+                 show_overlay: bool = False) -> None:
+        """
+        :param collision_map: The collision map, True for collidable tiles. It is read again at every search, so the
+            changes of the map are taken into account at the next target change.
+        :param tile_size: The size of a tile in pixels.
+        :param budget: The maximum number of tiles searched by update, None to always complete the search at once.
+        :param show_overlay: Draw the direction of every tile, colored by distance, on an overlay entity.
+        """
+
+        self.collision_map = collision_map
+        self.tile_size = tile_size
+        self.budget = budget
+
+        self.linked_scene = linked_scene
+        self.linked_instance = linked_instance
+
+        height, width = numpy.shape(collision_map)
+        self._padded_width = width + 2
+
+        # The complete field, read by sample, and the target tile it leads to
+        self._parents: list[int] = []
+        self._distances: list[float] = []
+        self.field_target: tuple[int, int] | None = None
+
+        # The search in progress
+        self.target: tuple[int, int] | None = None
+        self._search_target: tuple[int, int] | None = None
+        self._search_walls: bytes = b""
+        self._search_parents: list[int] = []
+        self._search_distances: list[float] = []
+        self._search_heap: list[tuple[float, int]] = []
+
+        self.overlay: Entity | None = None
+        if show_overlay:
+            self.overlay = Entity(position=StaticPos((width * tile_size / 2, height * tile_size / 2)),
+                                  sprite=Sprite(pygame.Surface((width * tile_size, height * tile_size),
+                                                               pygame.SRCALPHA),
+                                                "optimized_static"),
+                                  linked_scene=linked_scene,
+                                  linked_instance=linked_instance)
+
+    def set_target(self,
+                   position: pygame.Vector2) -> None:
+        """Set the position to lead to, the field is computed again on the next updates if its tile changed."""
+
+        x, y = int(position[0] // self.tile_size), int(position[1] // self.tile_size)
+        height, width = numpy.shape(self.collision_map)
+
+        if 0 <= x < width and 0 <= y < height and not self.collision_map[y, x]:
+            self.target = (x, y)
+
+    def update(self) -> None:
+        """Search up to budget tiles, starting a new search if the target changed tile."""
+
+        if self._search_target is None:
+            if self.target is None or self.target == self.field_target:
+                return
+
+            self._start_search()
+
+        if self._search(self.budget):
+            self._parents = self._search_parents
+            self._distances = self._search_distances
+            self.field_target = self._search_target
+            self._search_target = None
+
+            if self.overlay is not None:
+                self._draw_overlay()
+
+    def sample(self,
+               position: pygame.Vector2) -> pygame.Vector2 | None:
+        """
+        Return the unit vector from a position toward the center of the next tile of its shortest path to the target,
+        or None if the position is on the target tile, on a wall, outside the map or can't reach the target.
+        """
+
+        index = self._get_index(position)
+        if index == -1 or self._parents[index] == -1:
+            return None
+
+        row, column = divmod(self._parents[index], self._padded_width)
+        direction = pygame.Vector2((column - 0.5) * self.tile_size - position[0],
+                                   (row - 0.5) * self.tile_size - position[1])
+
+        return direction.normalize() if direction else None
+
+    def get_distance(self,
+                     position: pygame.Vector2) -> float | None:
+        """Return the length in tiles of the shortest path from a position to the target, or None."""
+
+        index = self._get_index(position)
+        if index == -1 or self._distances[index] == math.inf:
+            return None
+
+        return self._distances[index]
+
+    @property
+    def is_searching(self) -> bool:
+        return self._search_target is not None
+
+    def _get_index(self,
+                   position: pygame.Vector2) -> int:
+
+        if self.field_target is None:
+            return -1
+
+        x, y = int(position[0] // self.tile_size), int(position[1] // self.tile_size)
+        height, width = numpy.shape(self.collision_map)
+
+        if not (0 <= x < width and 0 <= y < height):
+            return -1
+
+        return (y + 1) * self._padded_width + x + 1
+
+    def _start_search(self) -> None:
+        self._search_target = self.target
+
+        # A border of walls, so the neighbours never need a bounds check
+        self._search_walls = numpy.pad(numpy.asarray(self.collision_map, dtype=bool), 1, constant_values=True).tobytes()
+        self._search_parents = [-1] * len(self._search_walls)
+        self._search_distances = [math.inf] * len(self._search_walls)
+
+        target_index = (self._search_target[1] + 1) * self._padded_width + self._search_target[0] + 1
+        self._search_distances[target_index] = 0.0
+        self._search_heap = [(0.0, target_index)]
+
+    def _search(self,
+                budget: int | None) -> bool:
+        """Search up to budget tiles, return True if the search is complete."""
+
+        walls = self._search_walls
+        parents = self._search_parents
+        distances = self._search_distances
+        heap = self._search_heap
+        padded_width = self._padded_width
+
+        moves = [(-padded_width, 1.0, 0, 0), (padded_width, 1.0, 0, 0), (-1, 1.0, 0, 0), (1, 1.0, 0, 0)]
+        moves += [(row_offset + column_offset, math.sqrt(2), row_offset, column_offset)
+                  for row_offset in (-padded_width, padded_width)
+                  for column_offset in (-1, 1)]
+
+        searched = 0
+        while heap:
+            if budget is not None and searched >= budget:
+                return False
+
+            distance, current = heapq.heappop(heap)
+            if distance > distances[current]:
+                continue
+
+            searched += 1
+
+            for offset, cost, row_offset, column_offset in moves:
+                neighbour = current + offset
+
+                if walls[neighbour]:
+                    continue
+
+                if row_offset and (walls[current + row_offset] or walls[current + column_offset]):
+                    continue
+
+                neighbour_distance = distance + cost
+                if neighbour_distance < distances[neighbour]:
+                    distances[neighbour] = neighbour_distance
+                    parents[neighbour] = current
+                    heapq.heappush(heap, (neighbour_distance, neighbour))
+
+        return True
+
+    def _draw_overlay(self) -> None:
+        """Draw a line from every reachable tile toward the next one, from green (near) to red (far)."""
+
+        surface = self.overlay.sprite.surface
+        surface.fill((0, 0, 0, 0))
+
+        reached_distances = [distance for distance in self._distances if distance != math.inf]
+        max_distance = max(reached_distances) if reached_distances else 1
+
+        for index, parent in enumerate(self._parents):
+            if parent == -1:
+                continue
+
+            row, column = divmod(index, self._padded_width)
+            parent_row, parent_column = divmod(parent, self._padded_width)
+            ratio = self._distances[index] / max_distance if max_distance else 0
+
+            center = ((column - 0.5) * self.tile_size, (row - 0.5) * self.tile_size)
+            end = (center[0] + (parent_column - column) * self.tile_size * 0.4,
+                   center[1] + (parent_row - row) * self.tile_size * 0.4)
+
+            pygame.draw.line(surface, (int(255 * ratio), int(255 * (1 - ratio)), 0, 160), center, end)
@@ -0,0 +1,243 @@
+import numpy
+import pygame
+
+from collections.abc import Callable, Iterable
+
+from isec.instance import BaseInstance
+from isec.objects import CachedSurface, cast_rays
+from isec.environment.base import Entity, Sprite
+from isec.environment.scene import EntityScene, ComposedScene
+from isec.environment.position.static_pos import StaticPos
+
+
+class ProjectileSystem(Entity):
+    """
+    Small projectiles, e.g. bullets or sparks, that fly under the gravity of the scene and die on their first terrain
+    hit, without any pymunk body.
+
+    Their positions and velocities are stored in arrays: every update moves all of them with numpy operations, and
+    finds the ones hitting a tile with a single vectorized ray traversal of the collision map (see cast_rays). They are
+    all drawn with a single fblits call, rotated along their velocity if the surface is a CachedSurface, between their
+    last two steps like the interpolated pymunk bodies.
+    """
+
+    # Offset along the direction, in tiles, to find the tile behind a hit position that lies on its edge
+    _HIT_EPSILON = 1e-6
+
+    def __init__(self,
+                 collision_map: numpy.ndarray,
+                 tile_size: int,
+                 surface: pygame.Surface,
+                 linked_scene: EntityScene | ComposedScene,
+                 linked_instance: BaseInstance,
+                 capacity: int = 256,
+                 on_hit: Callable[[numpy.ndarray, numpy.ndarray], None] = None) -> None:
+        """
+        :param collision_map: The collision map, True for collidable tiles. It is read at every update, so the changes
+            of the map are taken into account immediately.
+        :param tile_size: The size of a tile in pixels.
+        :param surface: The surface of a projectile, centered on its position.
+        :param capacity: The maximum number of projectiles, the oldest ones are dropped to emit new ones past it.
+        :param on_hit: Called once by update, if projectiles hit the terrain, with their hit positions in pixels and the
+            (x, y) tiles they hit, both with shape (N, 2).
+        """
+
+        if capacity < 1:
+            raise ValueError("A projectile system needs a capacity of at least 1.")
+
+        self.collision_map = collision_map
+        self.tile_size = tile_size
+        self.capacity = capacity
+        self.on_hit = on_hit
+
+        self._positions = numpy.zeros((capacity, 2))
+        self._previous_positions = numpy.zeros((capacity, 2))
+        self._velocities = numpy.zeros((capacity, 2))
+        self._count = 0
+
+        self.stats: dict[str, int] = {"emitted": 0,
+                                      "hits": 0,
+                                      "lost": 0,
+                                      "dropped": 0,
+                                      "peak": 0}
+
+        # Every rotation of the surface, indexed like the rotation set of the CachedSurface
+        if isinstance(surface, CachedSurface):
+            rotation_set = surface.rotation_set
+            self._frames = [rotation_set.get(index) for index in range(rotation_set.caching_size)]
+            self._caching_step = rotation_set.caching_step
+
+        else:
+            self._frames = [surface]
+            self._caching_step = None
+
+        self._half_sizes = numpy.array([frame.get_size() for frame in self._frames]) // 2
+        self._max_half_size = int(self._half_sizes.max())
+
+        super().__init__(position=StaticPos((0, 0)),
+                         sprite=Sprite(surface),
+                         linked_scene=linked_scene,
+                         linked_instance=linked_instance)
+
+    def emit(self,
+             positions: numpy.ndarray | Iterable[Iterable[float]],
+             velocities: numpy.ndarray | Iterable[Iterable[float]]) -> None:
+        """
+        Add projectiles.
+
+        :param positions: Their positions in pixels, with shape (N, 2).
+        :param velocities: Their velocities in pixels per second, with shape (N, 2).
+        """
+
+        positions = numpy.asarray(positions, dtype=numpy.float64).reshape(-1, 2)[-self.capacity:]
+        velocities = numpy.asarray(velocities, dtype=numpy.float64).reshape(-1, 2)[-self.capacity:]
+        new_count = len(positions)
+
+        # The projectiles are ordered by emission, the oldest are dropped first
+        dropped = max(0, self._count + new_count - self.capacity)
+        if dropped:
+            kept = self._count - dropped
+            self._positions[:kept] = self._positions[dropped:self._count]
+            self._previous_positions[:kept] = self._previous_positions[dropped:self._count]
+            self._velocities[:kept] = self._velocities[dropped:self._count]
+            self._count = kept
+            self.stats["dropped"] += dropped
+
+        self._positions[self._count:self._count + new_count] = positions
+        self._previous_positions[self._count:self._count + new_count] = positions
+        self._velocities[self._count:self._count + new_count] = velocities
+        self._count += new_count
+
+        self.stats["emitted"] += new_count
+        self.stats["peak"] = max(self.stats["peak"], self._count)
+
+    def clear(self) -> None:
+        """Remove every projectile."""
+
+        self._count = 0
+
+    def update(self,
+               delta: float) -> None:
+        """Move the projectiles, the ones hitting a tile or leaving the map are removed."""
+
+        if not self._count:
+            return
+
+        positions = self._positions[:self._count]
+        velocities = self._velocities[:self._count]
+        self._previous_positions[:self._count] = positions
+
+        # The same integration as the pymunk bodies of the scene
+        space = self.linked_scene.space
+        velocities *= space.damping ** delta
+        velocities += numpy.asarray(space.gravity) * delta
+
+        displacements = velocities * delta
+        distances = numpy.sqrt(displacements[:, 0] * displacements[:, 0] + displacements[:, 1] * displacements[:, 1])
+
+        new_positions, hit = cast_rays(self.collision_map,
+                                       self.tile_size,
+                                       positions,
+                                       displacements,
+                                       distances / self.tile_size)
+
+        # The tiles behind the end positions, the hit tiles for the projectiles that hit one
+        directions = displacements / numpy.where(distances > 0, distances, 1)[:, None]
+        tiles = numpy.floor(new_positions / self.tile_size + directions * self._HIT_EPSILON).astype(numpy.int64)
+
+        # cast_rays stops at the border tiles of the map without looking at them: the projectiles reaching a collidable
+        # one hit it, the other ones are lost
+        collision_map = numpy.asarray(self.collision_map, dtype=bool)
+        height, width = collision_map.shape
+        border = ~hit & ((tiles[:, 0] < 1) | (tiles[:, 0] >= width - 1)
+                         | (tiles[:, 1] < 1) | (tiles[:, 1] >= height - 1))
+
+        if border.any():
+            border_hit = border & ((tiles >= 0) & (tiles < (width, height))).all(axis=1)
+            border_tiles = tiles[border_hit]
+            border_hit[border_hit] = collision_map[border_tiles[:, 1], border_tiles[:, 0]]
+            hit |= border_hit
+            lost = border & ~border_hit
+
+        else:
+            lost = border
+
+        if hit.any():
+            self.stats["hits"] += int(hit.sum())
+
+            if self.on_hit is not None:
+                self.on_hit(new_positions[hit], tiles[hit])
+
+        positions[:] = new_positions
+
+        removed = hit | lost
+        if removed.any():
+            self.stats["lost"] += int(lost.sum())
+
+            kept = ~removed
+            kept_count = int(kept.sum())
+            self._positions[:kept_count] = positions[kept]
+            self._previous_positions[:kept_count] = self._previous_positions[:self._count][kept]
+            self._velocities[:kept_count] = velocities[kept]
+            self._count = kept_count
+
+    def render(self,
+               camera_offset: Iterable,
+               surface: pygame.Surface,
+               rect: pygame.Rect) -> None:
+        """Draw the visible projectiles with a single fblits call, at the interpolation alpha of the scene."""
+
+        if not self._count:
+            return
+
+        positions = self._positions[:self._count]
+        alpha = self.linked_scene.interpolation_alpha
+        if alpha < 1:
+            previous_positions = self._previous_positions[:self._count]
+            positions = previous_positions + (positions - previous_positions) * alpha
+
+        centers = numpy.floor(positions + numpy.asarray(camera_offset, dtype=numpy.float64))
+
+        visible = ((centers[:, 0] >= rect.left - self._max_half_size)
+                   & (centers[:, 0] < rect.right + self._max_half_size)
+                   & (centers[:, 1] >= rect.top - self._max_half_size)
+                   & (centers[:, 1] < rect.bottom + self._max_half_size))
+
+        if not visible.any():
+            return
+
+        centers = centers[visible]
+
+        if self._caching_step is None:
+            frame_indices = numpy.zeros(len(centers), dtype=numpy.int64)
+
+        else:
+            velocities = self._velocities[:self._count][visible]
+            angles = -numpy.degrees(numpy.arctan2(velocities[:, 1], velocities[:, 0]))
+            frame_indices = numpy.rint(angles % 360 / self._caching_step).astype(numpy.int64) % len(self._frames)
+
+        top_lefts = (centers - self._half_sizes[frame_indices]).astype(numpy.int64)
+        frames = self._frames
+
+        surface.fblits([(frames[index], top_left)
+                        for index, top_left in zip(frame_indices.tolist(), top_lefts.tolist())])
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def positions(self) -> numpy.ndarray:
+        """The positions of the projectiles in pixels, a read-only view."""
+
+        view = self._positions[:self._count]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def velocities(self) -> numpy.ndarray:
+        """The velocities of the projectiles in pixels per second, a read-only view."""
+
+        view = self._velocities[:self._count]
+        view.flags.writeable = False
+        return view
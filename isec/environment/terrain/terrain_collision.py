@@ -1,3 +1,6 @@
+import math
+import numpy
+import random
 import pygame
 import pymunk
 import pymunk.autogeometry
@@ -5,83 +8,280 @@ import pymunk.autogeometry
 from typing import Self, Type
 
 from isec.instance import BaseInstance
+from isec.objects import PolygonCache
 from isec.environment.base import Entity, Sprite
 from isec.environment.scene import EntityScene, ComposedScene
+from isec.environment.position.static_pos import StaticPos
 from isec.environment.position.pymunk_pos import PymunkPos, PymunkShapeInfo
-from isec.environment.sprite import PymunkSprite
 
 
-class TerrainCollision(Entity):
+class TerrainCollision:
+    """
+    The collisions of a terrain: every polygon is a shape of a single static body.
+
+    It is not an entity, so the terrain adds no work to the update and render loops of the scene. With
+    show_collisions, the shapes are drawn once on a surface, rendered by a single overlay entity.
+    """
+
     SHAPES_RADIUS = 2.5
+    DECOMPOSITION_MODES = ("march", "rectangles")
 
     def __init__(self,
-                 polygon: list[tuple],
+                 polygons: list[list[tuple]],
                  shape_info: Type[PymunkShapeInfo],
                  linked_scene: EntityScene | ComposedScene,
                  linked_instance: BaseInstance,
                  show_collisions: bool = False) -> None:
 
-        position = PymunkPos(space=linked_scene.space,
-                             body_type="STATIC",
-                             default_shape_info=shape_info)
+        self.linked_scene = linked_scene
+        self.linked_instance = linked_instance
 
-        position.add_shape(pymunk.Poly(body=position.body,
-                                       vertices=polygon,
-                                       radius=self.SHAPES_RADIUS))
+        self.position = PymunkPos(space=linked_scene.space,
+                                  body_type="STATIC",
+                                  default_shape_info=shape_info)
 
-        position.add_to_space()
+        for polygon in polygons:
+            self.position.add_shape(self._create_shape(polygon))
 
-        if show_collisions:
-            sprite = PymunkSprite(position)
-        else:
-            sprite = Sprite(pygame.Surface((1, 1), pygame.SRCALPHA))
+        self.position.add_to_space()
 
-        super().__init__(position=position,
-                         sprite=sprite,
-                         linked_scene=linked_scene,
-                         linked_instance=linked_instance)
+        self.overlay: Entity | None = None
+        if show_collisions and polygons:
+            self.overlay = self._create_overlay(self._get_bounding_rect(polygons))
+            self._draw_overlay(polygons)
 
     @classmethod
     def from_collision_map(cls,
-                           collision_map: list[list[bool]],
+                           collision_map: numpy.ndarray | list[list[bool]],
                            tile_size: int,
                            linked_scene: EntityScene | ComposedScene,
                            linked_instance: BaseInstance,
                            shape_info: Type[PymunkShapeInfo] = None,
-                           show_collisions: bool = False) -> list[Self]:
+                           show_collisions: bool = False,
+                           decomposition: str = "march") -> Self:
+
+        return cls.from_polygons(cls.decompose_collision_map(collision_map, tile_size, decomposition),
+                                 linked_scene,
+                                 linked_instance,
+                                 shape_info,
+                                 show_collisions)
+
+    @classmethod
+    def from_polygons(cls,
+                      polygons: list[list[tuple]],
+                      linked_scene: EntityScene | ComposedScene,
+                      linked_instance: BaseInstance,
+                      shape_info: Type[PymunkShapeInfo] = None,
+                      show_collisions: bool = False) -> Self:
+        """Create the terrain from convex polygons, e.g. polygons computed once by decompose_collision_map."""
+
+        return cls(polygons=polygons,
+                   shape_info=shape_info,
+                   linked_scene=linked_scene,
+                   linked_instance=linked_instance,
+                   show_collisions=show_collisions)
+
+    @property
+    def body(self) -> pymunk.Body:
+        return self.position.body
+
+    @property
+    def shapes(self) -> list[pymunk.Shape]:
+        return self.position.shapes
+
+    def remove_from_space(self) -> None:
+        """Remove the terrain body and shapes from the space, the overlay is destroyed."""
+
+        self.position.remove_from_space()
+
+        if self.overlay is not None:
+            self.overlay.destroy()
+            self.overlay = None
+
+    def _create_shape(self,
+                      polygon: list[tuple]) -> pymunk.Poly:
 
-        entities = []
+        return pymunk.Poly(body=self.position.body,
+                           vertices=polygon,
+                           radius=self.SHAPES_RADIUS)
+
+    @staticmethod
+    def _get_bounding_rect(polygons: list[list[tuple]]) -> pygame.Rect:
+        left = min(vertex[0] for polygon in polygons for vertex in polygon)
+        top = min(vertex[1] for polygon in polygons for vertex in polygon)
+        right = max(vertex[0] for polygon in polygons for vertex in polygon)
+        bottom = max(vertex[1] for polygon in polygons for vertex in polygon)
+
+        return pygame.Rect(math.floor(left), math.floor(top), math.ceil(right - left) + 1, math.ceil(bottom - top) + 1)
+
+    def _create_overlay(self,
+                        rect: pygame.Rect) -> Entity:
+        """Create the entity rendering the collision overlay, a transparent surface covering the rect."""
+
+        return Entity(position=StaticPos(rect.center),
+                      sprite=Sprite(pygame.Surface(rect.size, pygame.SRCALPHA), "optimized_static"),
+                      linked_scene=self.linked_scene,
+                      linked_instance=self.linked_instance)
+
+    def _draw_overlay(self,
+                      polygons: list[list[tuple]]) -> None:
+        """Draw polygons, with a random color each, on the overlay."""
+
+        surface = self.overlay.sprite.surface
+        left = self.overlay.position.x - surface.get_width() // 2
+        top = self.overlay.position.y - surface.get_height() // 2
+
+        for polygon in polygons:
+            pygame.draw.polygon(surface,
+                                [random.randint(0, 255) for _ in range(3)],
+                                [(x - left, y - top) for x, y in polygon])
+
+    @classmethod
+    def decompose_collision_map(cls,
+                                collision_map: numpy.ndarray | list[list[bool]],
+                                tile_size: int,
+                                decomposition: str = "march",
+                                use_cache: bool = True) -> list[list[tuple]]:
+        """
+        Return the convex polygons, in pixels, covering the collidable tiles of the collision map.
+
+        :param collision_map: The collision map, True for collidable tiles. The edges of the map are ignored.
+        :param tile_size: The size of a tile in pixels.
+        :param decomposition: "march" to trace the outlines with marching squares and split them into convex
+            polygons, or "rectangles" to merge the tiles into axis-aligned boxes, faster to build and usually
+            fewer shapes. The march mode fills the holes of the collidable areas.
+        :param use_cache: If True, the polygons are cached in memory and on disk by PolygonCache, so a map is only
+            decomposed once.
+        """
+
+        if decomposition not in cls.DECOMPOSITION_MODES:
+            raise ValueError(f"Invalid decomposition mode: {decomposition}.")
 
         # prepare collision map
-        for y in range(len(collision_map)):
-            for x in range(len(collision_map[0])):
-                if x == 0 or y == 0 or x == len(collision_map[0])-1 or y == len(collision_map)-1:
-                    collision_map[y][x] = False
+        collision_map = numpy.array(collision_map, dtype=bool)
+        collision_map[[0, -1], :] = False
+        collision_map[:, [0, -1]] = False
 
-        for polygon in cls._decompose_collision_map_into_polygons(collision_map, tile_size):
-            new_body = cls(polygon=polygon,
-                           shape_info=shape_info,
-                           linked_scene=linked_scene,
-                           linked_instance=linked_instance,
-                           show_collisions=show_collisions)
+        if decomposition == "rectangles":
+            decompose = cls._decompose_collision_map_into_rectangles
+        else:
+            decompose = cls._decompose_collision_map_into_polygons
 
-            entities.append(new_body)
+        if not use_cache:
+            return decompose(collision_map, tile_size)
 
-        return entities
+        return PolygonCache.get(collision_map,
+                                (decomposition, tile_size),
+                                lambda: decompose(collision_map, tile_size))
+
+    @classmethod
+    def decompose_collision_map_by_chunks(cls,
+                                          collision_map: numpy.ndarray | list[list[bool]],
+                                          tile_size: int,
+                                          chunk_size: int,
+                                          decomposition: str = "march") -> dict[tuple[int, int], list[list[tuple]]]:
+        """Return the polygons of every chunk holding collidable tiles, see decompose_collision_map_chunk."""
+
+        collision_map = numpy.array(collision_map, dtype=bool)
+        collision_map[[0, -1], :] = False
+        collision_map[:, [0, -1]] = False
+
+        height, width = collision_map.shape
+        chunk_polygons = {}
+
+        for chunk_y in range(math.ceil(height / chunk_size)):
+            for chunk_x in range(math.ceil(width / chunk_size)):
+                polygons = cls.decompose_collision_map_chunk(collision_map,
+                                                             tile_size,
+                                                             (chunk_x, chunk_y),
+                                                             chunk_size,
+                                                             decomposition)
+                if polygons:
+                    chunk_polygons[(chunk_x, chunk_y)] = polygons
+
+        return chunk_polygons
+
+    @classmethod
+    def decompose_collision_map_chunk(cls,
+                                      collision_map: numpy.ndarray,
+                                      tile_size: int,
+                                      chunk: tuple[int, int],
+                                      chunk_size: int,
+                                      decomposition: str = "march",
+                                      use_cache: bool = True) -> list[list[tuple]]:
+        """
+        Return the convex polygons, in pixels, covering the collidable tiles of a single chunk of the collision map.
+
+        The polygons never leave the chunk, so a chunk can be decomposed again without touching its neighbours.
+
+        :param collision_map: The collision map, True for collidable tiles. The edges of the map must be False.
+        :param tile_size: The size of a tile in pixels.
+        :param chunk: The (x, y) index of the chunk.
+        :param chunk_size: The width and height of a chunk, in tiles.
+        :param decomposition: See decompose_collision_map.
+        :param use_cache: See decompose_collision_map.
+        """
+
+        start_x, start_y = chunk[0] * chunk_size, chunk[1] * chunk_size
+        chunk_map = collision_map[start_y:start_y + chunk_size, start_x:start_x + chunk_size]
+
+        if not chunk_map.any():
+            return []
+
+        # A border of empty tiles keeps the chunk edges, decompose_collision_map ignores the edges of a map
+        polygons = cls.decompose_collision_map(numpy.pad(chunk_map, 1), tile_size, decomposition, use_cache)
+
+        offset_x, offset_y = (start_x - 1) * tile_size, (start_y - 1) * tile_size
+        return [[(x + offset_x, y + offset_y) for x, y in polygon] for polygon in polygons]
+
+    @staticmethod
+    def _decompose_collision_map_into_rectangles(collision_map: numpy.ndarray,
+                                                 tile_size: int) -> list[list[tuple]]:
+        """
+        Greedily merge the collidable tiles into boxes, in row-major order.
+
+        Every box starts on the first tile not covered yet, is extended to the right as far as possible,
+        then downward while the whole row below is collidable and not covered.
+        """
+
+        remaining = collision_map.copy()
+        height = remaining.shape[0]
+        rectangles = []
+
+        for y, x in zip(*numpy.nonzero(collision_map)):
+            if not remaining[y, x]:
+                continue
+
+            row = remaining[y, x:]
+            end_x = x + (int(numpy.argmin(row)) if not row.all() else len(row))
+
+            end_y = y + 1
+            while end_y < height and remaining[end_y, x:end_x].all():
+                end_y += 1
+
+            remaining[y:end_y, x:end_x] = False
+
+            left, top, right, bottom = x * tile_size, y * tile_size, end_x * tile_size, end_y * tile_size
+            rectangles.append([(left, top), (right, top), (right, bottom), (left, bottom)])
+
+        return rectangles
 
     @staticmethod
-    def _decompose_collision_map_into_polygons(collision_map: list[list[bool]],
+    def _decompose_collision_map_into_polygons(collision_map: numpy.ndarray,
                                                tile_size: int) -> list[list[tuple]]:
         """Edges must be not collidable! It's cause by pymunk.autogeometry.march_hard and march_soft functions."""
 
+        height, width = collision_map.shape
+        samples = collision_map.tolist()  # plain lists are much faster to index from the sampling callback
+
         def sample_function(point):
-            return collision_map[round(point[1])][round(point[0])]
+            return samples[round(point[1])][round(point[0])]
 
-        bounding_box = pymunk.BB(len(collision_map[0])-1, len(collision_map)-1)
+        bounding_box = pymunk.BB(width-1, height-1)
 
         raw_polyset = pymunk.autogeometry.march_hard(bounding_box,
-                                                     len(collision_map[0]),
-                                                     len(collision_map),
+                                                     width,
+                                                     height,
                                                      0,
                                                      sample_function)
 
@@ -1,12 +1,12 @@
 import typing
 
-import pygame.mouse
+import pygame
 
 from isec.app import Resource
 from isec.environment import Entity, EntityScene
 from isec.environment.base import Sprite, Pos
 from isec.environment.position import SimplePos
-from isec.instance import BaseInstance
+from isec.instance import BaseInstance, InputHandler
 
 
 class Button(Entity):
@@ -52,7 +52,7 @@ class Button(Entity):
     def _check_if_mouse_over(self) -> bool:
         sprite_effective_rect = pygame.Rect(0, 0, *self.sprite.rect.size)
         sprite_effective_rect.center = self.position.position
-        mouse_pos_in_scene = self.linked_scene.camera.get_coordinates_from_screen(pygame.mouse.get_pos())
+        mouse_pos_in_scene = self.linked_scene.camera.get_coordinates_from_screen(InputHandler.get_mouse_pos())
 
         return sprite_effective_rect.collidepoint(mouse_pos_in_scene)
 
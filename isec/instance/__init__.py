@@ -1,5 +1,6 @@
 from isec.instance.handlers import LoopHandler
+from isec.instance.handlers import InputHandler
 from isec.instance.handlers import EventHandler
 from isec.instance.base_instance import BaseInstance
 
-__all__ = [LoopHandler, EventHandler, BaseInstance]
+__all__ = [LoopHandler, InputHandler, EventHandler, BaseInstance]
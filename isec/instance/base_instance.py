@@ -3,7 +3,7 @@ import asyncio
 
 import isec.app
 from isec.app.resource import Resource
-from isec.instance.handlers import LoopHandler, EventHandler
+from isec.instance.handlers import LoopHandler, InputHandler, EventHandler
 
 
 class BaseInstance:
@@ -21,7 +21,7 @@ class BaseInstance:
 
     async def _preloop(self):
         pygame.display.flip()
-        LoopHandler.limit_and_get_delta(self.fps)
+        LoopHandler.delta = InputHandler.new_frame(LoopHandler.limit_and_get_delta(self.fps))
         await self.event_handler.handle_events()
 
     async def setup(self):
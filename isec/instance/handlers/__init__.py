@@ -1,4 +1,5 @@
 from isec.instance.handlers.loop_handler import LoopHandler
+from isec.instance.handlers.input_handler import InputHandler
 from isec.instance.handlers.event_handler import EventHandler
 
-__all__ = [EventHandler, LoopHandler]
+__all__ = [EventHandler, InputHandler, LoopHandler]
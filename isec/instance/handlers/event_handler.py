@@ -1,6 +1,8 @@
 import pygame
 import typing
 
+from isec.instance.handlers.input_handler import InputHandler
+
 
 class EventHandler:
     def __init__(self) -> None:
@@ -141,9 +143,9 @@ class EventHandler:
         self._quit_callbacks.append(callback)
 
     async def handle_events(self) -> None:
-        """Handles all events."""
-        self.events = pygame.event.get()
-        self.mouse_rel = pygame.mouse.get_rel()
+        """Handles all events of the current frame of InputHandler."""
+        self.events = InputHandler.get_events()
+        self.mouse_rel = InputHandler.get_mouse_rel()
 
         for event in self.events:
             if event.type == pygame.QUIT:
@@ -169,8 +171,8 @@ class EventHandler:
             if event.type == pygame.MOUSEMOTION:
                 await self._mouse_move()
 
-        key_pressed = pygame.key.get_pressed()
-        button_pressed = pygame.mouse.get_pressed(5)
+        key_pressed = InputHandler.get_pressed_keys()
+        button_pressed = InputHandler.get_mouse_pressed()
 
         for key in self._keypressed_callbacks:
             if key_pressed[key]:
@@ -0,0 +1,252 @@
+import atexit
+import struct
+import typing
+import pygame
+
+
+class InputFrame:
+    __slots__ = ["delta", "events", "pressed_keys", "mouse_position", "mouse_rel", "mouse_buttons"]
+
+    def __init__(self,
+                 delta: float = 0,
+                 events: list[pygame.event.Event] = None,
+                 pressed_keys: typing.Sequence[bool] = None,
+                 mouse_position: tuple[int, int] = (0, 0),
+                 mouse_rel: tuple[int, int] = (0, 0),
+                 mouse_buttons: tuple[bool, ...] = (False,) * 5) -> None:
+
+        self.delta = delta
+        self.events = events if events is not None else []
+        self.pressed_keys = pressed_keys if pressed_keys is not None else pygame.key.ScancodeWrapper((False,) * 512)
+        self.mouse_position = mouse_position
+        self.mouse_rel = mouse_rel
+        self.mouse_buttons = mouse_buttons
+
+
+class InputHandler:
+    """
+    The user inputs of the current frame: events, pressed keys, mouse position and buttons, and the frame delta.
+
+    They are read once per frame by new_frame, and every reader of the frame (EventHandler, the entities following the
+    cursor, ...) gets the same values. In "record" mode they are also written to a binary log, in "replay" mode they
+    are read back from it instead of pygame, so a session can be played again identically, e.g. under a profiler. The
+    live events are still pumped during a replay, but only closing the window or pressing escape reaches the game, as a
+    QUIT event ending the replay.
+
+    The log starts with a header (magic, version, random seed), then has one record per frame: the delta, the mouse
+    state, the scancodes of the pressed keys and the events handled by EventHandler.
+    """
+
+    MODES = ("live", "record", "replay")
+    MAGIC = b"ISEI"
+    VERSION = 1
+
+    _HEADER = struct.Struct("<4sHq")  # magic, version, seed
+    _FRAME = struct.Struct("<dhhhhBBH")  # delta, mouse x y, mouse rel x y, buttons, pressed keys, events
+    _EVENT_TYPE = struct.Struct("<B")
+    _KEY_EVENT = struct.Struct("<iH")  # key, mod
+    _BUTTON_EVENT = struct.Struct("<Bhh")  # button, x, y
+    _MOTION_EVENT = struct.Struct("<hhhh")  # x, y, rel x, rel y
+
+    # The recorded event types, by code in the log
+    _EVENT_CODES = {pygame.QUIT: 0,
+                    pygame.KEYDOWN: 1,
+                    pygame.KEYUP: 2,
+                    pygame.MOUSEBUTTONDOWN: 3,
+                    pygame.MOUSEBUTTONUP: 4,
+                    pygame.MOUSEMOTION: 5}
+    _EVENT_TYPES = {code: event_type for event_type, code in _EVENT_CODES.items()}
+
+    mode: str = "live"
+    seed: int = 0
+    frame: InputFrame = InputFrame()
+    frame_count: int = 0
+
+    _file: typing.BinaryIO | None = None
+
+    @classmethod
+    def start_recording(cls,
+                        path: str,
+                        seed: int = 0) -> None:
+        """
+        Record the inputs of every next frame to a log.
+
+        :param seed: The seed of random for the session, stored in the log for the replay.
+        """
+
+        cls.stop()
+
+        cls._file = open(path, "wb")
+        cls._file.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, seed))
+        atexit.register(cls.stop)
+
+        cls.mode = "record"
+        cls.seed = seed
+        cls.frame_count = 0
+
+    @classmethod
+    def start_replay(cls,
+                     path: str) -> int:
+        """
+        Read the inputs of every next frame from a log, instead of pygame. When the log ends, a QUIT event is sent.
+
+        :return: The seed of random stored in the log.
+        """
+
+        cls.stop()
+
+        cls._file = open(path, "rb")
+        magic, version, seed = cls._HEADER.unpack(cls._read(cls._HEADER.size))
+        if magic != cls.MAGIC or version != cls.VERSION:
+            cls.stop()
+            raise ValueError(f"{path} is not an input log of version {cls.VERSION}.")
+
+        cls.mode = "replay"
+        cls.seed = seed
+        cls.frame_count = 0
+
+        return seed
+
+    @classmethod
+    def stop(cls) -> None:
+        """Close the log, and read the inputs from pygame again."""
+
+        if cls._file is not None:
+            cls._file.close()
+            cls._file = None
+
+        cls.mode = "live"
+
+    @classmethod
+    def new_frame(cls,
+                  delta: float) -> float:
+        """
+        Read the inputs of a new frame. In replay mode, the live events are read too, and only a QUIT event is kept.
+
+        :param delta: The measured duration of the frame.
+        :return: The duration of the frame to simulate, the recorded one in replay mode.
+        """
+
+        if cls.mode == "replay":
+            cls.frame = cls._read_frame()
+
+            # Keep the window responsive, and let the user stop the replay
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    cls.frame.events.append(pygame.event.Event(pygame.QUIT))
+                    break
+
+        else:
+            cls.frame = InputFrame(delta,
+                                   pygame.event.get(),
+                                   pygame.key.get_pressed(),
+                                   pygame.mouse.get_pos(),
+                                   pygame.mouse.get_rel(),
+                                   pygame.mouse.get_pressed(5))
+
+            if cls.mode == "record":
+                cls._write_frame(cls.frame)
+
+        cls.frame_count += 1
+        return cls.frame.delta
+
+    @classmethod
+    def get_events(cls) -> list[pygame.event.Event]:
+        return cls.frame.events
+
+    @classmethod
+    def get_pressed_keys(cls) -> typing.Sequence[bool]:
+        """The pressed keys, indexed by key like pygame.key.get_pressed."""
+
+        return cls.frame.pressed_keys
+
+    @classmethod
+    def get_mouse_pos(cls) -> tuple[int, int]:
+        return cls.frame.mouse_position
+
+    @classmethod
+    def get_mouse_rel(cls) -> tuple[int, int]:
+        return cls.frame.mouse_rel
+
+    @classmethod
+    def get_mouse_pressed(cls) -> tuple[bool, ...]:
+        """The state of the 5 mouse buttons, like pygame.mouse.get_pressed(5)."""
+
+        return cls.frame.mouse_buttons
+
+    @classmethod
+    def _write_frame(cls,
+                     frame: InputFrame) -> None:
+
+        # ScancodeWrapper forbids the iteration over its keys, not over its tuple of scancodes
+        scancodes = [scancode for scancode, pressed in enumerate(tuple.__iter__(frame.pressed_keys)) if pressed]
+        events = [event for event in frame.events if event.type in cls._EVENT_CODES]
+        buttons = sum(1 << i for i, pressed in enumerate(frame.mouse_buttons) if pressed)
+
+        data = [cls._FRAME.pack(frame.delta, *frame.mouse_position, *frame.mouse_rel, buttons, len(scancodes),
+                                len(events)),
+                struct.pack(f"<{len(scancodes)}H", *scancodes)]
+
+        for event in events:
+            data.append(cls._EVENT_TYPE.pack(cls._EVENT_CODES[event.type]))
+
+            if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                data.append(cls._KEY_EVENT.pack(event.key, event.mod))
+
+            elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                data.append(cls._BUTTON_EVENT.pack(event.button, *event.pos))
+
+            elif event.type == pygame.MOUSEMOTION:
+                data.append(cls._MOTION_EVENT.pack(*event.pos, *event.rel))
+
+        cls._file.write(b"".join(data))
+
+    @classmethod
+    def _read_frame(cls) -> InputFrame:
+        frame_data = cls._file.read(cls._FRAME.size) if cls._file is not None else b""
+        if len(frame_data) < cls._FRAME.size:
+            # The end of the log, the session is over
+            return InputFrame(events=[pygame.event.Event(pygame.QUIT)])
+
+        delta, x, y, rel_x, rel_y, buttons, scancode_count, event_count = cls._FRAME.unpack(frame_data)
+
+        pressed_keys = [False] * 512
+        for scancode in struct.unpack(f"<{scancode_count}H", cls._read(2 * scancode_count)):
+            pressed_keys[scancode] = True
+
+        events = []
+        for _ in range(event_count):
+            event_type = cls._EVENT_TYPES[cls._EVENT_TYPE.unpack(cls._read(cls._EVENT_TYPE.size))[0]]
+
+            if event_type in (pygame.KEYDOWN, pygame.KEYUP):
+                key, mod = cls._KEY_EVENT.unpack(cls._read(cls._KEY_EVENT.size))
+                events.append(pygame.event.Event(event_type, key=key, mod=mod))
+
+            elif event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                button, event_x, event_y = cls._BUTTON_EVENT.unpack(cls._read(cls._BUTTON_EVENT.size))
+                events.append(pygame.event.Event(event_type, button=button, pos=(event_x, event_y)))
+
+            elif event_type == pygame.MOUSEMOTION:
+                event_x, event_y, event_rel_x, event_rel_y = cls._MOTION_EVENT.unpack(
+                    cls._read(cls._MOTION_EVENT.size))
+                events.append(pygame.event.Event(event_type, pos=(event_x, event_y), rel=(event_rel_x, event_rel_y)))
+
+            else:
+                events.append(pygame.event.Event(event_type))
+
+        return InputFrame(delta,
+                          events,
+                          pygame.key.ScancodeWrapper(pressed_keys),
+                          (x, y),
+                          (rel_x, rel_y),
+                          tuple(bool(buttons & 1 << i) for i in range(5)))
+
+    @classmethod
+    def _read(cls,
+              size: int) -> bytes:
+
+        data = cls._file.read(size)
+        if len(data) < size:
+            raise ValueError("The input log is truncated.")
+
+        return data
@@ -7,6 +7,7 @@ from isec._ise_error import InvalidInstanceError
 class LoopHandler:
     stack: list = []
     delta: float = 0
+    limit_fps: bool = True
 
     _clock: pygame.time.Clock = pygame.time.Clock()
 
@@ -25,7 +26,7 @@ class LoopHandler:
     def limit_and_get_delta(cls,
                             fps: int):
 
-        cls.delta = cls._clock.tick(fps) / 1000
+        cls.delta = cls._clock.tick(fps if cls.limit_fps else 0) / 1000
         return cls.delta
 
     @classmethod
@@ -1,5 +1,11 @@
-from isec.objects.cached_surface import CachedSurface
-from isec.objects.raycaster import cast_ray
+from isec.objects.cached_surface import CachedSurface, RotationCache
+from isec.objects.rotation_atlas import RotationAtlas
+from isec.objects.polygon_cache import PolygonCache
+from isec.objects.raycaster import cast_ray, cast_rays, cast_ray_layers
+from isec.objects.collision_grid import CollisionGrid
+from isec.objects.a_star import astar, jump_point_search
+from isec.objects.hierarchical_pathfinder import HierarchicalPathfinder
 
 
-__all__ = ["CachedSurface", "cast_ray"]
+__all__ = ["CachedSurface", "RotationCache", "RotationAtlas", "PolygonCache", "CollisionGrid", "HierarchicalPathfinder",
+           "cast_ray", "cast_rays", "cast_ray_layers", "astar", "jump_point_search"]
@@ -1,119 +1,400 @@
-class Node:
-    """A node class for A* Pathfinding"""
-
-    def __init__(self, parent=None, position=None):
-        self.parent = parent
-        self.position = position
-
-        self.g = 0
-        self.h = 0
-        self.f = 0
-
-    def __eq__(self, other):
-        return self.position == other.position
-
-
-def astar(maze, start, end):
-    """Returns a list of tuples as a path from the given start to the given end in the given maze"""
-
-    # Create start and end node
-    start_node = Node(None, start)
-    start_node.g = start_node.h = start_node.f = 0
-    end_node = Node(None, end)
-    end_node.g = end_node.h = end_node.f = 0
-
-    # Initialize both open and closed list
-    open_list = []
-    closed_list = []
-
-    # Add the start node
-    open_list.append(start_node)
-
-    # Loop until you find the end
-    while len(open_list) > 0:
-
-        # Get the current node
-        current_node = open_list[0]
-        current_index = 0
-        for index, item in enumerate(open_list):
-            if item.f < current_node.f:
-                current_node = item
-                current_index = index
-
-        # Pop current off open list, add to closed list
-        open_list.pop(current_index)
-        closed_list.append(current_node)
-
-        # Found the goal
-        if current_node == end_node:
-            path = []
-            current = current_node
-            while current is not None:
-                path.append(current.position)
-                current = current.parent
-            return path[::-1]  # Return reversed path
-
-        # Generate children
-        children = []
-        for new_position in [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1)]:  # Adjacent squares
-
-            # Get node position
-            node_position = (current_node.position[0] + new_position[0], current_node.position[1] + new_position[1])
-
-            # Make sure within range
-            if node_position[0] > (len(maze) - 1) or node_position[0] < 0 or node_position[1] > (len(maze[len(maze)-1]) - 1) or node_position[1] < 0:
+import heapq
+import math
+import numpy
+
+
+SQRT_2 = math.sqrt(2)
+CORNER_CUTTING_POLICIES = ("always", "one_free", "never")
+
+
+def astar(maze: numpy.ndarray | list[list[int]],
+          start: tuple[int, int],
+          end: tuple[int, int],
+          diagonal: bool = True,
+          corner_cutting: str = "always",
+          stats: dict[str, int] | None = None) -> list[tuple[int, int]] | None:
+    """
+    Return the shortest path from start to end in a maze, as a list of (row, column) positions, or None if there is
+    no path.
+
+    Orthogonal moves cost 1 and diagonal moves cost sqrt(2). The search uses a binary heap as open set, a flat array as
+    closed set, a dict as g-score table and the octile distance as heuristic (the manhattan distance without diagonal
+    moves), so the path is always a shortest one. The start tile doesn't need to be walkable.
+
+    :param maze: A grid of tiles, indexed by row then column, 0 for walkable tiles and anything else for walls, e.g. a
+        collision map. A list of lists or a numpy array.
+    :param start: The (row, column) position of the start.
+    :param end: The (row, column) position of the end.
+    :param diagonal: If the diagonal moves are allowed.
+    :param corner_cutting: When a diagonal move passing next to walls is allowed. With "always" it is always allowed,
+        with "one_free" one of the two tiles it passes next to must be walkable, with "never" both must be.
+    :param stats: A dict filled with the number of "expanded" tiles, and of tiles pushed in the open set ("pushed").
+    """
+
+    if corner_cutting not in CORNER_CUTTING_POLICIES:
+        err_msg = f"Invalid corner cutting policy {corner_cutting!r}, expected one of {CORNER_CUTTING_POLICIES}."
+        raise ValueError(err_msg)
+
+    walls, padded_width, start_index, end_index = _flatten_maze(maze, start, end)
+    end_row, end_column = divmod(end_index, padded_width)
+
+    if walls[end_index]:
+        _set_stats(stats, 0, 0)
+        return None
+
+    # (index offset, cost, index offsets of the two tiles a diagonal move passes next to)
+    moves = [(-padded_width, 1.0, 0, 0), (padded_width, 1.0, 0, 0), (-1, 1.0, 0, 0), (1, 1.0, 0, 0)]
+    if diagonal:
+        moves += [(row_offset + column_offset, SQRT_2, row_offset, column_offset)
+                  for row_offset in (-padded_width, padded_width)
+                  for column_offset in (-1, 1)]
+
+    diagonal_factor = SQRT_2 - 2 if diagonal else 0
+    check_corners = diagonal and corner_cutting != "always"
+    both_free = corner_cutting == "never"
+
+    g_scores = {start_index: 0.0}
+    parents = {start_index: -1}
+    closed = bytearray(len(walls))
+
+    open_heap = [(0.0, 0.0, start_index)]
+    expanded = pushed = 0
+
+    while open_heap:
+        _, _, current = heapq.heappop(open_heap)
+
+        if current == end_index:
+            _set_stats(stats, expanded, pushed)
+            return _get_path(parents, current, padded_width)
+
+        if closed[current]:
+            continue
+        closed[current] = 1
+        expanded += 1
+
+        current_g = g_scores[current]
+
+        for offset, cost, row_offset, column_offset in moves:
+            neighbour = current + offset
+
+            if walls[neighbour] or closed[neighbour]:
                 continue
 
-            # Make sure walkable terrain
-            if maze[node_position[0]][node_position[1]] != 0:
+            if check_corners and row_offset:
+                if both_free:
+                    if walls[current + row_offset] or walls[current + column_offset]:
+                        continue
+
+                elif walls[current + row_offset] and walls[current + column_offset]:
+                    continue
+
+            g = current_g + cost
+            if neighbour in g_scores and g >= g_scores[neighbour]:
                 continue
 
-            # Create new node
-            new_node = Node(current_node, node_position)
+            g_scores[neighbour] = g
+            parents[neighbour] = current
 
-            # Append
-            children.append(new_node)
+            row, column = divmod(neighbour, padded_width)
+            row_distance = abs(row - end_row)
+            column_distance = abs(column - end_column)
+            h = row_distance + column_distance + diagonal_factor * min(row_distance, column_distance)
 
-        # Loop through children
-        for child in children:
+            heapq.heappush(open_heap, (g + h, h, neighbour))
+            pushed += 1
 
-            # Child is on the closed list
-            for closed_child in closed_list:
-                if child == closed_child:
-                    continue
+    _set_stats(stats, expanded, pushed)
+    return None
 
-            # Create the f, g, and h values
-            child.g = current_node.g + 1
-            child.h = ((child.position[0] - end_node.position[0]) ** 2) + ((child.position[1] - end_node.position[1]) ** 2)
-            child.f = child.g + child.h
 
-            # Child is already in the open list
-            for open_node in open_list:
-                if child == open_node and child.g > open_node.g:
-                    continue
+def jump_point_search(maze: numpy.ndarray | list[list[int]],
+                      start: tuple[int, int],
+                      end: tuple[int, int],
+                      stats: dict[str, int] | None = None) -> list[tuple[int, int]] | None:
+    """
+    Return the shortest path from start to end in a maze with Jump Point Search, or None if there is no path.
+
+    It takes the same maze and returns the same kind of path as astar with diagonal moves and the "never" corner
+    cutting policy, the path has the same cost but can differ between paths of equal cost. Instead of pushing every
+    neighbour in the open set, it jumps in straight lines and diagonals until a tile where the shortest paths can turn,
+    so far fewer tiles are expanded on open maps.
+
+    :param stats: A dict filled with the number of "expanded" tiles, and of tiles pushed in the open set ("pushed").
+    """
+
+    walls, padded_width, start_index, end_index = _flatten_maze(maze, start, end)
+    end_row, end_column = divmod(end_index, padded_width)
+
+    if walls[end_index]:
+        _set_stats(stats, 0, 0)
+        return None
+
+    jump_grid = _JumpGrid(walls, padded_width, end_index)
+
+    g_scores = {start_index: 0.0}
+    parents = {start_index: -1}
+    closed = bytearray(len(walls))
+
+    open_heap = [(0.0, 0.0, start_index)]
+    expanded = pushed = 0
+
+    while open_heap:
+        _, _, current = heapq.heappop(open_heap)
+
+        if current == end_index:
+            _set_stats(stats, expanded, pushed)
+            return _fill_path(_get_path(parents, current, padded_width))
+
+        if closed[current]:
+            continue
+        closed[current] = 1
+        expanded += 1
+
+        current_g = g_scores[current]
+        current_row, current_column = divmod(current, padded_width)
+
+        for row_step, column_step in _get_jump_directions(walls, current, parents[current], padded_width):
+            if row_step and column_step:
+                jump_point = jump_grid.jump_diagonally(current, row_step, column_step)
+            else:
+                jump_point = jump_grid.jump_straight(current, row_step or column_step)
+
+            if jump_point == -1 or closed[jump_point]:
+                continue
+
+            row, column = divmod(jump_point, padded_width)
+            row_distance = abs(row - current_row)
+            column_distance = abs(column - current_column)
+
+            g = current_g + row_distance + column_distance + (SQRT_2 - 2) * min(row_distance, column_distance)
+            if jump_point in g_scores and g >= g_scores[jump_point]:
+                continue
+
+            g_scores[jump_point] = g
+            parents[jump_point] = current
+
+            row_distance = abs(row - end_row)
+            column_distance = abs(column - end_column)
+            h = row_distance + column_distance + (SQRT_2 - 2) * min(row_distance, column_distance)
+
+            heapq.heappush(open_heap, (g + h, h, jump_point))
+            pushed += 1
+
+    _set_stats(stats, expanded, pushed)
+    return None
+
+
+def _flatten_maze(maze: numpy.ndarray | list[list[int]],
+                  start: tuple[int, int],
+                  end: tuple[int, int]) -> tuple[bytes, int, int, int]:
+    """
+    Return the walls of a maze as a flat bytes object with a border of walls, so the neighbours never need a bounds
+    check, its width, and the indexes of the start and of the end.
+    """
+
+    blocked = numpy.asarray(maze) != 0
+    if blocked.ndim != 2:
+        raise ValueError("The maze must be a 2D grid.")
+
+    height, width = blocked.shape
+    for position in (start, end):
+        if not (0 <= position[0] < height and 0 <= position[1] < width):
+            raise ValueError(f"Position {position} is outside of the maze.")
+
+    padded_width = width + 2
+    walls = numpy.pad(blocked, 1, constant_values=True).tobytes()
+
+    start_index = (int(start[0]) + 1) * padded_width + int(start[1]) + 1
+    end_index = (int(end[0]) + 1) * padded_width + int(end[1]) + 1
+
+    return walls, padded_width, start_index, end_index
+
+
+def _get_path(parents: dict[int, int],
+              index: int,
+              padded_width: int) -> list[tuple[int, int]]:
+
+    path = []
+    while index != -1:
+        row, column = divmod(index, padded_width)
+        path.append((row - 1, column - 1))
+        index = parents[index]
+
+    return path[::-1]
+
+
+def _fill_path(jump_points: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Add the tiles between the jump points, they are always on a straight line or a diagonal."""
+
+    path = jump_points[:1]
+
+    for row, column in jump_points[1:]:
+        last_row, last_column = path[-1]
+        row_step = (row > last_row) - (row < last_row)
+        column_step = (column > last_column) - (column < last_column)
+
+        while last_row != row or last_column != column:
+            last_row += row_step
+            last_column += column_step
+            path.append((last_row, last_column))
+
+    return path
+
+
+def _set_stats(stats: dict[str, int] | None,
+               expanded: int,
+               pushed: int) -> None:
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["pushed"] = pushed
+
+
+def _get_jump_directions(walls: bytes,
+                         index: int,
+                         parent: int,
+                         padded_width: int) -> list[tuple[int, int]]:
+    """
+    Return the directions to jump to from a tile, as (row step, column step) index offsets. Only the directions a
+    shortest path coming from the parent can take are kept.
+    """
+
+    if parent == -1:
+        directions = [(row_step, column_step)
+                      for row_step in (-padded_width, 0, padded_width)
+                      for column_step in (-1, 0, 1)
+                      if (row_step or column_step)
+                      and not (row_step and column_step and (walls[index + row_step] or walls[index + column_step]))]
+        return directions
+
+    row, column = divmod(index, padded_width)
+    parent_row, parent_column = divmod(parent, padded_width)
+    row_step = ((row > parent_row) - (row < parent_row)) * padded_width
+    column_step = (column > parent_column) - (column < parent_column)
+
+    directions = []
+
+    if row_step and column_step:
+        row_free = not walls[index + row_step]
+        column_free = not walls[index + column_step]
+
+        if row_free:
+            directions.append((row_step, 0))
+        if column_free:
+            directions.append((0, column_step))
+        if row_free and column_free:
+            directions.append((row_step, column_step))
+
+        return directions
+
+    # The two sides of a straight move
+    side_step = 1 if row_step else padded_width
+    forward_free = not walls[index + row_step + column_step]
+
+    for side in (side_step, -side_step):
+        if walls[index + side]:
+            continue
+
+        if forward_free:
+            directions.append((row_step, column_step + side) if row_step else (side, column_step))
+        directions.append((0, side) if row_step else (side, 0))
+
+    if forward_free:
+        directions.append((row_step, column_step))
+
+    return directions
+
+
+class _JumpGrid:
+    """
+    The jumps of Jump Point Search in a flattened maze.
+
+    For every straight direction, a map of the tiles where a jump stops (walls and tiles with a forced neighbour) is
+    built with numpy, so a straight jump is a single bytes.find. The vertical maps are stored column by column.
+    """
+
+    def __init__(self,
+                 walls: bytes,
+                 padded_width: int,
+                 end_index: int) -> None:
+
+        self.walls = walls
+        self.padded_width = padded_width
+        self.padded_height = len(walls) // padded_width
+        self.end_index = end_index
+        self.end_row, self.end_column = divmod(end_index, padded_width)
+
+        blocked = numpy.frombuffer(walls, dtype=bool).reshape(self.padded_height, padded_width)
+        free = ~blocked
+
+        # A tile beside the jump, hidden by a wall from the previous tile, is a forced neighbour
+        right, left, down, up = (blocked.copy() for _ in range(4))
+        right[1:-1, 1:-1] |= ((free[2:, 1:-1] & blocked[2:, :-2]) | (free[:-2, 1:-1] & blocked[:-2, :-2]))
+        left[1:-1, 1:-1] |= ((free[2:, 1:-1] & blocked[2:, 2:]) | (free[:-2, 1:-1] & blocked[:-2, 2:]))
+        down[1:-1, 1:-1] |= ((free[1:-1, 2:] & blocked[:-2, 2:]) | (free[1:-1, :-2] & blocked[:-2, :-2]))
+        up[1:-1, 1:-1] |= ((free[1:-1, 2:] & blocked[2:, 2:]) | (free[1:-1, :-2] & blocked[2:, :-2]))
+
+        self.right_stops = right.tobytes()
+        self.left_stops = left.tobytes()
+        self.down_stops = down.T.tobytes()
+        self.up_stops = up.T.tobytes()
+
+    def jump_straight(self,
+                      index: int,
+                      step: int) -> int:
+        """Return the next jump point in a straight direction, or -1 if a wall is reached first."""
+
+        end_index = self.end_index
+
+        if step == 1 or step == -1:
+            if step == 1:
+                stop = self.right_stops.find(1, index + 1)
+                reaches_end = index < end_index <= stop
+            else:
+                stop = self.left_stops.rfind(1, 0, index)
+                reaches_end = stop <= end_index < index
+
+            if reaches_end and end_index // self.padded_width == index // self.padded_width:
+                return end_index
+
+        else:
+            row, column = divmod(index, self.padded_width)
+            transposed_index = column * self.padded_height + row
+            transposed_end_index = self.end_column * self.padded_height + self.end_row
+
+            if step > 0:
+                transposed_stop = self.down_stops.find(1, transposed_index + 1)
+                reaches_end = transposed_index < transposed_end_index <= transposed_stop
+            else:
+                transposed_stop = self.up_stops.rfind(1, 0, transposed_index)
+                reaches_end = transposed_stop <= transposed_end_index < transposed_index
+
+            if reaches_end and self.end_column == column:
+                return end_index
+
+            stop = (transposed_stop - column * self.padded_height) * self.padded_width + column
+
+        return -1 if self.walls[stop] else stop
 
-            # Add the child to the open list
-            open_list.append(child)
+    def jump_diagonally(self,
+                        index: int,
+                        row_step: int,
+                        column_step: int) -> int:
+        """Return the next jump point in a diagonal direction, or -1 if a wall is reached first."""
 
+        walls = self.walls
 
-def main():
-    maze = [[0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]]
+        while True:
+            index += row_step + column_step
 
-    start = (0, 0)
-    end = (7, 6)
+            if walls[index]:
+                return -1
 
-    path = astar(maze, start, end)
-    print(path)
+            if index == self.end_index:
+                return index
 
+            if self.jump_straight(index, column_step) != -1 or self.jump_straight(index, row_step) != -1:
+                return index
 
-if __name__ == '__main__':
-    main()
+            if walls[index + row_step] or walls[index + column_step]:
+                return -1
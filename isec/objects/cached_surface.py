@@ -1,10 +1,204 @@
+import collections
+import hashlib
+import weakref
 import pygame
 
+from isec.objects.rotation_atlas import RotationAtlas, RotationAtlasFrames
+
+
+class RotationSet:
+    __slots__ = ["base_surface", "caching_size", "caching_step", "slots", "key", "_atlas_checked", "_atlas_frames",
+                 "__weakref__"]
+
+    def __init__(self,
+                 base_surface: pygame.Surface,
+                 caching_size: int,
+                 key: tuple = None) -> None:
+        """
+        The rotated versions of a surface, computed (or mapped from the rotation atlas) the first time each angle is
+        requested.
+
+        :param base_surface: The surface to rotate.
+        :param caching_size: The number of angles in a full turn.
+        :param key: The key of the set in the RotationCache, used to find its atlas on disk.
+        """
+
+        self.base_surface = base_surface
+        self.caching_size = caching_size
+        self.caching_step = 360 / caching_size
+        self.slots: list[pygame.Surface | None] = [None] * caching_size
+        self.key = key
+
+        # The atlas is looked for once, at the first angle missing
+        self._atlas_checked = False
+        self._atlas_frames: RotationAtlasFrames | None = None
+
+    def get(self,
+            index: int) -> pygame.Surface:
+
+        surface = self.slots[index]
+
+        if surface is None:
+            surface = self._get_atlas_frame(index)
+            if surface is None:
+                surface = pygame.transform.rotate(self.base_surface, index * self.caching_step)
+
+            self.slots[index] = surface
+            RotationCache.add(self, index, surface)
+
+        elif RotationCache.memory_limit is not None:
+            RotationCache.touch(self, index)
+
+        return surface
+
+    def fill(self) -> None:
+        """
+        Compute every angle now.
+
+        If the rotation atlas is enabled, the angles are taken from disk when possible (get does it too), or stored on
+        disk after being computed.
+        """
+
+        if self.loaded_count == self.caching_size:
+            return
+
+        for index in range(self.caching_size):
+            self.get(index)
+
+        if self._atlas_frames is None and self._is_atlas_compatible() and None not in self.slots:
+            RotationAtlas.save(self.key, self.slots)
+
+    def _is_atlas_compatible(self) -> bool:
+        # Only surfaces with per pixel alpha are stored on disk, colorkeys would be lost in the raw pixels
+        return (RotationAtlas.is_enabled()
+                and self.key is not None
+                and bool(self.base_surface.get_flags() & pygame.SRCALPHA))
+
+    def _get_atlas_frame(self,
+                         index: int) -> pygame.Surface | None:
+
+        if not self._atlas_checked:
+            self._atlas_checked = True
+
+            if self._is_atlas_compatible():
+                frames = RotationAtlas.load(self.key)
+                if frames is not None and len(frames) == self.caching_size:
+                    self._atlas_frames = frames
+
+        if self._atlas_frames is None:
+            return None
+
+        return self._atlas_frames[index]
+
+    def evict(self,
+              index: int) -> None:
+
+        self.slots[index] = None
+
+    @property
+    def loaded_count(self) -> int:
+        return sum(surface is not None for surface in self.slots)
+
+
+class RotationCache:
+    """
+    Registry of the rotation sets, shared between CachedSurface with identical pixels and caching size.
+
+    If memory_limit (in bytes) is set, the least recently used angles of every rotation set are dropped when the
+    rotated surfaces exceed it, and computed again the next time they are needed.
+    """
+
+    memory_limit: int | None = None
+    memory_usage: int = 0
+
+    _rotation_sets: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+    _usage: collections.OrderedDict = collections.OrderedDict()
+
+    @classmethod
+    def get_rotation_set(cls,
+                         base_surface: pygame.Surface,
+                         caching_size: int) -> RotationSet:
+
+        key = cls._get_key(base_surface, caching_size)
+
+        rotation_set = cls._rotation_sets.get(key)
+        if rotation_set is None:
+            rotation_set = RotationSet(base_surface, caching_size, key)
+            cls._rotation_sets[key] = rotation_set
+            weakref.finalize(rotation_set, cls._forget_dead_rotation_sets)
+
+        return rotation_set
+
+    @classmethod
+    def set_memory_limit(cls,
+                         memory_limit: int | None) -> None:
+
+        cls.memory_limit = memory_limit
+        cls._evict()
+
+    @classmethod
+    def add(cls,
+            rotation_set: RotationSet,
+            index: int,
+            surface: pygame.Surface) -> None:
+
+        size = surface.get_bytesize() * surface.get_width() * surface.get_height()
+        cls._usage[(weakref.ref(rotation_set), index)] = size
+        cls.memory_usage += size
+        cls._evict()
+
+    @classmethod
+    def touch(cls,
+              rotation_set: RotationSet,
+              index: int) -> None:
+
+        key = (weakref.ref(rotation_set), index)
+        if key in cls._usage:
+            cls._usage.move_to_end(key)
+
+    @classmethod
+    def _evict(cls) -> None:
+        if cls.memory_limit is None:
+            return
+
+        # The most recent surface is never evicted, it is the one being returned
+        while cls.memory_usage > cls.memory_limit and len(cls._usage) > 1:
+            (rotation_set_ref, index), size = cls._usage.popitem(last=False)
+            cls.memory_usage -= size
+
+            rotation_set = rotation_set_ref()
+            if rotation_set is not None:
+                rotation_set.evict(index)
+
+    @classmethod
+    def _forget_dead_rotation_sets(cls) -> None:
+        for key in [key for key in cls._usage if key[0]() is None]:
+            cls.memory_usage -= cls._usage.pop(key)
+
+    @staticmethod
+    def _get_key(base_surface: pygame.Surface,
+                 caching_size: int) -> tuple:
+
+        digest = hashlib.sha1(pygame.image.tobytes(base_surface, "RGBA")).hexdigest()
+        return (digest,
+                base_surface.get_size(),
+                base_surface.get_bitsize(),
+                base_surface.get_colorkey(),
+                caching_size)
+
 
 class CachedSurface(pygame.Surface):
     def __init__(self,
                  base_surface: pygame.Surface,
-                 caching_size: int) -> None:
+                 caching_size: int,
+                 lazy: bool = True) -> None:
+        """
+        A surface with its rotated versions cached.
+
+        :param base_surface: The surface to rotate.
+        :param caching_size: The number of angles in a full turn.
+        :param lazy: If True, an angle is only rotated the first time it is requested.
+        """
 
         super().__init__(base_surface.get_size())
 
@@ -13,11 +207,12 @@ class CachedSurface(pygame.Surface):
 
         self._caching_size = caching_size
         self._caching_step = 360 / self._caching_size
-        self.surfaces = []
         self.blit(base_surface, (0, 0))
 
-        for i in range(caching_size):
-            self.surfaces.append(pygame.transform.rotate(base_surface, i * self._caching_step))
+        self.rotation_set = RotationCache.get_rotation_set(base_surface, caching_size)
+
+        if not lazy:
+            self.rotation_set.fill()
 
     def _get_surface_index(self,
                            angle: float) -> int:
@@ -27,7 +222,7 @@ class CachedSurface(pygame.Surface):
     def __getitem__(self,
                     item: float) -> pygame.Surface:
 
-        return self.surfaces[self._get_surface_index(item)]
+        return self.rotation_set.get(self._get_surface_index(item))
 
     def __repr__(self) -> str:
-        return f"CachedSurface with {len(self.surfaces)} surfaces.\n({self.surfaces})"
+        return f"CachedSurface with {self.rotation_set.loaded_count}/{self._caching_size} surfaces."
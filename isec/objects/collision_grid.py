@@ -0,0 +1,90 @@
+import numpy
+import pygame
+
+from collections.abc import Iterable, Sequence
+
+from isec.objects.raycaster import cast_ray_layers
+
+
+class CollisionGrid:
+    DTYPE = numpy.uint32
+    MAX_LAYERS = 32
+
+    def __init__(self,
+                 layers: dict[str, numpy.ndarray]) -> None:
+        """
+        A grid of tiles where every cell holds a bitmask of the collision layers it belongs to.
+
+        A single ray traversal of the grid finds the first hit of several layers, see cast_ray.
+
+        :param layers: The boolean collision map of every layer, all of the same size.
+        """
+
+        if len(layers) > self.MAX_LAYERS:
+            raise ValueError(f"A collision grid can't have more than {self.MAX_LAYERS} layers.")
+
+        shapes = {numpy.shape(collision_map) for collision_map in layers.values()}
+        if len(shapes) != 1:
+            raise ValueError("Every layer of a collision grid must have the same size.")
+
+        self.layer_bits: dict[str, int] = {layer_name: 1 << i for i, layer_name in enumerate(layers)}
+        self.cells = numpy.zeros(shapes.pop(), dtype=self.DTYPE)
+
+        for layer_name, collision_map in layers.items():
+            self.cells[numpy.asarray(collision_map, dtype=bool)] |= self.layer_bits[layer_name]
+
+    def copy(self) -> "CollisionGrid":
+        grid = CollisionGrid.__new__(CollisionGrid)
+        grid.layer_bits = dict(self.layer_bits)
+        grid.cells = self.cells.copy()
+
+        return grid
+
+    def get_mask(self,
+                 layer_names: Iterable[str]) -> int:
+        """Return the bitmask of some layers."""
+
+        mask = 0
+        for layer_name in layer_names:
+            mask |= self.layer_bits[layer_name]
+
+        return mask
+
+    def get_layer(self,
+                  layer_name: str) -> numpy.ndarray:
+        """Return the boolean collision map of a layer, as a new array."""
+
+        return (self.cells & self.layer_bits[layer_name]) != 0
+
+    def set_cell(self,
+                 x: int,
+                 y: int,
+                 layer_names: Iterable[str]) -> None:
+        """Set the layers a cell belongs to."""
+
+        self.cells[y, x] = self.get_mask(layer_names)
+
+    def cast_ray(self,
+                 tile_size: int,
+                 start_position: pygame.Vector2,
+                 direction_vector: pygame.Vector2,
+                 layer_names: Sequence[str],
+                 max_distance: float = 20) -> dict[str, tuple[pygame.Vector2, bool]]:
+        """
+        Cast a ray through the grid, and return the end position and whether a tile was hit for every layer.
+
+        The result of each layer is the same as isec.objects.cast_ray on the collision map of that layer.
+        """
+
+        results = cast_ray_layers(self.cells,
+                                  tile_size,
+                                  start_position,
+                                  direction_vector,
+                                  [self.layer_bits[layer_name] for layer_name in layer_names],
+                                  max_distance)
+
+        return dict(zip(layer_names, results))
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.cells.shape[1], self.cells.shape[0]
@@ -0,0 +1,427 @@
+import heapq
+import math
+import numpy
+
+from collections.abc import Iterable
+
+from isec.objects.a_star import SQRT_2, astar
+
+
+class HierarchicalPathfinder:
+    """
+    Hierarchical pathfinding (HPA*) over a collision map.
+
+    The map is split into square clusters. Along the border of two clusters, every run of walkable tiles facing each
+    other is an entrance, crossed by one transition, or two at its ends if it is wide. The tiles of the transitions are
+    the nodes of an abstract graph, linked inside every cluster by their shortest path in the cluster, computed once.
+    A query searches the abstract graph from the start to the end, linked to the nodes of their clusters, then replaces
+    every abstract edge by the tiles of its path, kept from the construction, so it only searches the tiles of two
+    clusters. Between nearby clusters, a direct astar search is tried too. The paths are close to the shortest ones.
+
+    When tiles change, only their clusters and the neighbour clusters sharing their borders are built again, before
+    the next query. The moves are the ones of astar with diagonal moves and the "never" corner cutting policy.
+    """
+
+    MAX_ENTRANCE_WIDTH = 6
+
+    def __init__(self,
+                 collision_map: numpy.ndarray | list[list[bool]],
+                 cluster_size: int = 16) -> None:
+        """
+        :param collision_map: The collision map, True for collidable tiles, indexed by row then column. It is not
+            copied: after changing it, call invalidate with the changed tiles.
+        :param cluster_size: The width and height of a cluster, in tiles.
+        """
+
+        if cluster_size < 2:
+            raise ValueError("The cluster size must be at least 2.")
+
+        self.collision_map = numpy.asarray(collision_map, dtype=bool)
+        self.cluster_size = cluster_size
+
+        height, width = self.collision_map.shape
+        self.cluster_rows = math.ceil(height / cluster_size)
+        self.cluster_columns = math.ceil(width / cluster_size)
+
+        # The transitions of every border, by (cluster, 0) for its right border and (cluster, 1) for its bottom one
+        self._transitions: dict[tuple[tuple[int, int], int], list[tuple[tuple[int, int], tuple[int, int]]]] = {}
+        self._cluster_nodes: dict[tuple[int, int], set[tuple[int, int]]] = {}
+        self._intra_edges: dict[tuple[int, int], dict[tuple[int, int], dict[tuple[int, int], float]]] = {}
+        # The shortest path trees inside every cluster from each of its nodes, to refine the intra-cluster edges
+        self._intra_trees: dict[tuple[int, int], dict[tuple[int, int], dict[tuple[int, int], tuple | None]]] = {}
+        self._inter_edges: dict[tuple[int, int], dict[tuple[int, int], float]] = {}
+
+        self._dirty_clusters: set[tuple[int, int]] = {(cluster_row, cluster_column)
+                                                      for cluster_row in range(self.cluster_rows)
+                                                      for cluster_column in range(self.cluster_columns)}
+        self.rebuild()
+
+    def copy(self,
+             collision_map: numpy.ndarray) -> "HierarchicalPathfinder":
+        """Return a pathfinder over another collision map holding the same tiles, without building it again."""
+
+        pathfinder = HierarchicalPathfinder.__new__(HierarchicalPathfinder)
+        pathfinder.__dict__.update(self.__dict__)
+
+        # The data of a cluster is replaced when it is built again, never changed, only the inter edges are
+        pathfinder.collision_map = numpy.asarray(collision_map, dtype=bool)
+        pathfinder._transitions = dict(self._transitions)
+        pathfinder._cluster_nodes = dict(self._cluster_nodes)
+        pathfinder._intra_edges = dict(self._intra_edges)
+        pathfinder._intra_trees = dict(self._intra_trees)
+        pathfinder._inter_edges = {node: dict(edges) for node, edges in self._inter_edges.items()}
+        pathfinder._dirty_clusters = set(self._dirty_clusters)
+
+        return pathfinder
+
+    def get_cluster(self,
+                    tile: tuple[int, int]) -> tuple[int, int]:
+        """Return the (row, column) of the cluster holding a (row, column) tile."""
+
+        return tile[0] // self.cluster_size, tile[1] // self.cluster_size
+
+    def invalidate(self,
+                   x: int,
+                   y: int) -> None:
+        """Build the cluster of a changed tile again before the next query."""
+
+        self._dirty_clusters.add((y // self.cluster_size, x // self.cluster_size))
+
+    def rebuild(self) -> None:
+        """Build the changed clusters now, and their borders."""
+
+        if not self._dirty_clusters:
+            return
+
+        borders = set()
+        for cluster_row, cluster_column in self._dirty_clusters:
+            borders.update((((cluster_row, cluster_column), 0),
+                            ((cluster_row, cluster_column), 1),
+                            ((cluster_row, cluster_column - 1), 0),
+                            ((cluster_row - 1, cluster_column), 1)))
+
+        affected_clusters = set(self._dirty_clusters)
+
+        for border in borders:
+            (cluster_row, cluster_column), side = border
+            neighbour_cluster = (cluster_row + side, cluster_column + 1 - side)
+
+            if (cluster_row < 0 or cluster_column < 0
+                    or neighbour_cluster[0] >= self.cluster_rows or neighbour_cluster[1] >= self.cluster_columns):
+                continue
+
+            affected_clusters.update((border[0], neighbour_cluster))
+
+            for tile, other_tile in self._transitions.pop(border, []):
+                self._remove_inter_edge(tile, other_tile)
+                self._remove_inter_edge(other_tile, tile)
+
+            self._transitions[border] = self._find_transitions(*border)
+
+            for tile, other_tile in self._transitions[border]:
+                self._inter_edges.setdefault(tile, {})[other_tile] = 1.0
+                self._inter_edges.setdefault(other_tile, {})[tile] = 1.0
+
+        for cluster in affected_clusters:
+            self._build_cluster(cluster)
+
+        self._dirty_clusters.clear()
+
+    def find_path(self,
+                  start: tuple[int, int],
+                  end: tuple[int, int],
+                  stats: dict[str, int] | None = None) -> list[tuple[int, int]] | None:
+        """
+        Return a path from start to end, as a list of (row, column) tiles like astar, or None if there is no path.
+
+        :param stats: A dict filled with the number of "expanded" nodes of the abstract graph, and of nodes pushed in
+            the open set ("pushed").
+        """
+
+        self.rebuild()
+
+        height, width = self.collision_map.shape
+        for position in (start, end):
+            if not (0 <= position[0] < height and 0 <= position[1] < width):
+                raise ValueError(f"Position {position} is outside of the maze.")
+
+        start, end = (int(start[0]), int(start[1])), (int(end[0]), int(end[1]))
+        expanded = pushed = 0
+
+        if self.collision_map[end]:
+            self._set_stats(stats, expanded, pushed)
+            return None
+
+        if start == end:
+            self._set_stats(stats, expanded, pushed)
+            return [start]
+
+        start_cluster, end_cluster = self.get_cluster(start), self.get_cluster(end)
+        start_distances, start_tree = self._search_cluster(start_cluster,
+                                                           start,
+                                                           self._cluster_nodes[start_cluster] | {end})
+        end_distances, end_tree = self._search_cluster(end_cluster, end, self._cluster_nodes[end_cluster])
+
+        # The start and the end are linked to the nodes of their cluster for this query only
+        start_edges = {node: start_distances[node] for node in self._cluster_nodes[start_cluster]
+                       if node in start_distances}
+        if start_cluster == end_cluster and end in start_distances:
+            start_edges[end] = start_distances[end]
+
+        g_scores = {start: 0.0}
+        parents = {start: None}
+        closed = set()
+        open_heap = [(0.0, 0.0, start)]
+        path = None
+
+        while open_heap:
+            _, _, current = heapq.heappop(open_heap)
+
+            if current == end:
+                path = self._refine_path(self._get_tree_path(parents, end)[::-1], start_tree, end_tree)
+                break
+
+            if current in closed:
+                continue
+            closed.add(current)
+            expanded += 1
+
+            current_cluster = self.get_cluster(current)
+            edges = [start_edges] if current == start else []
+
+            if current in self._intra_edges[current_cluster]:
+                edges.append(self._intra_edges[current_cluster][current])
+            if current in self._inter_edges:
+                edges.append(self._inter_edges[current])
+            if current_cluster == end_cluster and current in end_distances:
+                edges.append({end: end_distances[current]})
+
+            for neighbour_edges in edges:
+                for neighbour, cost in neighbour_edges.items():
+                    if neighbour in closed:
+                        continue
+
+                    g = g_scores[current] + cost
+                    if neighbour in g_scores and g >= g_scores[neighbour]:
+                        continue
+
+                    g_scores[neighbour] = g
+                    parents[neighbour] = current
+
+                    row_distance = abs(neighbour[0] - end[0])
+                    column_distance = abs(neighbour[1] - end[1])
+                    h = row_distance + column_distance + (SQRT_2 - 2) * min(row_distance, column_distance)
+
+                    heapq.heappush(open_heap, (g + h, h, neighbour))
+                    pushed += 1
+
+        self._set_stats(stats, expanded, pushed)
+
+        # The abstract graph only crosses the borders at the transitions, a short path can miss a better crossing
+        if max(abs(start_cluster[0] - end_cluster[0]), abs(start_cluster[1] - end_cluster[1])) <= 1:
+            top, left, _, _ = self._get_cluster_bounds((min(start_cluster[0], end_cluster[0]),
+                                                        min(start_cluster[1], end_cluster[1])))
+            _, _, bottom, right = self._get_cluster_bounds((max(start_cluster[0], end_cluster[0]),
+                                                            max(start_cluster[1], end_cluster[1])))
+
+            local_path = astar(self.collision_map[top:bottom, left:right],
+                               (start[0] - top, start[1] - left),
+                               (end[0] - top, end[1] - left),
+                               corner_cutting="never")
+
+            if local_path is not None:
+                local_path = [(row + top, column + left) for row, column in local_path]
+                if path is None or self._get_path_cost(local_path) < g_scores[end]:
+                    path = local_path
+
+        return path
+
+    @property
+    def node_count(self) -> int:
+        """The number of nodes of the abstract graph."""
+
+        return sum(len(nodes) for nodes in self._cluster_nodes.values())
+
+    def _get_cluster_bounds(self,
+                            cluster: tuple[int, int]) -> tuple[int, int, int, int]:
+        """Return the first row, first column, last row + 1 and last column + 1 of a cluster."""
+
+        height, width = self.collision_map.shape
+        top, left = cluster[0] * self.cluster_size, cluster[1] * self.cluster_size
+
+        return top, left, min(top + self.cluster_size, height), min(left + self.cluster_size, width)
+
+    def _find_transitions(self,
+                          cluster: tuple[int, int],
+                          side: int) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+        """Return the transitions crossing the right (side 0) or bottom (side 1) border of a cluster."""
+
+        top, left, bottom, right = self._get_cluster_bounds(cluster)
+
+        if side == 0:
+            pairs = [((row, right - 1), (row, right)) for row in range(top, bottom)]
+        else:
+            pairs = [((bottom - 1, column), (bottom, column)) for column in range(left, right)]
+
+        transitions = []
+        run_start = None
+
+        for i in range(len(pairs) + 1):
+            is_free = i < len(pairs) and not (self.collision_map[pairs[i][0]] or self.collision_map[pairs[i][1]])
+
+            if is_free and run_start is None:
+                run_start = i
+
+            elif not is_free and run_start is not None:
+                if i - run_start > self.MAX_ENTRANCE_WIDTH:
+                    transitions += [pairs[run_start], pairs[i - 1]]
+                else:
+                    transitions.append(pairs[(run_start + i - 1) // 2])
+
+                run_start = None
+
+        return transitions
+
+    def _build_cluster(self,
+                       cluster: tuple[int, int]) -> None:
+        """Find the nodes of a cluster, and the shortest paths between them inside the cluster."""
+
+        cluster_row, cluster_column = cluster
+        borders = (((cluster_row, cluster_column), 0),
+                   ((cluster_row, cluster_column), 1),
+                   ((cluster_row, cluster_column - 1), 0),
+                   ((cluster_row - 1, cluster_column), 1))
+
+        nodes = {tile
+                 for border in borders if border in self._transitions
+                 for transition in self._transitions[border]
+                 for tile in transition if self.get_cluster(tile) == cluster}
+
+        self._cluster_nodes[cluster] = nodes
+        self._intra_edges[cluster] = {}
+        self._intra_trees[cluster] = {}
+
+        for node in nodes:
+            distances, tree = self._search_cluster(cluster, node, nodes)
+            self._intra_edges[cluster][node] = {other_node: distances[other_node]
+                                                for other_node in nodes
+                                                if other_node != node and other_node in distances}
+            self._intra_trees[cluster][node] = tree
+
+    def _search_cluster(self,
+                        cluster: tuple[int, int],
+                        source: tuple[int, int],
+                        targets: Iterable[tuple[int, int]]) -> tuple[dict[tuple[int, int], float],
+                                                                     dict[tuple[int, int], tuple[int, int] | None]]:
+        """
+        Return the length of the shortest path inside a cluster from a tile to the targets it can reach, and the
+        previous tile of every tile on these paths. The search stops once every target is reached.
+        """
+
+        top, left, bottom, right = self._get_cluster_bounds(cluster)
+
+        # A border of walls, so the neighbours never need a bounds check
+        padded_width = right - left + 2
+        walls = numpy.pad(self.collision_map[top:bottom, left:right], 1, constant_values=True).tobytes()
+
+        moves = [(-padded_width, 1.0, 0, 0), (padded_width, 1.0, 0, 0), (-1, 1.0, 0, 0), (1, 1.0, 0, 0)]
+        moves += [(row_offset + column_offset, SQRT_2, row_offset, column_offset)
+                  for row_offset in (-padded_width, padded_width)
+                  for column_offset in (-1, 1)]
+
+        source_index = (source[0] - top + 1) * padded_width + source[1] - left + 1
+        remaining_targets = {(row - top + 1) * padded_width + column - left + 1 for row, column in targets}
+        remaining_targets.discard(source_index)
+
+        distances = {source_index: 0.0}
+        parents = {source_index: -1}
+        heap = [(0.0, source_index)]
+
+        while heap and remaining_targets:
+            distance, current = heapq.heappop(heap)
+            if distance > distances[current]:
+                continue
+
+            remaining_targets.discard(current)
+
+            for offset, cost, row_offset, column_offset in moves:
+                neighbour = current + offset
+
+                if walls[neighbour]:
+                    continue
+
+                if row_offset and (walls[current + row_offset] or walls[current + column_offset]):
+                    continue
+
+                neighbour_distance = distance + cost
+                if neighbour not in distances or neighbour_distance < distances[neighbour]:
+                    distances[neighbour] = neighbour_distance
+                    parents[neighbour] = current
+                    heapq.heappush(heap, (neighbour_distance, neighbour))
+
+        tiles = {index: (index // padded_width - 1 + top, index % padded_width - 1 + left) for index in distances}
+        tiles[-1] = None
+
+        return ({tiles[index]: distance for index, distance in distances.items()},
+                {tiles[index]: tiles[parent] for index, parent in parents.items()})
+
+    def _refine_path(self,
+                     abstract_path: list[tuple[int, int]],
+                     start_tree: dict[tuple[int, int], tuple[int, int] | None],
+                     end_tree: dict[tuple[int, int], tuple[int, int] | None]) -> list[tuple[int, int]]:
+        """Replace every abstract edge by its tiles, from the shortest path trees of its cluster."""
+
+        start, end = abstract_path[0], abstract_path[-1]
+        path = [start]
+
+        for tile, next_tile in zip(abstract_path, abstract_path[1:]):
+            # A transition between two clusters, the tiles are next to each other
+            if tile in self._inter_edges and next_tile in self._inter_edges[tile]:
+                path.append(next_tile)
+
+            elif tile == start:
+                path += self._get_tree_path(start_tree, next_tile)[::-1][1:]
+
+            elif next_tile == end:
+                path += self._get_tree_path(end_tree, tile)[1:]
+
+            else:
+                path += self._get_tree_path(self._intra_trees[self.get_cluster(tile)][tile], next_tile)[::-1][1:]
+
+        return path
+
+    @staticmethod
+    def _get_tree_path(tree: dict[tuple[int, int], tuple[int, int] | None],
+                       tile: tuple[int, int]) -> list[tuple[int, int]]:
+        """Return the path from a tile to the root of a shortest path tree."""
+
+        path = []
+        while tile is not None:
+            path.append(tile)
+            tile = tree[tile]
+
+        return path
+
+    @staticmethod
+    def _get_path_cost(path: list[tuple[int, int]]) -> float:
+        return sum(SQRT_2 if tile[0] != next_tile[0] and tile[1] != next_tile[1] else 1.0
+                   for tile, next_tile in zip(path, path[1:]))
+
+    def _remove_inter_edge(self,
+                           tile: tuple[int, int],
+                           other_tile: tuple[int, int]) -> None:
+
+        if tile in self._inter_edges:
+            self._inter_edges[tile].pop(other_tile, None)
+
+            if not self._inter_edges[tile]:
+                del self._inter_edges[tile]
+
+    @staticmethod
+    def _set_stats(stats: dict[str, int] | None,
+                   expanded: int,
+                   pushed: int) -> None:
+
+        if stats is not None:
+            stats["expanded"] = expanded
+            stats["pushed"] = pushed
@@ -0,0 +1,143 @@
+import warnings
+import hashlib
+import pymunk
+import numpy
+import os
+
+from collections.abc import Callable
+
+from isec._ise_typing import PathLike
+
+
+class PolygonCache:
+    """
+    Memory and disk cache of polygon decompositions.
+
+    The key is a hash of a boolean map, of the parameters of the decomposition and of the pymunk version, so the
+    polygons of a map are only computed once, and a stale file is never loaded. Every polygon set is stored as a
+    npz file holding the vertices and the number of vertices of each polygon.
+    The hits and misses are counted in stats.
+    """
+
+    directory: PathLike | None = None
+    memory_enabled: bool = True
+
+    stats: dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+    _polygons: dict[str, list[list[tuple[float, float]]]] = {}
+
+    @classmethod
+    def configure(cls,
+                  memory_enabled: bool,
+                  directory: PathLike | None) -> None:
+        """Enable the memory cache, and the disk cache in a directory, or disable it with None."""
+
+        cls.memory_enabled = memory_enabled
+        cls.directory = directory
+
+        if not memory_enabled:
+            cls._polygons.clear()
+
+    @classmethod
+    def get(cls,
+            boolean_map: numpy.ndarray,
+            parameters: tuple,
+            compute: Callable[[], list[list[tuple[float, float]]]]) -> list[list[tuple[float, float]]]:
+        """
+        Return the polygons of a map, computed by compute if they are not cached yet.
+
+        :param boolean_map: The map the polygons are computed from.
+        :param parameters: The other values the polygons depend on, e.g. the tile size. They must have a stable repr.
+        :param compute: A function returning the polygons.
+        """
+
+        key = cls._get_key(boolean_map, parameters)
+
+        if key in cls._polygons:
+            cls.stats["memory_hits"] += 1
+            return cls._polygons[key]
+
+        polygons = cls._load(key)
+        if polygons is not None:
+            cls.stats["disk_hits"] += 1
+
+        else:
+            cls.stats["misses"] += 1
+            polygons = compute()
+            cls._save(key, polygons)
+
+        if cls.memory_enabled:
+            cls._polygons[key] = polygons
+
+        return polygons
+
+    @classmethod
+    def clear_memory(cls) -> None:
+        cls._polygons.clear()
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        for stat_name in cls.stats:
+            cls.stats[stat_name] = 0
+
+    @staticmethod
+    def _get_key(boolean_map: numpy.ndarray,
+                 parameters: tuple) -> str:
+
+        boolean_map = numpy.ascontiguousarray(boolean_map, dtype=bool)
+
+        digest = hashlib.sha1(boolean_map.tobytes())
+        digest.update(repr((boolean_map.shape, parameters, pymunk.version)).encode())
+
+        return digest.hexdigest()
+
+    @classmethod
+    def _get_path(cls,
+                  key: str) -> str:
+
+        return os.path.join(cls.directory, key + ".npz")
+
+    @classmethod
+    def _load(cls,
+              key: str) -> list[list[tuple[float, float]]] | None:
+
+        if cls.directory is None or not os.path.isfile(cls._get_path(key)):
+            return None
+
+        try:
+            with numpy.load(cls._get_path(key), allow_pickle=False) as cache:
+                vertices = cache["vertices"].tolist()
+                lengths = cache["lengths"].tolist()
+
+        except (OSError, ValueError, KeyError):
+            return None
+
+        polygons = []
+        start = 0
+        for length in lengths:
+            polygons.append([tuple(vertex) for vertex in vertices[start:start + length]])
+            start += length
+
+        return polygons
+
+    @classmethod
+    def _save(cls,
+              key: str,
+              polygons: list[list[tuple[float, float]]]) -> None:
+
+        if cls.directory is None:
+            return
+
+        vertices = numpy.array([tuple(vertex) for polygon in polygons for vertex in polygon],
+                               dtype=numpy.float64).reshape(-1, 2)
+        lengths = numpy.array([len(polygon) for polygon in polygons], dtype=numpy.int64)
+
+        path = cls._get_path(key)
+
+        try:
+            os.makedirs(cls.directory, exist_ok=True)
+            with open(path + ".tmp", "wb") as cache_file:
+                numpy.savez(cache_file, vertices=vertices, lengths=lengths)
+            os.replace(path + ".tmp", path)
+
+        except OSError as error:
+            warnings.warn(f"Could not write polygon cache file {path}: {error}")
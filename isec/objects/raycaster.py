@@ -1,16 +1,43 @@
 import math
+import numpy
 import pygame
 
+from collections.abc import Sequence
 
-def cast_ray(collision_map: list[list[bool]],
+
+def cast_ray(collision_map: numpy.ndarray | list[list[bool]],
              tile_size: int,
              start_position: pygame.Vector2,
              direction_vector: pygame.Vector2,
              max_distance: float = 20) -> tuple[pygame.Vector2, bool]:
 
+    return cast_ray_layers(collision_map, tile_size, start_position, direction_vector, (1,), max_distance)[0]
+
+
+def cast_ray_layers(layer_map: numpy.ndarray | list[list[int]],
+                    tile_size: int,
+                    start_position: pygame.Vector2,
+                    direction_vector: pygame.Vector2,
+                    layer_bits: Sequence[int],
+                    max_distance: float = 20) -> list[tuple[pygame.Vector2, bool]]:
+    """
+    Cast a single ray through a map of layer bitmasks, and return the first hit of every requested layer.
+
+    The result of each layer is the one cast_ray would give on the boolean map of that layer, the traversal stops
+    when every layer is hit.
+
+    :param layer_map: A map of bitmasks, or of booleans for a single layer with the bit 1.
+    :param tile_size: The size of a tile in pixels.
+    :param start_position: The start position of the ray, in pixels.
+    :param direction_vector: The direction of the ray. It doesn't need to be normalized.
+    :param layer_bits: The bit of every layer to look for.
+    :param max_distance: The maximum distance of the ray, in tiles.
+    :return: The end position, in pixels, and whether a tile was hit, for every layer.
+    """
+
     vec_ray_start = start_position / tile_size
     if direction_vector.length() == 0:
-        return start_position, False
+        return [(start_position, False) for _ in layer_bits]
 
     vec_ray_dir = direction_vector.normalize()
 
@@ -20,7 +47,8 @@ def cast_ray(collision_map: list[list[bool]],
     dir_y_over_x = float('+inf') if vec_ray_dir[0] == 0 else vec_ray_dir[1] / vec_ray_dir[0]
     dir_x_over_y = float('+inf') if vec_ray_dir[1] == 0 else vec_ray_dir[0] / vec_ray_dir[1]
 
-    vec_ray_unit_step_size = pygame.Vector2(math.sqrt(1 + dir_y_over_x ** 2), math.sqrt(1 + dir_x_over_y ** 2))
+    vec_ray_unit_step_size = pygame.Vector2(math.sqrt(1 + dir_y_over_x * dir_y_over_x),
+                                            math.sqrt(1 + dir_x_over_y * dir_x_over_y))
     vec_map_check = vec_start_cell.copy()
 
     vec_ray_length_1d = pygame.Vector2(0, 0)
@@ -42,10 +70,15 @@ def cast_ray(collision_map: list[list[bool]],
         vec_step[1] = 1
         vec_ray_length_1d[1] = (vec_start_cell[1] + 1 - vec_ray_start[1]) * vec_ray_unit_step_size[1]
 
-    tile_found = False
+    # The distance of the first hit of every layer, None while it is not found
+    hit_distances: list[float | None] = [None] * len(layer_bits)
+    remaining_bits = 0
+    for layer_bit in layer_bits:
+        remaining_bits |= layer_bit
+
     current_distance = 0
 
-    while not tile_found and current_distance < max_distance:
+    while remaining_bits and current_distance < max_distance:
         if vec_ray_length_1d[0] < vec_ray_length_1d[1]:
             vec_map_check[0] += vec_step[0]
             current_distance = vec_ray_length_1d[0]
@@ -61,20 +94,157 @@ def cast_ray(collision_map: list[list[bool]],
 
         if any((x_floor < 1,
                 y_floor < 1,
-                x_floor >= len(collision_map[0]) - 1,
-                y_floor >= len(collision_map) - 1)):
+                x_floor >= len(layer_map[0]) - 1,
+                y_floor >= len(layer_map) - 1)):
+
+            break
+
+        cell_bits = layer_map[y_floor][x_floor] & remaining_bits
+        if cell_bits:
+            for i, layer_bit in enumerate(layer_bits):
+                if hit_distances[i] is None and cell_bits & layer_bit:
+                    hit_distances[i] = current_distance
+
+            remaining_bits &= ~cell_bits
+
+    results = []
+    for hit_distance in hit_distances:
+        tile_found = hit_distance is not None and hit_distance <= max_distance
+        distance = hit_distance if tile_found else max_distance
+
+        results.append(((vec_ray_dir * distance + vec_ray_start) * tile_size, tile_found))
 
-            tile_found = False
-            current_distance = max_distance
+    return results
 
-        elif collision_map[y_floor][x_floor]:
-            tile_found = True
 
-    if current_distance > max_distance:
-        current_distance = max_distance
-        tile_found = False
+def cast_rays(collision_map: numpy.ndarray | list[list[bool]],
+              tile_size: int,
+              origins: numpy.ndarray | Sequence[Sequence[float]],
+              directions: numpy.ndarray | Sequence[Sequence[float]],
+              max_distance: float | numpy.ndarray = 20) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Cast many rays at once, with the same traversal as cast_ray, and the same results.
 
-    if not tile_found:
-        current_distance = max_distance
+    Each step of the traversal is done for all the rays still travelling with numpy operations, so the number of
+    python iterations only depends on the longest ray.
 
-    return (vec_ray_dir * current_distance + vec_ray_start) * tile_size, tile_found
+    :param collision_map: The collision map, True for collidable tiles.
+    :param tile_size: The size of a tile in pixels.
+    :param origins: The start positions of the rays, in pixels, with shape (N, 2).
+    :param directions: The directions of the rays, with shape (N, 2). They don't need to be normalized.
+    :param max_distance: The maximum distance of the rays, in tiles. A single value or one value per ray.
+    :return: The end positions of the rays, in pixels, with shape (N, 2), and whether each ray hit a tile,
+        with shape (N,).
+    """
+
+    collision_map = numpy.asarray(collision_map, dtype=bool)
+    origins = numpy.asarray(origins, dtype=numpy.float64).reshape(-1, 2)
+    directions = numpy.asarray(directions, dtype=numpy.float64).reshape(-1, 2)
+    max_distance = numpy.broadcast_to(numpy.asarray(max_distance, dtype=numpy.float64), (len(origins),))
+
+    height, width = collision_map.shape
+
+    # Cell codes of the map with a ring of extra cells around it: 0 free, 1 collidable, 2 outside of the traversal
+    cell_codes = numpy.full((height + 2, width + 2), 2, dtype=numpy.int8)
+    cell_codes[2:-2, 2:-2] = collision_map[1:-1, 1:-1]
+    cell_codes = cell_codes.ravel()
+    row_size = width + 2
+
+    ray_start = origins / tile_size
+    length = numpy.sqrt(directions[:, 0] * directions[:, 0] + directions[:, 1] * directions[:, 1])
+    moving = length != 0
+
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        ray_dir = directions / numpy.where(moving, length, 1)[:, None]
+
+        # A division by zero gives -inf instead of the inf of cast_ray, the same once squared
+        dir_y_over_x = ray_dir[:, 1] / ray_dir[:, 0]
+        dir_x_over_y = ray_dir[:, 0] / ray_dir[:, 1]
+
+    current_distance = numpy.zeros(len(origins))
+    hit = numpy.zeros(len(origins), dtype=bool)
+
+    # State of the rays still travelling, compacted once a quarter of them are stopped: until then, the stopped rays
+    # are masked out
+    rays = numpy.nonzero(moving & (current_distance < max_distance))[0]
+
+    unit_step_x = numpy.sqrt(1 + dir_y_over_x[rays] * dir_y_over_x[rays])
+    unit_step_y = numpy.sqrt(1 + dir_x_over_y[rays] * dir_x_over_y[rays])
+
+    start_x, start_y = ray_start[rays, 0], ray_start[rays, 1]
+    cell_x, cell_y = numpy.floor(start_x), numpy.floor(start_y)
+
+    negative_x, negative_y = ray_dir[rays, 0] < 0, ray_dir[rays, 1] < 0
+    step_y = numpy.where(negative_y, -row_size, row_size)
+    step_difference = numpy.where(negative_x, -1, 1) - step_y
+
+    length_x = numpy.where(negative_x, start_x - cell_x, cell_x + 1 - start_x) * unit_step_x
+    length_y = numpy.where(negative_y, start_y - cell_y, cell_y + 1 - start_y) * unit_step_y
+
+    # The steps are added with multiplications instead of selections, an infinite step (a ray parallel to an axis)
+    # would give inf * 0 = nan, the largest float is used instead, its length is never the shortest anyway
+    largest_float = numpy.finfo(numpy.float64).max
+    unit_step_x = numpy.minimum(unit_step_x, largest_float)
+    unit_step_y = numpy.minimum(unit_step_y, largest_float)
+
+    # A ray starting outside of the map stops on its first step, the clip keeps it in the ring of outside cells
+    cell_index = ((numpy.clip(cell_y, -1, height).astype(numpy.intp) + 1) * row_size
+                  + numpy.clip(cell_x, -1, width).astype(numpy.intp) + 1)
+    ray_max_distance = max_distance[rays]
+
+    travelling = numpy.ones(len(rays), dtype=bool)
+    stopped_count = 0
+
+    first_step = True
+    while len(rays):
+        along_x = length_x < length_y
+        distance = numpy.minimum(length_x, length_y)
+
+        cell_index += step_y
+        cell_index += along_x * step_difference
+        length_x += along_x * unit_step_x
+        length_y += ~along_x * unit_step_y
+
+        if first_step:
+            cell_index.clip(0, len(cell_codes) - 1, out=cell_index)
+            first_step = False
+
+        cell_code = cell_codes[cell_index]
+
+        stopped = cell_code != 0
+        stopped |= distance >= ray_max_distance
+        stopped &= travelling
+
+        # The few stopped rays are indexed by position, much faster than with the boolean mask
+        stopped = numpy.flatnonzero(stopped)
+        if not len(stopped):
+            continue
+
+        stopped_code = cell_code[stopped]
+        stopped_rays = rays[stopped]
+        current_distance[stopped_rays] = numpy.where(stopped_code == 2, ray_max_distance[stopped], distance[stopped])
+        hit[stopped_rays] = stopped_code == 1
+
+        # The stopped rays stay on their last cell until the next compaction
+        travelling[stopped] = False
+        step_y[stopped] = 0
+        step_difference[stopped] = 0
+        stopped_count += len(stopped)
+        if 4 * stopped_count < len(rays):
+            continue
+
+        kept = numpy.flatnonzero(travelling)
+        rays, cell_index, step_y, step_difference = rays[kept], cell_index[kept], step_y[kept], step_difference[kept]
+        length_x, length_y = length_x[kept], length_y[kept]
+        unit_step_x, unit_step_y = unit_step_x[kept], unit_step_y[kept]
+        ray_max_distance = ray_max_distance[kept]
+        travelling = numpy.ones(len(rays), dtype=bool)
+        stopped_count = 0
+
+    hit &= current_distance <= max_distance
+    current_distance = numpy.where(hit, current_distance, max_distance)
+
+    positions = (ray_dir * current_distance[:, None] + ray_start) * tile_size
+    positions[~moving] = origins[~moving]
+
+    return positions, hit
@@ -0,0 +1,124 @@
+import warnings
+import hashlib
+import pygame
+import numpy
+import os
+
+from isec._ise_typing import PathLike
+
+
+class RotationAtlas:
+    """
+    Disk cache of rotation frames.
+
+    Every rotation set is stored as the raw pixels of all its frames, one after the other, in a single npy file, with a
+    npy index of the frame sizes. The file is mapped in memory (copy on write) when loaded, and the frames are surfaces
+    over that mapping, so nothing is decoded nor rotated and the pixels are only read from disk when a frame is drawn.
+    The file name is a hash of the source pixels, the caching size and the pygame version, so a stale atlas is never
+    loaded.
+    """
+
+    # The byte order of the pixels, the one of the surfaces of convert_alpha on little-endian machines
+    PIXEL_FORMAT = "BGRA"
+
+    directory: PathLike | None = None
+
+    @classmethod
+    def set_directory(cls,
+                      directory: PathLike | None) -> None:
+        """Enable the disk cache in a directory, or disable it with None."""
+
+        cls.directory = directory
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls.directory is not None
+
+    @classmethod
+    def exists(cls,
+               key: tuple) -> bool:
+
+        pixels_path, index_path = cls._get_paths(key)
+        return os.path.isfile(pixels_path) and os.path.isfile(index_path)
+
+    @classmethod
+    def load(cls,
+             key: tuple) -> "RotationAtlasFrames | None":
+        """Return the frames stored for a rotation set key, or None if they are not on disk."""
+
+        if not cls.exists(key):
+            return None
+
+        pixels_path, index_path = cls._get_paths(key)
+
+        try:
+            sizes = numpy.load(index_path)
+            pixels = numpy.load(pixels_path, mmap_mode="c")
+
+        except (OSError, ValueError):
+            return None
+
+        if pixels.dtype != numpy.uint8 or sizes.ndim != 2 or pixels.size != 4 * int(numpy.prod(sizes, axis=1).sum()):
+            return None
+
+        return RotationAtlasFrames(pixels, sizes)
+
+    @classmethod
+    def save(cls,
+             key: tuple,
+             frames: list[pygame.Surface]) -> None:
+        """Write the raw pixels of the frames of a rotation set with their index."""
+
+        pixels = numpy.frombuffer(b"".join(pygame.image.tobytes(frame, cls.PIXEL_FORMAT) for frame in frames),
+                                  dtype=numpy.uint8)
+        sizes = numpy.array([frame.get_size() for frame in frames], dtype=numpy.int64)
+        pixels_path, index_path = cls._get_paths(key)
+
+        try:
+            os.makedirs(cls.directory, exist_ok=True)
+
+            with open(pixels_path + ".tmp", "wb") as file:
+                numpy.save(file, pixels)
+            os.replace(pixels_path + ".tmp", pixels_path)
+
+            with open(index_path + ".tmp", "wb") as file:
+                numpy.save(file, sizes)
+            os.replace(index_path + ".tmp", index_path)
+
+        except OSError as error:
+            warnings.warn(f"Rotation atlas could not be written: {error}")
+
+    @classmethod
+    def _get_paths(cls,
+                   key: tuple) -> tuple[str, str]:
+
+        digest = hashlib.sha1(repr((key, pygame.version.ver)).encode()).hexdigest()
+        file_path = os.path.join(cls.directory, digest)
+
+        return file_path + ".npy", file_path + ".index.npy"
+
+
+class RotationAtlasFrames:
+    def __init__(self,
+                 pixels: numpy.ndarray,
+                 sizes: numpy.ndarray) -> None:
+        """
+        The frames of a rotation set mapped from disk, a frame surface is only created when it is requested.
+
+        :param pixels: The raw pixels of every frame, one after the other.
+        :param sizes: The size of every frame, with shape (N, 2).
+        """
+
+        self.pixels = pixels
+        self.sizes = [tuple(size) for size in sizes.tolist()]
+        self.offsets = numpy.concatenate(([0], numpy.cumsum(4 * numpy.prod(sizes, axis=1)))).tolist()
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def __getitem__(self,
+                    index: int) -> pygame.Surface:
+
+        return pygame.image.frombuffer(self.pixels[self.offsets[index]:self.offsets[index + 1]],
+                                       self.sizes[index],
+                                       RotationAtlas.PIXEL_FORMAT)
@@ -0,0 +1,48 @@
+"""
+Print the texture atlases built by Resource, with their occupancy and memory.
+
+Usage (from the repository root):
+    python -m isec.tools.atlas_report [assets_directory]
+
+The assets directory defaults to "game/assets/". Every image is decoded, even in lazy loading mode.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from isec.app import App, Resource  # NOQA: E402
+
+
+def main() -> None:
+    assets_directory = sys.argv[1] if len(sys.argv) > 1 else "game/assets/"
+
+    App.init(assets_directory)
+    Resource.preload()
+
+    if not Resource.atlas_report:
+        print("No texture atlas was built (surface.texture_atlas in engine/resource.json).")
+        return
+
+    print(f"{'directory':<24} {'images':>6} {'size':>11} {'occupancy':>9} {'images KiB':>10} {'atlas KiB':>9} packed")
+
+    for line in Resource.atlas_report:
+        size = "x".join(str(value) for value in line["size"])
+        print(f"{line['directory'] or '.':<24} {line['images']:>6} {size:>11} {line['occupancy']:>9.1%} "
+              f"{line['image_bytes'] / 1024:>10.1f} {line['atlas_bytes'] / 1024:>9.1f} "
+              f"{'yes' if line['packed'] else 'no, larger than its images'}")
+
+    packed_lines = [line for line in Resource.atlas_report if line["packed"]]
+    nb_images = sum(line["images"] for line in packed_lines)
+    image_bytes = sum(line["image_bytes"] for line in packed_lines)
+    atlas_bytes = sum(line["atlas_bytes"] for line in packed_lines)
+
+    print(f"\n{nb_images} surfaces packed into {len(packed_lines)} atlases, "
+          f"pixel memory saved: {(image_bytes - atlas_bytes) / 1024:.1f} KiB "
+          f"({image_bytes / 1024:.1f} KiB -> {atlas_bytes / 1024:.1f} KiB)")
+
+
+if __name__ == '__main__':
+    main()
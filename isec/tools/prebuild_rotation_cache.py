@@ -0,0 +1,58 @@
+"""
+Pre-build the rotation atlas cache of every cached image.
+
+Usage (from the repository root):
+    python -m isec.tools.prebuild_rotation_cache [assets_directory]
+
+The assets directory defaults to "game/assets/". The frames are stored uncompressed, so the atlases take as much disk
+space as the rotated frames take memory once all computed. The dummy SDL drivers are used if no other driver is set,
+so no window is opened.
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from isec.app import App, Resource  # NOQA: E402
+from isec.app.asset_dict import AssetDict  # NOQA: E402
+from isec.objects import CachedSurface, RotationAtlas  # NOQA: E402
+
+
+def find_cached_surfaces(image_dict: AssetDict) -> list[CachedSurface]:
+    cached_surfaces = []
+
+    for value in image_dict.values():
+        if isinstance(value, AssetDict):
+            cached_surfaces += find_cached_surfaces(value)
+
+        elif isinstance(value, CachedSurface):
+            cached_surfaces.append(value)
+
+    return cached_surfaces
+
+
+def main() -> None:
+    assets_directory = sys.argv[1] if len(sys.argv) > 1 else "game/assets/"
+
+    start = time.perf_counter()
+    App.init(assets_directory)
+
+    if not RotationAtlas.is_enabled():
+        print("The rotation atlas is disabled in engine/resource.json (surface.caching.atlas).")
+        return
+
+    cached_surfaces = find_cached_surfaces(Resource.image)
+    for cached_surface in cached_surfaces:
+        cached_surface.rotation_set.fill()
+
+    atlas_bytes = sum(entry.stat().st_size for entry in os.scandir(RotationAtlas.directory) if entry.is_file())
+
+    print(f"Rotation atlases of {len(cached_surfaces)} cached images are in {RotationAtlas.directory} "
+          f"({atlas_bytes / 1024 / 1024:.1f} MiB), in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,50 @@
+import argparse
 import asyncio
 import numpy
 import pymunk
 import pygame
 import math
+import random
 import time
 import yaml
 
 from isec.app import App, Resource
+from isec.instance import InputHandler, LoopHandler
 from game.instances.instance_main_menu import InstanceMainMenu
 
 __all__ = ["asyncio", "numpy", "pymunk", "pygame", "math", "time", "App", "Resource", "yaml"]
 
 
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Play the game, or record and replay a session of it.")
+    parser.add_argument("--record", metavar="FILE", help="record the inputs of the session to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="replay the inputs recorded in FILE, then quit")
+    parser.add_argument("--seed", type=int, default=None, help="seed of random, stored in the recording")
+    parser.add_argument("--unlimited", action="store_true", help="replay without frame limit, e.g. to profile")
+
+    arguments = parser.parse_args()
+    if arguments.record and arguments.replay:
+        parser.error("--record and --replay can't be used together.")
+
+    return arguments
+
+
 async def main() -> None:
+    arguments = parse_arguments()
+
+    seed = arguments.seed
+    if arguments.replay:
+        seed = InputHandler.start_replay(arguments.replay)
+        LoopHandler.limit_fps = not arguments.unlimited
+
+    elif arguments.record:
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        InputHandler.start_recording(arguments.record, seed)
+
+    if seed is not None:
+        random.seed(seed)
+
     App.init("game/assets/")
     await InstanceMainMenu().execute()
 
@@ -0,0 +1,136 @@
+import math
+import numpy
+import pytest
+
+from isec.objects import HierarchicalPathfinder, astar
+
+
+CLUSTER_SIZE = 8
+
+
+def get_path_cost(path: list[tuple[int, int]]) -> float:
+    return sum(math.dist(a, b) for a, b in zip(path, path[1:]))
+
+
+def create_map(seed: int) -> numpy.ndarray:
+    """A seeded map of scattered walls, with a few long walls to split it in regions."""
+
+    rng = numpy.random.default_rng(seed)
+    collision_map = rng.random((40, 56)) < 0.2
+
+    for _ in range(4):
+        row, column = rng.integers(40), rng.integers(56)
+        if rng.random() < 0.5:
+            collision_map[row, :] = True
+            collision_map[row, column:column + 3] = False
+        else:
+            collision_map[:, column] = True
+            collision_map[row:row + 3, column] = False
+
+    return collision_map
+
+
+def create_queries(collision_map: numpy.ndarray,
+                   seed: int,
+                   number_of_queries: int = 60) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+
+    rng = numpy.random.default_rng(seed)
+    free_tiles = [tuple(tile) for tile in numpy.argwhere(~collision_map).tolist()]
+
+    return [tuple(free_tiles[i] for i in rng.integers(len(free_tiles), size=2)) for _ in range(number_of_queries)]
+
+
+def check_path(collision_map: numpy.ndarray,
+               path: list[tuple[int, int]],
+               start: tuple[int, int],
+               end: tuple[int, int]) -> None:
+    """Check that a path goes from start to end by walkable tiles, with the moves of the "never" corner cutting."""
+
+    assert path[0] == start and path[-1] == end
+
+    for (row, column), (next_row, next_column) in zip(path, path[1:]):
+        assert not collision_map[next_row, next_column]
+        assert max(abs(next_row - row), abs(next_column - column)) == 1
+        assert not collision_map[row, next_column] and not collision_map[next_row, column]
+
+
+def check_queries(pathfinder: HierarchicalPathfinder,
+                  queries: list[tuple[tuple[int, int], tuple[int, int]]]) -> None:
+    """Compare the paths of the pathfinder with the ones of astar, over its current collision map."""
+
+    collision_map = pathfinder.collision_map
+    total_cost = total_astar_cost = 0
+
+    for start, end in queries:
+        path = pathfinder.find_path(start, end)
+        astar_path = astar(collision_map, start, end, corner_cutting="never") if not collision_map[start] else None
+
+        if collision_map[start] or astar_path is None:
+            assert path is None
+            continue
+
+        assert path is not None
+        check_path(collision_map, path, start, end)
+
+        cost, astar_cost = get_path_cost(path), get_path_cost(astar_path)
+        assert cost >= astar_cost - 1e-9
+        assert cost <= 1.5 * astar_cost + 2
+
+        total_cost += cost
+        total_astar_cost += astar_cost
+
+    # The paths are close to the shortest ones
+    assert total_cost <= 1.1 * total_astar_cost
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_find_path_matches_astar(seed: int) -> None:
+    collision_map = create_map(seed)
+    check_queries(HierarchicalPathfinder(collision_map, CLUSTER_SIZE), create_queries(collision_map, seed))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_find_path_after_invalidate(seed: int) -> None:
+    collision_map = create_map(seed)
+    pathfinder = HierarchicalPathfinder(collision_map, CLUSTER_SIZE)
+    rng = numpy.random.default_rng(seed + 100)
+
+    for step in range(3):
+        # Destroy and build walls, the collision map is shared with the pathfinder
+        for _ in range(40):
+            row, column = rng.integers(collision_map.shape[0]), rng.integers(collision_map.shape[1])
+            collision_map[row, column] = not collision_map[row, column]
+            pathfinder.invalidate(column, row)
+
+        if step % 2:
+            pathfinder.rebuild()
+
+        queries = create_queries(collision_map, seed + step)
+        check_queries(pathfinder, queries)
+
+        # The incremental rebuild finds the same paths as a pathfinder built from scratch
+        fresh_pathfinder = HierarchicalPathfinder(collision_map.copy(), CLUSTER_SIZE)
+        for start, end in queries:
+            path, fresh_path = pathfinder.find_path(start, end), fresh_pathfinder.find_path(start, end)
+            assert (path is None) == (fresh_path is None)
+            if path is not None:
+                assert get_path_cost(path) == pytest.approx(get_path_cost(fresh_path))
+
+
+def test_invalidate_opens_and_closes_a_wall() -> None:
+    collision_map = numpy.zeros((24, 24), dtype=bool)
+    collision_map[:, 12] = True
+    pathfinder = HierarchicalPathfinder(collision_map, CLUSTER_SIZE)
+
+    assert pathfinder.find_path((5, 2), (5, 20)) is None
+
+    collision_map[18, 12] = False
+    pathfinder.invalidate(12, 18)
+    path = pathfinder.find_path((5, 2), (5, 20))
+    assert path is not None and (18, 12) in path
+    check_path(collision_map, path, (5, 2), (5, 20))
+
+    collision_map[18, 12] = True
+    pathfinder.invalidate(12, 18)
+    pathfinder.rebuild()
+    assert pathfinder.find_path((5, 2), (5, 20)) is None